@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+App Discovery Benchmark for Jarvis
+Generates a synthetic tree of fake .app bundles with Info.plist files and
+measures cold full scans at several worker counts (including the default)
+plus an incremental rescan; run it with and without --io-delay-ms
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import plistlib
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.app_discovery import ApplicationDiscovery, DEFAULT_DISCOVERY_WORKERS
+
+
+def generate_app_tree(root: str, count: int) -> None:
+    """Create count fake .app bundles, each with a realistic Info.plist"""
+    os.makedirs(root, exist_ok=True)
+    for i in range(count):
+        name = f"Synthetic App {i:05d}"
+        contents = os.path.join(root, f"{name}.app", "Contents")
+        os.makedirs(contents, exist_ok=True)
+        with open(os.path.join(contents, "Info.plist"), "wb") as f:
+            plistlib.dump({
+                "CFBundleIdentifier": f"com.synthetic.app{i:05d}",
+                "CFBundleName": name,
+                "CFBundleDisplayName": name,
+                "CFBundleShortVersionString": f"{i % 10}.{i % 7}.{i % 3}",
+                "CFBundleExecutable": f"SyntheticApp{i:05d}",
+                "LSMinimumSystemVersion": "12.0",
+            }, f)
+
+
+def make_discovery(tree: str, workdir: str, workers: int, io_delay_ms: float = 0.0) -> ApplicationDiscovery:
+    """Create a discovery instance pointed at the synthetic tree"""
+    discovery = ApplicationDiscovery(max_workers=workers, platform="macos")
+    discovery.search_paths = [tree]
+    discovery.app_database_path = Path(workdir) / "app_database.json"
+
+    if io_delay_ms > 0:
+        # Emulate a network home or cold disk cache: every plist read waits on I/O
+        extract = discovery._extract_app_info
+
+        def slow_extract(app_path):
+            time.sleep(io_delay_ms / 1000)
+            return extract(app_path)
+
+        discovery._extract_app_info = slow_extract
+    return discovery
+
+
+def time_scan(discovery: ApplicationDiscovery, incremental: bool) -> float:
+    """Run one discovery pass and return its wall time in milliseconds"""
+    started = time.perf_counter()
+    discovery.discover_all_applications(incremental=incremental)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    """Run the discovery benchmark and print JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark Jarvis app discovery")
+    parser.add_argument("--apps", type=int, default=2000, help="number of synthetic bundles")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, 16, DEFAULT_DISCOVERY_WORKERS}))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration (best is kept)")
+    parser.add_argument("--io-delay-ms", type=float, default=0.0,
+                        help="simulated I/O latency per Info.plist read (e.g. 2 for a network home)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="jarvis_bench_")
+    tree = os.path.join(workdir, "Applications")
+    try:
+        started = time.perf_counter()
+        generate_app_tree(tree, args.apps)
+        generate_ms = (time.perf_counter() - started) * 1000
+
+        cold = {}
+        for workers in args.workers:
+            runs = [time_scan(make_discovery(tree, workdir, workers, args.io_delay_ms), incremental=False)
+                    for _ in range(args.repeat)]
+            cold[str(workers)] = round(min(runs), 2)
+
+        # Incremental scans diff against the saved database
+        discovery = make_discovery(tree, workdir, max(args.workers))
+        discovery.refresh_database(incremental=False)
+        incremental_ms = min(time_scan(discovery, incremental=True) for _ in range(args.repeat))
+
+        print(json.dumps({
+            "timestamp": time.time(),
+            "apps": args.apps,
+            "io_delay_ms": args.io_delay_ms,
+            "default_workers": DEFAULT_DISCOVERY_WORKERS,
+            "generate_ms": round(generate_ms, 2),
+            "cold_scan_ms_by_workers": cold,
+            "incremental_scan_ms": round(incremental_ms, 2),
+        }, indent=2))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+App Discovery and Lookup Benchmark Suite for Jarvis
+Generates synthetic macOS installations (100, 1k and 10k bundles by default)
+and measures discovery, database load/save, lookups, category listing and
+the launch path with the launcher subprocess stubbed out
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import plistlib
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.app_discovery import ApplicationDiscovery
+from tools.app_store import AppStore
+from tools.open_app import AppLauncher
+from tools.launch_cache import LaunchStrategyCache
+from tools.app_usage import AppUsageStore
+
+# Real names first, so the nickname table (chrome, vscode, word...) is exercised
+KNOWN_APPS = [
+    "Google Chrome", "Visual Studio Code", "Microsoft Word", "Microsoft Excel",
+    "Microsoft PowerPoint", "Microsoft Outlook", "Adobe Photoshop", "Final Cut Pro",
+    "Logic Pro", "Activity Monitor", "QuickTime Player", "VLC media player", "Spotify",
+    "Discord", "Telegram", "WhatsApp", "TextEdit", "Keychain Access", "Safari", "Firefox",
+    "Slack", "Zoom", "Notion", "Obsidian", "Steam", "Minecraft", "Xcode", "Terminal",
+]
+
+NAME_WORDS = [
+    "Air", "Atlas", "Beam", "Bolt", "Bright", "Cloud", "Code", "Craft", "Data", "Deck",
+    "Draw", "Echo", "Edit", "Flow", "Focus", "Forge", "Frame", "Grid", "Hub", "Ink",
+    "Kit", "Lens", "Light", "Link", "Loop", "Mail", "Map", "Mark", "Mind", "Mix",
+    "Note", "Nova", "Pad", "Pixel", "Plan", "Play", "Pulse", "Quick", "Radar", "Shift",
+    "Snap", "Sound", "Spark", "Stack", "Studio", "Sync", "Task", "Text", "Track", "Vault",
+    "Vector", "View", "Wave", "Work", "Zen", "Pro", "Lite", "Express", "Plus", "Max",
+]
+
+
+def synthetic_names(count: int, seed: int = 42) -> list:
+    """Return count unique, realistic-looking app names"""
+    rng = random.Random(seed)
+    names = list(KNOWN_APPS[:count])
+    seen = set(names)
+    while len(names) < count:
+        name = " ".join(rng.sample(NAME_WORDS, rng.choice((1, 2, 2, 3))))
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate_installation(root: str, names: list) -> list:
+    """Create one bundle per name with a realistic Info.plist; ~5% go in Utilities"""
+    search_paths = [root, os.path.join(root, "Utilities")]
+    for i, name in enumerate(names):
+        directory = search_paths[1] if i % 20 == 19 else search_paths[0]
+        contents = os.path.join(directory, f"{name}.app", "Contents")
+        os.makedirs(contents, exist_ok=True)
+        with open(os.path.join(contents, "Info.plist"), "wb") as f:
+            plistlib.dump({
+                "CFBundleIdentifier": f"com.synthetic.{name.lower().replace(' ', '-')}",
+                "CFBundleName": name,
+                "CFBundleDisplayName": name,
+                "CFBundleShortVersionString": f"{i % 10}.{i % 7}.{i % 3}",
+                "CFBundleExecutable": name.replace(" ", ""),
+                "CFBundlePackageType": "APPL",
+                "LSMinimumSystemVersion": "12.0",
+                "NSHighResolutionCapable": True,
+            }, f)
+    return search_paths
+
+
+def make_discovery(search_paths: list, workdir: str) -> ApplicationDiscovery:
+    discovery = ApplicationDiscovery(platform="macos")
+    discovery.search_paths = search_paths
+    discovery.app_database_path = Path(workdir) / "app_database.json"
+    return discovery
+
+
+class StubProcess:
+    """Stands in for the `open` subprocess: exits immediately with success"""
+
+    def wait(self, timeout=None):
+        return 0
+
+
+def make_launcher(discovery: ApplicationDiscovery, workdir: str) -> AppLauncher:
+    """An AppLauncher over the synthetic database whose launch commands never run"""
+    launcher = AppLauncher()
+    launcher.discovery = discovery
+    launcher.launch_cache = LaunchStrategyCache(Path(workdir) / "launch_strategies.json")
+    launcher.usage = AppUsageStore(Path(workdir) / "app_usage.json")
+    launcher.watch_apps = False
+    launcher.async_launch = False
+    launcher._spawn = lambda strategy, command: StubProcess()
+    return launcher
+
+
+def timed_ms(function, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def best_ms(repeat: int, function, *args, **kwargs) -> float:
+    return round(min(timed_ms(function, *args, **kwargs) for _ in range(repeat)), 3)
+
+
+def latency_us(function, queries: list) -> dict:
+    """p50/p95/max latency in microseconds of function over queries"""
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        function(query)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {
+        "p50": round(timings[len(timings) // 2], 1),
+        "p95": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+        "max": round(timings[-1], 1),
+    }
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Drop or swap one character, like a typo or a clipped transcription"""
+    text = name.lower()
+    i = rng.randrange(1, len(text)) if len(text) > 2 else 0
+    if rng.random() < 0.5:
+        return text[:i] + text[i + 1:]
+    return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:] if i > 0 else text
+
+
+def touch_plists(search_path: str, count: int) -> None:
+    """Simulate app updates by rewriting a few Info.plist files"""
+    bundles = sorted(entry.path for entry in os.scandir(search_path) if entry.name.endswith(".app"))
+    for app_path in bundles[:count]:
+        plist_path = os.path.join(app_path, "Contents", "Info.plist")
+        with open(plist_path, "rb") as f:
+            data = plistlib.load(f)
+        data["CFBundleShortVersionString"] = "99.0"
+        with open(plist_path, "wb") as f:
+            plistlib.dump(data, f)
+
+
+def bench_size(count: int, lookups: int, repeat: int) -> dict:
+    """Run every measurement for one installation size"""
+    workdir = tempfile.mkdtemp(prefix="jarvis_bench_")
+    try:
+        rng = random.Random(count)
+        names = synthetic_names(count)
+        started = time.perf_counter()
+        search_paths = generate_installation(os.path.join(workdir, "Applications"), names)
+        results = {"generate_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+        # Discovery: cold full scan, no-op rescan, and a rescan after a few updates
+        discovery = make_discovery(search_paths, workdir)
+        results["cold_discovery_ms"] = round(timed_ms(discovery.refresh_database, incremental=False), 2)
+        results["incremental_noop_ms"] = best_ms(repeat, discovery.refresh_database)
+        touch_plists(search_paths[0], max(1, count // 100))
+        results["incremental_1pct_changed_ms"] = round(timed_ms(discovery.refresh_database), 2)
+        results["last_refresh_stats"] = discovery.last_refresh_stats
+
+        # Database load and save
+        store = discovery.index.database()
+        database_path = discovery.app_database_path
+        results["apps"] = len(store)
+        results["aliases"] = len(store.aliases)
+        results["database_bytes"] = database_path.stat().st_size
+        results["save_ms"] = best_ms(repeat, store.save, database_path)
+        results["load_ms"] = best_ms(repeat, AppStore.load, database_path)
+
+        def cold_index_load():
+            discovery.index.invalidate()
+            discovery.index.database()
+        results["index_reload_ms"] = best_ms(repeat, cold_index_load)
+
+        # Lookups
+        sample = [rng.choice(names) for _ in range(lookups)]
+        results["exact_lookup_us"] = latency_us(discovery.index.get, [name.lower() for name in sample])
+        results["fuzzy_lookup_us"] = latency_us(discovery.get_app_suggestions,
+                                                [misspell(name, rng) for name in sample])
+
+        # Launcher paths, with the subprocess stubbed
+        launcher = make_launcher(discovery, workdir)
+        results["list_apps_by_category_ms"] = best_ms(repeat, launcher.list_apps_by_category)
+        results["list_apps_by_category_detailed_ms"] = best_ms(repeat, launcher.list_apps_by_category,
+                                                               detailed=True)
+        results["list_apps_by_category_page_ms"] = best_ms(repeat, launcher.list_apps_by_category,
+                                                           "other", 2)
+        results["list_apps_spoken_chars"] = len(launcher.list_apps_by_category())
+        results["list_apps_detailed_chars"] = len(launcher.list_apps_by_category(detailed=True))
+        results["open_application_exact_us"] = latency_us(launcher.open_application, sample[:max(1, lookups // 4)])
+        results["open_application_fuzzy_us"] = latency_us(
+            launcher.open_application, [misspell(name, rng) for name in sample[:max(1, lookups // 4)]])
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    """Run the benchmark suite and print (or write) JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark Jarvis app discovery and lookup")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="number of synthetic bundles per installation")
+    parser.add_argument("--lookups", type=int, default=200, help="timed lookups per size")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing (best is kept)")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "results": {str(size): bench_size(size, args.lookups, args.repeat) for size in args.sizes},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Contact Import Benchmark for Jarvis
+Generates a large synthetic address book (vCard and CSV exports of the same
+people, with duplicates across and within them) and measures the import,
+its peak memory, re-importing an unchanged or slightly edited file, loading
+the merged directory, and name lookups against it
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.contact_import import ContactImporter
+from tools.contacts import ContactDirectory
+
+FIRST_NAMES = ["Amy", "Ben", "Carla", "Dmitri", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+               "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST_NAMES = ["Smith", "Garcia", "Nguyen", "Okafor", "Rossi", "Schmidt", "Tanaka", "Haddad",
+              "Kowalski", "Silva", "Dubois", "Ivanova", "Cohen", "Murphy", "Larsen", "Ahmed"]
+
+
+def make_people(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    people = []
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        people.append({
+            'name': f"{first} {last} {i}",
+            'email': f"{first.lower()}.{last.lower()}{i}@example.com",
+            'phone': f"+1 555 {i // 10000:03d} {i % 10000:04d}",
+        })
+    return people
+
+
+def write_vcf(path: str, people: list) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        for person in people:
+            first, last = person['name'].split(" ", 1)
+            f.write("BEGIN:VCARD\r\nVERSION:3.0\r\n"
+                    f"N:{last};{first};;;\r\nFN:{person['name']}\r\n"
+                    f"EMAIL;TYPE=INTERNET,PREF:{person['email']}\r\n"
+                    f"TEL;TYPE=CELL:{person['phone']}\r\nEND:VCARD\r\n")
+
+
+def write_csv(path: str, people: list) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Name,E-mail 1 - Value,Phone 1 - Value\n")
+        for person in people:
+            f.write(f"{person['name']},{person['email']},{person['phone']}\n")
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - started) * 1000, 2)
+
+
+def lookup_latency(directory: ContactDirectory, queries: list, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            directory.resolve(query)
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {"p50_us": round(timings[len(timings) // 2], 1), "max_us": round(timings[-1], 1)}
+
+
+def main():
+    """Run the contact import benchmark and print JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark importing a large address book into Jarvis contacts")
+    parser.add_argument("--contacts", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    people = make_people(args.contacts)
+    workdir = tempfile.mkdtemp(prefix="jarvis_contacts_")
+    try:
+        vcf_path = os.path.join(workdir, "export.vcf")
+        csv_path = os.path.join(workdir, "export.csv")
+        write_vcf(vcf_path, people + people[:len(people) // 10])  # Duplicate cards inside the vCard too
+        write_csv(csv_path, people[::2])  # Half the same people again, from another app
+
+        contacts_path = os.path.join(workdir, "contacts.json")
+        imported_path = os.path.join(workdir, "contacts_imported.json")
+        with open(contacts_path, 'w', encoding='utf-8') as f:
+            json.dump({"mom": {"email": "mom@example.com", "aliases": ["mother"]}}, f)
+        importer = ContactImporter(imported_path, os.path.join(workdir, "import_state.json"))
+
+        vcf_stats, vcf_ms = timed(lambda: importer.import_file(vcf_path))
+        csv_stats, csv_ms = timed(lambda: importer.import_file(csv_path))
+
+        # Peak memory separately: tracemalloc slows the import several times over
+        tracemalloc.start()
+        ContactImporter(os.path.join(workdir, "peak.json"),
+                        os.path.join(workdir, "peak_state.json")).import_file(vcf_path)
+        _, vcf_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        _, unchanged_ms = timed(lambda: importer.import_file(vcf_path))
+        with open(vcf_path, 'a', encoding='utf-8') as f:
+            f.write("BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Zoe New\r\nEMAIL:zoe@example.com\r\nEND:VCARD\r\n")
+        edited_stats, edited_ms = timed(lambda: importer.import_file(vcf_path))
+
+        with open(imported_path, 'r', encoding='utf-8') as f:
+            merged_count = len(json.load(f))
+
+        directory = ContactDirectory(contacts_path, imported_path)
+        _, load_ms = timed(directory.names)
+        sample = people[:: max(1, len(people) // 50)]
+        exact = [person['name'] for person in sample]
+        partial = [f"{name.split()[0]} {name.split()[2]}" for name in exact]  # "Amy 12" for "Amy Smith 12"
+        _, first_phonetic_ms = timed(lambda: directory.resolve("mothur"))
+
+        results = {
+            "vcf_import": {"ms": vcf_ms, "peak_alloc_mb": round(vcf_peak / 1e6, 1),
+                           "file_mb": round(os.path.getsize(vcf_path) / 1e6, 1), **vcf_stats},
+            "csv_import": {"ms": csv_ms, **csv_stats},
+            "merged_contacts": merged_count,
+            "reimport_unchanged_ms": unchanged_ms,
+            "reimport_one_card_added": {"ms": edited_ms, "added": edited_stats['added']},
+            "directory_load_ms": load_ms,
+            "first_phonetic_lookup_ms": first_phonetic_ms,
+            "lookup_exact": lookup_latency(directory, exact, args.repeat),
+            "lookup_partial": lookup_latency(directory, partial, args.repeat),
+            "lookup_phonetic": lookup_latency(directory, ["mothur", "muther"], args.repeat),
+            "hand_edited_contact_kept": directory.resolve("mother")['email'] == "mom@example.com",
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for stats in (results["vcf_import"], results["csv_import"]):
+        stats.pop("source", None)
+    print(json.dumps({
+        "timestamp": time.time(),
+        "contacts": args.contacts,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Email Delivery Benchmark for Jarvis
+Sends messages to a local SMTP stand-in that mimics a remote server's round
+trips, comparing a new connection per email with the pooled session,
+measuring the reconnect after the server drops an idle session, the
+tool's reply latency when messages go through the durable spool, a
+fan-out to several recipients as one pipelined transaction, and peak memory
+when sending multi-MB attachments built in memory versus streamed from disk
+"""
+
+import os
+import sys
+import json
+import time
+import smtplib
+import argparse
+import shutil
+import tempfile
+import tracemalloc
+from email import message_from_bytes
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tools.smtp_pool import SMTPPool
+from tools.email_spool import EmailSpool, compose_message as compose
+from tools.email_mime import StreamingMessage
+from smtp_standin import SMTPStandIn
+
+SENDER = "jarvis@example.com"
+
+
+def make_message(i: int) -> MIMEText:
+    msg = MIMEText(f"Benchmark message {i}\n\nHello from Jarvis.", 'plain')
+    msg['From'] = SENDER
+    msg['To'] = "mom@example.com"
+    msg['Subject'] = f"Benchmark {i}"
+    return msg
+
+
+def summarize(timings: list) -> dict:
+    timings = sorted(timings)
+    return {"mean": round(sum(timings) / len(timings), 2),
+            "p50": round(timings[len(timings) // 2], 2),
+            "max": round(timings[-1], 2)}
+
+
+def send_unpooled(standin: SMTPStandIn, count: int) -> dict:
+    """The old send_email: connect, EHLO, login, send and QUIT for every message"""
+    totals = []
+    for i in range(count):
+        started = time.perf_counter()
+        server = smtplib.SMTP(standin.host, standin.port)
+        server.ehlo()
+        server.login(SENDER, "password")
+        server.sendmail(SENDER, ["mom@example.com"], make_message(i).as_string())
+        server.quit()
+        totals.append((time.perf_counter() - started) * 1000)
+    return {"total_ms": summarize(totals)}
+
+
+def send_pooled(standin: SMTPStandIn, count: int) -> dict:
+    pool = SMTPPool(standin.host, standin.port, SENDER, "password", starttls=False)
+    totals, handshakes, sends = [], [], []
+    for i in range(count):
+        started = time.perf_counter()
+        timing = pool.send(make_message(i))
+        totals.append((time.perf_counter() - started) * 1000)
+        handshakes.append(timing['handshake_ms'])
+        sends.append(timing['send_ms'])
+
+    # The server drops the idle session; the next send reconnects and logs in again
+    standin.drop_connections()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    timing = pool.send(make_message(count))
+    reconnect_ms = (time.perf_counter() - started) * 1000
+    pool.close()
+    return {
+        "total_ms": summarize(totals),
+        "first_handshake_ms": handshakes[0],
+        "send_ms": summarize(sends),
+        "after_server_drop_ms": round(reconnect_ms, 2),
+        "after_server_drop_handshake_ms": timing['handshake_ms'],
+        "pool_stats": pool.stats,
+    }
+
+
+def send_spooled(standin: SMTPStandIn, count: int) -> dict:
+    """What send_email costs the agent now (a durable enqueue), and how long delivery takes behind it"""
+    pool = SMTPPool(standin.host, standin.port, SENDER, "password", starttls=False)
+    spool_dir = tempfile.mkdtemp(prefix="jarvis_spool_")
+    try:
+        spool = EmailSpool(spool_dir, deliver=lambda record: pool.send(compose(record), record['to'])['refused'])
+        enqueues = []
+        started = time.perf_counter()
+        for i in range(count):
+            enqueue_started = time.perf_counter()
+            spool.enqueue(SENDER, ["mom@example.com"], f"Benchmark {i}", "Hello from Jarvis.")
+            enqueues.append((time.perf_counter() - enqueue_started) * 1000)
+        drained = spool.wait_until_empty(timeout=60 + count)
+        spool.stop()
+        return {
+            "tool_reply_ms": summarize(enqueues),
+            "all_delivered_ms": round((time.perf_counter() - started) * 1000, 2) if drained else None,
+        }
+    finally:
+        pool.close()
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+def fan_out(standin: SMTPStandIn, recipients: int, repeat: int) -> dict:
+    """One email to several people: a send_email per person (old) vs one pipelined transaction"""
+    addresses = [f"person{i}@example.com" for i in range(recipients)]
+
+    def one_per_recipient():
+        for address in addresses:
+            server = smtplib.SMTP(standin.host, standin.port)
+            server.ehlo()
+            server.login(SENDER, "password")
+            server.sendmail(SENDER, [address], make_message(0).as_string())
+            server.quit()
+
+    pool = SMTPPool(standin.host, standin.port, SENDER, "password", starttls=False)
+    pool.send(make_message(0))  # Warm session, as after the first email of the day
+    batch = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pool.send(make_message(0), addresses)
+        batch.append((time.perf_counter() - started) * 1000)
+    pool.close()
+
+    separate = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        one_per_recipient()
+        separate.append((time.perf_counter() - started) * 1000)
+    return {"recipients": recipients, "one_send_per_recipient_ms": summarize(separate),
+            "one_pipelined_transaction_ms": summarize(batch)}
+
+
+def write_random_file(path: str, size_mb: int) -> None:
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1 << 20))
+
+
+def measure(fn) -> dict:
+    """Send time of an untraced run, then peak traced allocation of a second run (tracemalloc is slow)"""
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_mb": round(peak / 1e6, 2), "send_ms": round(elapsed, 2)}
+
+
+def attachment_memory(standin: SMTPStandIn, sizes_mb: list) -> dict:
+    """Peak memory sending one attachment: the old way (whole MIME string in memory) vs streamed from disk"""
+    workdir = tempfile.mkdtemp(prefix="jarvis_attach_")
+    pool = SMTPPool(standin.host, standin.port, SENDER, "password", starttls=False)
+    pool.send(make_message(0))  # Warm session, so the handshake is not measured
+    results = []
+    try:
+        for size_mb in sizes_mb:
+            path = os.path.join(workdir, f"screenshot_{size_mb}mb.png")
+            write_random_file(path, size_mb)
+
+            def in_memory():
+                msg = MIMEMultipart()
+                msg['From'], msg['To'], msg['Subject'] = SENDER, "mom@example.com", "Screenshot"
+                msg.attach(MIMEText("Here it is.", 'plain'))
+                with open(path, 'rb') as f:
+                    part = MIMEApplication(f.read(), Name=os.path.basename(path))
+                part['Content-Disposition'] = f'attachment; filename="{os.path.basename(path)}"'
+                msg.attach(part)
+                pool.send(msg)
+
+            def streamed():
+                pool.send(StreamingMessage(SENDER, ["mom@example.com"], "Screenshot", "Here it is.",
+                                           [{'path': path}]))
+
+            results.append({"attachment_mb": size_mb, "in_memory": measure(in_memory),
+                            "streamed": measure(streamed)})
+            os.remove(path)
+    finally:
+        pool.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {"sizes": results, "round_trip_intact": attachment_round_trip()}
+
+
+def attachment_round_trip() -> bool:
+    """Send a streamed message with two attachments and check the server received them byte for byte"""
+    workdir = tempfile.mkdtemp(prefix="jarvis_attach_")
+    try:
+        binary = os.path.join(workdir, "photo.jpg")
+        write_random_file(binary, 1)
+        note = os.path.join(workdir, "note.txt")
+        with open(note, 'w', encoding='utf-8') as f:
+            f.write("Title: Dentist\n.starts with a dot\nÜmlauts too\n")
+        with SMTPStandIn() as standin:
+            pool = SMTPPool(standin.host, standin.port, SENDER, "password", starttls=False)
+            pool.send(StreamingMessage(SENDER, ["mom@example.com"], "Files", "Body line\n.dot line",
+                                       [{'path': binary}, {'path': note}]))
+            pool.close()
+            received = message_from_bytes(standin.messages[0]['data'])
+        parts = received.get_payload()
+        expected = [open(path, 'rb').read() for path in (binary, note)]
+        return (parts[0].get_payload().replace("\r\n", "\n") == "Body line\n.dot line"
+                and [part.get_payload(decode=True) for part in parts[1:]] == expected)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    """Run the email benchmark and print JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark Jarvis email delivery against a local SMTP stand-in")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="simulated round trip per SMTP reply")
+    parser.add_argument("--recipients", type=int, default=3, help="recipients in the fan-out test")
+    parser.add_argument("--handshake-ms", type=float, default=60.0, help="simulated extra connect/TLS cost")
+    parser.add_argument("--attachment-mb", default="2,10,20", help="comma-separated attachment sizes")
+    args = parser.parse_args()
+
+    with SMTPStandIn(latency=args.rtt_ms / 1000, handshake_latency=args.handshake_ms / 1000,
+                     keep_messages=False) as standin:
+        results = {
+            "unpooled": send_unpooled(standin, args.messages),
+            "pooled": send_pooled(standin, args.messages),
+            "spooled": send_spooled(standin, args.messages),
+            "fan_out": fan_out(standin, args.recipients, repeat=3),
+            "attachments": attachment_memory(standin, [int(size) for size in args.attachment_mb.split(",")]),
+            "server_stats": standin.stats,
+        }
+
+    print(json.dumps({
+        "timestamp": time.time(),
+        "messages": args.messages,
+        "rtt_ms": args.rtt_ms,
+        "handshake_ms": args.handshake_ms,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Notes Benchmark for Jarvis
+Generates synthetic note corpora and measures manifest reconciliation,
+take_note writes, "recent k" reads, full-text search and (with NumPy)
+semantic search at each corpus size
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.notes_store import NotesStore
+from tools.notes_search import NotesSearchIndex
+from tools.notes_semantic import SemanticNotesIndex, HashingEmbedder, SEMANTIC_AVAILABLE
+
+TOPICS = [
+    "dentist appointment", "oil change for the car", "groceries", "project deadline",
+    "birthday present ideas", "flight to Berlin", "gym schedule", "book recommendations",
+    "meeting with the landlord", "tax documents", "recipe for lasagna", "server migration",
+]
+
+WORDS = ("remember to call about the next week and bring the papers check price "
+         "schedule confirm pay invoice ask plan notes team update fix review").split()
+
+
+def generate_corpus(notes_dir: str, count: int, seed: int = 7) -> None:
+    """Write count note files in the take_note layout, with increasing mtimes"""
+    rng = random.Random(seed)
+    os.makedirs(notes_dir, exist_ok=True)
+    base = time.time() - count * 60
+    for i in range(count):
+        topic = rng.choice(TOPICS)
+        body = f"{topic}: " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+        filepath = os.path.join(notes_dir, f"{i:07d}_note.txt")
+        with open(filepath, "w") as f:
+            f.write(f"Title: {topic}\nDate: 2024-01-01 00:00:00\n\nContent:\n{body}\n")
+        os.utime(filepath, (base + i * 60, base + i * 60))
+
+
+SEARCH_QUERIES = ["dentist", "oil change car", "flight berlin", "tax invoice", "lasagna recipe",
+                  "schedule meeting landlord", "birthday ideas", "server migration review"]
+
+
+def percentiles_ms(function, queries: list, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            timings.append(timed_ms(function, query))
+    timings.sort()
+    return {"p50": round(timings[len(timings) // 2], 3),
+            "p95": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3)}
+
+
+def timed_ms(function, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_semantic(store: NotesStore, repeat: int) -> dict:
+    """Semantic index build, query latency and peak query allocations (hashing embedder)"""
+    semantic = SemanticNotesIndex(store, HashingEmbedder())
+    results = {"build_ms": round(timed_ms(semantic.rebuild), 2),
+               "matrix_bytes": os.path.getsize(semantic.vectors_path)}
+    reopened = SemanticNotesIndex(store, HashingEmbedder())
+    results["open_ms"] = round(timed_ms(reopened.search, "car service"), 2)
+    results["search_ms"] = percentiles_ms(reopened.search, SEARCH_QUERIES, repeat)
+
+    tracemalloc.start()
+    reopened.search("appointment with the dentist")
+    results["search_peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    def add_and_embed():
+        reopened.add_note(store.add("car service booked for monday", "car"))
+    results["take_note_with_embedding_ms"] = round(min(timed_ms(add_and_embed) for _ in range(repeat)), 3)
+    return results
+
+
+def bench_size(count: int, repeat: int) -> dict:
+    """Run the notes measurements for one corpus size"""
+    workdir = tempfile.mkdtemp(prefix="jarvis_bench_")
+    try:
+        notes_dir = os.path.join(workdir, "Jarvis_Notes")
+        generate_corpus(notes_dir, count)
+        store = NotesStore(notes_dir)
+
+        results = {"notes": count}
+        results["initial_reconcile_ms"] = round(timed_ms(store.reconcile), 2)
+        results["take_note_ms"] = round(min(timed_ms(store.add, "benchmark note", "bench")
+                                            for _ in range(repeat)), 3)
+        results["recent_5_ms"] = round(min(timed_ms(store.recent, 5) for _ in range(repeat * 10)), 4)
+        results["recent_50_ms"] = round(min(timed_ms(store.recent, 50) for _ in range(repeat * 10)), 4)
+
+        # Full-text search: one-time build, then queries served from the index
+        search = NotesSearchIndex(store)
+        results["search_build_ms"] = round(timed_ms(search.rebuild), 2)
+        results["search_index_bytes"] = sum(os.path.getsize(os.path.join(search.search_dir, name))
+                                            for name in os.listdir(search.search_dir))
+        reopened = NotesSearchIndex(store)
+        results["search_open_ms"] = round(timed_ms(reopened.search, "dentist"), 2)
+        results["search_ms"] = percentiles_ms(reopened.search, SEARCH_QUERIES, repeat)
+
+        def add_and_index():
+            reopened.add_note(store.add("dentist moved to thursday", "dentist"))
+        results["take_note_with_index_ms"] = round(min(timed_ms(add_and_index) for _ in range(repeat)), 3)
+
+        if SEMANTIC_AVAILABLE:
+            results["semantic"] = bench_semantic(store, repeat)
+
+        # A note dropped in by another program forces one reconcile
+        with open(os.path.join(notes_dir, "external.txt"), "w") as f:
+            f.write("written by another app")
+        results["reconcile_after_external_edit_ms"] = round(timed_ms(store.recent, 5), 2)
+        results["search_after_external_edit_ms"] = round(timed_ms(reopened.search, "dentist"), 2)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    """Run the notes benchmark and print JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark the Jarvis notes store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timing (best is kept)")
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "timestamp": time.time(),
+        "results": {str(size): bench_size(size, args.repeat) for size in args.sizes},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Name Lookup Benchmark for Jarvis
+Measures lookup latency and top-1 accuracy for speech-misrecognized app
+and contact names, with orthographic matching alone and with the phonetic tier
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.app_discovery import ApplicationDiscovery
+from tools.app_store import AppStore
+from tools.fuzzy_index import TrigramIndex
+from tools.phonetic import match_name
+from tools.contacts import ContactDirectory
+
+APP_NAMES = [
+    "Firefox", "Notion", "WhatsApp", "Spotify", "Discord", "Signal", "Telegram",
+    "Adobe Photoshop", "Xcode", "Safari", "Slack", "Obsidian", "Finder", "Terminal",
+    "Visual Studio Code", "Google Chrome", "Microsoft Word", "Microsoft Excel",
+    "Keynote", "Pages", "Numbers", "Calculator", "Calendar", "Reminders", "Preview",
+    "QuickTime Player", "Zoom", "Microsoft Teams", "Steam", "Minecraft", "Figma",
+    "Postman", "Docker", "iTerm", "Sublime Text", "TextEdit", "Activity Monitor",
+    "System Settings", "App Store", "Photo Booth", "GarageBand", "iMovie", "Logic Pro",
+    "Final Cut Pro", "1Password 7 - Password Manager", "VLC media player", "Brave Browser",
+]
+
+# (what the speech recognizer produced, app that was meant)
+MISHEARD_APPS = [
+    ("fire fox", "Firefox"), ("note ion", "Notion"), ("what's app", "WhatsApp"),
+    ("spot a fi", "Spotify"), ("dis cord", "Discord"), ("sig nal", "Signal"),
+    ("tell a gram", "Telegram"), ("photo shop", "Adobe Photoshop"), ("ex code", "Xcode"),
+    ("sa far ee", "Safari"), ("slak", "Slack"), ("ob sidian", "Obsidian"),
+    ("term in al", "Terminal"), ("vs cold", "Visual Studio Code"), ("crome", "Google Chrome"),
+    ("key note", "Keynote"), ("calculater", "Calculator"), ("quick time", "QuickTime Player"),
+    ("fig ma", "Figma"), ("post man", "Postman"), ("i term", "iTerm"),
+    ("sublime", "Sublime Text"), ("text edit", "TextEdit"), ("garage band", "GarageBand"),
+    ("i movie", "iMovie"), ("logic", "Logic Pro"), ("final cut", "Final Cut Pro"),
+    ("one password", "1Password 7 - Password Manager"), ("v l c", "VLC media player"),
+    ("brave", "Brave Browser"), ("docker", "Docker"), ("mine craft", "Minecraft"),
+]
+
+CONTACT_NAMES = ["mom", "mama", "dad", "john", "katherine", "steven", "sean", "michael", "sophia"]
+
+MISHEARD_CONTACTS = [
+    ("jon", "john"), ("catherine", "katherine"), ("stephen", "steven"), ("shawn", "sean"),
+    ("micheal", "michael"), ("sofia", "sophia"), ("mum", "mom"),
+]
+
+
+def build_discovery(workdir: str) -> ApplicationDiscovery:
+    """Write a store with the benchmark apps and return a discovery pointed at it"""
+    discovery = ApplicationDiscovery()
+    discovery.app_database_path = Path(workdir) / "app_database.json"
+
+    store = AppStore()
+    for i, name in enumerate(APP_NAMES):
+        app_info = {'name': name, 'path': f"/Applications/{name}.app", 'bundle_id': f"com.bench.app{i}",
+                    'display_name': name, 'version': None, 'executable': None,
+                    'alternatives': [], 'category': 'Other'}
+        store.add(store.new_id(app_info), app_info, [name] + discovery._generate_alternatives(name))
+    store.save(discovery.app_database_path)
+    return discovery
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def evaluate(lookup, corpus, repeat):
+    """Return top-1 accuracy and latency percentiles (microseconds) for a lookup function"""
+    hits = 0
+    timings = []
+    for query, expected in corpus:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = lookup(query)
+            timings.append((time.perf_counter() - started) * 1e6)
+        hits += result == expected
+    return {
+        "accuracy": round(hits / len(corpus), 3),
+        "p50_us": round(percentile(timings, 0.5), 1),
+        "p95_us": round(percentile(timings, 0.95), 1),
+    }
+
+
+def main():
+    """Run the lookup benchmark and print JSON results"""
+    parser = argparse.ArgumentParser(description="Benchmark misheard-name lookup")
+    parser.add_argument("--repeat", type=int, default=20, help="timed lookups per query")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="jarvis_bench_")
+    try:
+        discovery = build_discovery(workdir)
+        index = discovery.index
+        store = index.database()
+
+        orthographic = TrigramIndex()
+        orthographic.sync(store.aliases)
+
+        def orthographic_lookup(query):
+            results = orthographic.search(query, k=1)
+            return store.apps[results[0][0]]['name'] if results else None
+
+        def combined_lookup(query):
+            results = index.suggest(query, max_suggestions=1)
+            return results[0]['name'] if results else None
+
+        def contact_substring(query):
+            return next((name for name in CONTACT_NAMES if query in name or name in query), None)
+
+        def contact_combined(query):
+            return contact_substring(query) or match_name(query, CONTACT_NAMES) or None
+
+        # The shared contact directory the email and calling tools use
+        contacts_path = os.path.join(workdir, "contacts.json")
+        with open(contacts_path, "w") as f:
+            json.dump({name: f"{name}@example.com" for name in CONTACT_NAMES}, f)
+        directory = ContactDirectory(contacts_path)
+
+        def contact_directory(query):
+            contact = directory.resolve(query)
+            return contact['name'] if contact else None
+
+        print(json.dumps({
+            "timestamp": time.time(),
+            "apps": {
+                "queries": len(MISHEARD_APPS),
+                "orthographic": evaluate(orthographic_lookup, MISHEARD_APPS, args.repeat),
+                "orthographic_plus_phonetic": evaluate(combined_lookup, MISHEARD_APPS, args.repeat),
+            },
+            "contacts": {
+                "queries": len(MISHEARD_CONTACTS),
+                "substring": evaluate(contact_substring, MISHEARD_CONTACTS, args.repeat),
+                "substring_plus_phonetic": evaluate(contact_combined, MISHEARD_CONTACTS, args.repeat),
+                "contact_directory": evaluate(contact_directory, MISHEARD_CONTACTS, args.repeat),
+            },
+        }, indent=2))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
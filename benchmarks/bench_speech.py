@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Speech Prep Benchmark for Jarvis
+Runs prepare_for_speech over representative agent replies and reports the
+spoken text, characters saved and time per reply. Replies with a known
+spoken form are checked, and the run fails when the output drifts (e.g. a
+removed URL taking the surrounding sentence with it).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tools.speech_prep import prepare_for_speech  # noqa: E402
+
+# (name, reply, expected spoken text or None when only timing matters)
+SAMPLES = [
+    ("url_mid_sentence", "Also www.foo.com, and the release notes are out",
+     "Also a link, and the release notes are out."),
+    ("url_in_parens", "The plan is $5 a month (see www.foo.com)", "The plan is $5 a month (see a link)."),
+    ("url_at_end", "Docs: https://example.com/guide?x=1.", "Docs: a link."),
+    ("url_list", "Sources: https://a.com, https://b.com and www.c.org.", "Sources: several links."),
+    ("markdown_link", "Read [the changelog](https://example.com/changelog) first.", "Read the changelog first."),
+    ("markdown_reply",
+     "## Results\n\n- **Weather:** 18°C and sunny ☀️\n- Calendar: 2 meetings → see `agenda`\n\nDone ✅",
+     None),
+    ("table_reply", "| App | Status |\n|---|---|\n| Mail | open |\n| Notes | closed |", None),
+    ("long_reply", " ".join(f"Step {i}: open https://example.com/{i} and check the output." for i in range(40)),
+     None),
+]
+
+
+def bench_sample(name: str, reply: str, expected, runs: int) -> dict:
+    """Time prepare_for_speech on one reply and compare against the expected spoken text"""
+    timings = []
+    prepared = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        prepared = prepare_for_speech(reply)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    result = {
+        "name": name,
+        "spoken": prepared["text"],
+        "original_chars": prepared["original_chars"],
+        "chars_saved": prepared["chars_saved"],
+        "truncated": prepared["truncated"],
+        "p50_ms": round(timings[len(timings) // 2], 4),
+        "max_ms": round(timings[-1], 4),
+    }
+    if expected is not None:
+        result["ok"] = prepared["text"] == expected
+        if not result["ok"]:
+            result["expected"] = expected
+    return result
+
+
+def main():
+    """Run the speech prep benchmark and exit non-zero when a checked reply is spoken wrong"""
+    parser = argparse.ArgumentParser(description="Benchmark Jarvis speech preparation")
+    parser.add_argument("--runs", type=int, default=200, help="iterations per reply")
+    args = parser.parse_args()
+
+    results = [bench_sample(name, reply, expected, args.runs) for name, reply, expected in SAMPLES]
+    print(json.dumps({"timestamp": time.time(), "runs": args.runs, "results": results}, indent=2,
+                     ensure_ascii=False))
+
+    failures = [result for result in results if result.get("ok") is False]
+    for result in failures:
+        print(f"❌ {result['name']}: spoke {result['spoken']!r}, expected {result['expected']!r}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
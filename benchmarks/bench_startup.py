@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for Jarvis
+Measures the import time of startup-critical modules in a fresh interpreter
+and fails when a module exceeds its budget or initializes audio at import time.
+Building the agent's tool list is checked with `python -X importtime`: it
+must stay within budget without importing any tool module or their heavy
+dependencies, and is compared with importing every tool module up front.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budgets in milliseconds (measured in a fresh interpreter)
+IMPORT_BUDGETS_MS = {
+    "tools.jarvis_speech": 50,
+}
+
+# Modules that must not be loaded as a side effect of importing the budgeted ones
+FORBIDDEN_AT_IMPORT = ["pygame", "pyttsx3", "elevenlabs"]
+
+# Building the agent's tool list must not import these (they load on first use)
+TOOL_MODULES = ["tools.arp_scan", "tools.web_search", "tools.matrix", "tools.screenshot", "tools.OCR",
+                "tools.open_app", "tools.notes", "tools.youtube", "tools.email_tool", "tools.facetime_tool"]
+FORBIDDEN_FOR_TOOL_LIST = TOOL_MODULES + ["PIL", "pytesseract", "mss", "ddgs", "smtplib", "numpy"]
+TOOL_LIST_STATEMENT = "from tools.registry import get_tool_registry; get_tool_registry().agent_tools()"
+TOOL_LIST_BUDGET_MS = 60
+
+# Imported by the agent itself anyway, so measured before (not charged to) the tool list
+AGENT_IMPORTS = "import langchain.agents, langchain_core.tools.structured, pydantic"
+IMPORTTIME_MARKER = "--- measured ---"
+
+IMPORTTIME_SNIPPET = """
+import sys, time, json
+{preimport}
+sys.stderr.write({marker!r} + "\\n")
+start = time.perf_counter()
+{statement}
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000}}))
+"""
+
+EAGER_TOOLS_STATEMENT = """
+import importlib
+for module in {modules!r}:
+    try:
+        importlib.import_module(module)
+    except ImportError as e:
+        print(json.dumps({{"missing": module, "error": str(e)}}))
+"""
+
+MEASURE_SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": sorted(m for m in {forbidden!r} if m in sys.modules)}}))
+"""
+
+
+def measure_import(module: str, runs: int = 5) -> dict:
+    """Import a module in fresh interpreters and return the best-of-N timing"""
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        snippet = MEASURE_SNIPPET.format(module=module, forbidden=FORBIDDEN_AT_IMPORT)
+        result = subprocess.run(
+            [sys.executable, "-c", snippet],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        if result.returncode != 0:
+            return {"module": module, "error": result.stderr.strip().splitlines()[-1:]}
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(data["ms"])
+        loaded = data["loaded"]
+
+    return {"module": module, "best_ms": min(timings), "median_ms": sorted(timings)[len(timings) // 2],
+            "eager_backends": loaded}
+
+
+def parse_importtime(stderr: str) -> list:
+    """-X importtime lines after the marker as {module, self_ms, cumulative_ms, top_level}"""
+    entries = []
+    lines = stderr.splitlines()
+    if IMPORTTIME_MARKER in lines:
+        lines = lines[lines.index(IMPORTTIME_MARKER) + 1:]
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({"module": name.strip(), "self_ms": int(self_us) / 1000,
+                        "cumulative_ms": int(cumulative_us) / 1000,
+                        "top_level": not name[1:].startswith(" ")})
+    return entries
+
+
+def importtime_check(statement: str, preimport: str, forbidden: list, runs: int = 3) -> dict:
+    """Run a statement under -X importtime after the preimports; best-of-N time, slowest imports,
+    and any forbidden modules it pulled in"""
+    timings, entries, extra = [], [], []
+    for _ in range(runs):
+        snippet = IMPORTTIME_SNIPPET.format(preimport=preimport, marker=IMPORTTIME_MARKER, statement=statement)
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1:]}
+        outputs = [json.loads(line) for line in result.stdout.strip().splitlines() if line.startswith("{")]
+        timings.append(outputs[-1]["ms"])
+        extra = outputs[:-1]
+        entries = parse_importtime(result.stderr)
+
+    imported = {entry["module"] for entry in entries}
+    slowest = sorted((entry for entry in entries if entry["top_level"]), key=lambda entry: -entry["cumulative_ms"])
+    return {
+        "best_ms": round(min(timings), 1),
+        "modules_imported": len(imported),
+        "slowest_imports": [{"module": entry["module"], "ms": round(entry["cumulative_ms"], 1)}
+                            for entry in slowest[:8]],
+        "forbidden_imported": sorted(module for module in forbidden if module in imported),
+        "notes": extra,
+    }
+
+
+def main():
+    """Run the startup benchmark and exit non-zero when a budget is exceeded"""
+    parser = argparse.ArgumentParser(description="Measure Jarvis import-time budgets")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    args = parser.parse_args()
+
+    results = []
+    failures = []
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        result = measure_import(module, runs=args.runs)
+        result["budget_ms"] = budget_ms
+        results.append(result)
+
+        if "error" in result:
+            failures.append(f"{module}: import failed {result['error']}")
+        elif result["best_ms"] > budget_ms:
+            failures.append(f"{module}: {result['best_ms']:.1f} ms exceeds budget of {budget_ms} ms")
+        elif result["eager_backends"]:
+            failures.append(f"{module}: imported {', '.join(result['eager_backends'])} at import time")
+
+    # The agent's tool list: registry (schemas only) vs importing every tool module as main.py used to
+    tool_list = importtime_check(TOOL_LIST_STATEMENT, AGENT_IMPORTS, FORBIDDEN_FOR_TOOL_LIST, runs=args.runs)
+    eager = importtime_check(EAGER_TOOLS_STATEMENT.format(modules=TOOL_MODULES), AGENT_IMPORTS, [],
+                             runs=args.runs)
+    tool_list["budget_ms"] = TOOL_LIST_BUDGET_MS
+    if "error" in tool_list:
+        failures.append(f"tool registry: failed {tool_list['error']}")
+    else:
+        if tool_list["best_ms"] > TOOL_LIST_BUDGET_MS:
+            failures.append(f"tool registry: {tool_list['best_ms']:.1f} ms exceeds budget of {TOOL_LIST_BUDGET_MS} ms")
+        if tool_list["forbidden_imported"]:
+            failures.append(f"tool registry: imported {', '.join(tool_list['forbidden_imported'])} at startup")
+
+    print(json.dumps({"timestamp": time.time(), "results": results,
+                      "tool_list": {"registry": tool_list, "eager_imports": eager}}, indent=2))
+
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
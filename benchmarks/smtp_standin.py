@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Local SMTP Stand-in for the Jarvis email benchmarks
+A small threaded SMTP server (EHLO, AUTH PLAIN/LOGIN, PIPELINING, NOOP, DATA)
+that accepts everything, can add a delay per round trip to mimic a remote
+server, and can drop every connection to exercise reconnects
+"""
+
+import time
+import base64
+import socket
+import argparse
+import threading
+import socketserver
+from typing import Dict, List, Optional, Set
+
+
+class SMTPStandIn:
+    """Threaded SMTP server on localhost; use as a context manager"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, handshake_latency: float = 0.0,
+                 refuse: Optional[Set[str]] = None, keep_messages: bool = True):
+        self.latency = latency  # Added once per round trip: pipelined replies share one delay
+        self.handshake_latency = handshake_latency  # Extra on connect, standing in for TLS setup
+        self.refuse = {address.lower() for address in (refuse or ())}
+        self.keep_messages = keep_messages
+
+        self.messages: List[Dict] = []
+        self.stats = {'connections': 0, 'logins': 0, 'messages': 0, 'bytes': 0, 'noops': 0}
+        self._clients: Set[socket.socket] = set()
+        self._lock = threading.Lock()
+
+        standin = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                standin._serve(self.request)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SMTPStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="smtp-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SMTPStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def drop_connections(self) -> None:
+        """Close every client connection without a goodbye, like a server timeout"""
+        with self._lock:
+            clients, self._clients = self._clients, set()
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _serve(self, connection: socket.socket) -> None:
+        with self._lock:
+            self._clients.add(connection)
+            self.stats['connections'] += 1
+
+        buffered = bytearray()
+        position = 0
+        replies: List[str] = []
+
+        def reply(*lines: str) -> None:
+            replies.extend(lines)
+
+        def flush() -> None:
+            # The client is now waiting on us: one round trip for everything pending
+            if replies:
+                if self.latency:
+                    time.sleep(self.latency)
+                connection.sendall("".join(f"{line}\r\n" for line in replies).encode())
+                replies.clear()
+
+        def readline() -> bytes:
+            nonlocal position
+            end = buffered.find(b"\n", position)
+            while end < 0:
+                flush()
+                del buffered[:position]
+                position = 0
+                data = connection.recv(65536)
+                if not data:
+                    return b""
+                buffered.extend(data)
+                end = buffered.find(b"\n")
+            line = bytes(buffered[position:end + 1])
+            position = end + 1
+            return line
+
+        if self.handshake_latency:
+            time.sleep(self.handshake_latency)
+        sender, recipients = None, []
+        try:
+            reply("220 localhost Jarvis SMTP stand-in")
+            while True:
+                raw = readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                verb, _, argument = line.partition(" ")
+                verb = verb.upper()
+
+                if verb in ("EHLO", "HELO"):
+                    reply("250-localhost", "250-PIPELINING", "250-8BITMIME", "250-SIZE 104857600",
+                          "250 AUTH PLAIN LOGIN")
+                elif verb == "AUTH":
+                    mechanism, _, initial = argument.partition(" ")
+                    if mechanism.upper() == "PLAIN" and not initial:
+                        reply("334 ")
+                        readline()
+                    elif mechanism.upper() == "LOGIN":
+                        reply("334 " + base64.b64encode(b"Username:").decode())
+                        readline()
+                        reply("334 " + base64.b64encode(b"Password:").decode())
+                        readline()
+                    with self._lock:
+                        self.stats['logins'] += 1
+                    reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    sender, recipients = argument.partition(":")[2].strip(" <>").split(">")[0], []
+                    reply("250 2.1.0 OK")
+                elif verb == "RCPT":
+                    address = argument.partition(":")[2].strip(" <>").split(">")[0]
+                    if address.lower() in self.refuse:
+                        reply("550 5.1.1 No such user")
+                    else:
+                        recipients.append(address)
+                        reply("250 2.1.5 OK")
+                elif verb == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    size, chunks = 0, []
+                    while True:
+                        data = readline()
+                        if not data or data == b".\r\n":
+                            break
+                        if data.startswith(b".."):
+                            data = data[1:]  # Undo the client's dot-stuffing
+                        size += len(data)
+                        if self.keep_messages:
+                            chunks.append(data)
+                    with self._lock:
+                        self.stats['messages'] += 1
+                        self.stats['bytes'] += size
+                        if self.keep_messages:
+                            self.messages.append({'from': sender, 'to': recipients,
+                                                  'data': b"".join(chunks)})
+                    reply("250 2.0.0 Queued")
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    reply("250 2.0.0 OK")
+                elif verb == "NOOP":
+                    with self._lock:
+                        self.stats['noops'] += 1
+                    reply("250 2.0.0 OK")
+                elif verb == "QUIT":
+                    reply("221 2.0.0 Bye")
+                    flush()
+                    return
+                else:
+                    reply("502 5.5.2 Command not implemented")
+        except OSError:
+            return
+        finally:
+            with self._lock:
+                self._clients.discard(connection)
+
+
+def main():
+    """Run the stand-in in the foreground, for trying Jarvis against it by hand"""
+    parser = argparse.ArgumentParser(description="Local SMTP stand-in server")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay per round trip")
+    args = parser.parse_args()
+
+    with SMTPStandIn(args.port, latency=args.latency_ms / 1000, keep_messages=False) as standin:
+        print(f"SMTP stand-in on {standin.host}:{standin.port} "
+              f"(SMTP_SERVER={standin.host} SMTP_PORT={standin.port} SMTP_STARTTLS=0)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
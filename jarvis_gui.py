@@ -22,7 +22,8 @@ from PyQt6.QtGui import (
 
 # Import your existing Jarvis components
 from main import executor, recognizer, mic, TRIGGER_WORD
-from tools.jarvis_speech import speak_text, get_speech_status
+from tools.jarvis_speech import speak_text, get_speech_status, warm_up_speech
+from tools.registry import get_tool_registry
 import speech_recognition as sr
 import pyaudio
 
@@ -303,12 +304,28 @@ class JarvisWorker(QThread):
 class JarvisGUI(QMainWindow):
     """Main Jarvis Desktop GUI"""
     
+    # Follow-up messages for app launches and emails that failed in the background
+    launch_failed = pyqtSignal(str)
+    email_failed = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         self.worker = None
         self.setup_ui()
         self.setup_system_tray()
         self.show()
+        # Warm up speech backends once the window is up, off the UI thread
+        QTimer.singleShot(0, warm_up_speech)
+        # Failures arrive on background threads; the signals hop to the UI thread
+        self.launch_failed.connect(self.on_background_failure)
+        self.email_failed.connect(self.on_background_failure)
+        get_tool_registry().when_loaded(
+            "tools.open_app", lambda module: module.set_launch_failure_callback(self.launch_failed.emit))
+        # Loading the email tool also resumes delivery of mail queued in an earlier session
+        get_tool_registry().when_loaded(
+            "tools.email_tool", lambda module: module.set_email_failure_callback(self.email_failed.emit))
+        # Import the tool modules in the background once the window is up
+        QTimer.singleShot(0, get_tool_registry().preload)
         
     def setup_ui(self):
         self.setWindowTitle("J.A.R.V.I.S - Desktop Assistant")
@@ -706,6 +723,11 @@ class JarvisGUI(QMainWindow):
             # Disable skip button when done speaking (thread-safe)
             QTimer.singleShot(0, lambda: self.skip_button.setEnabled(False))
         
+    def on_background_failure(self, message):
+        """Show and speak a correction for an app that failed to open or an email that bounced"""
+        self.add_chat_message(message, is_user=False)
+        threading.Thread(target=self.speak_with_skip_handling, args=(message,), daemon=True).start()
+        
     def on_text_error(self, error_msg):
         """Handle text processing error"""
         print(f"DEBUG: Error signal received: {error_msg}")
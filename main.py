@@ -6,7 +6,7 @@ import speech_recognition as sr
 from langchain_ollama import ChatOllama, OllamaLLM
 
 # Import enhanced speech system
-from tools.jarvis_speech import speak_text, get_speech_status
+from tools.jarvis_speech import speak_text, get_speech_status, warm_up_speech
 
 
 # from langchain_openai import ChatOpenAI # if you want to use openai
@@ -14,18 +14,9 @@ from langchain_core.messages import HumanMessage
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate
 
-# Import web_search tool
-from tools.web_search import web_search
-from tools.arp_scan import arp_scan_terminal
-
-from tools.matrix import matrix_mode
-from tools.screenshot import take_screenshot
-from tools.OCR import read_text_from_latest_image
-from tools.open_app import open_app, list_available_apps, refresh_app_database
-from tools.notes import take_note, read_recent_notes
-from tools.youtube import youtube_search, play_youtube_video
-from tools.email_tool import send_email, get_email_setup_instructions, send_email_to_contact
-from tools.facetime_tool import call_contact, make_phone_call, check_facetime_status
+# Tool schemas come from the registry; each tool module (OCR, screen capture,
+# app scanning, SMTP ...) is imported on first use or by the background preload
+from tools.registry import get_tool_registry
 
 load_dotenv()
 
@@ -47,26 +38,8 @@ llm = ChatOllama(model="qwen3:1.7b", reasoning=False)
 # llm = ChatOpenAI(model="gpt-4o-mini", api_key=api_key, organization=org_id) for openai
 
 # Tool list
-tools = [
-    arp_scan_terminal,
-    web_search,
-    matrix_mode,
-    take_screenshot,
-    read_text_from_latest_image,
-    open_app,
-    list_available_apps,
-    refresh_app_database,
-    take_note,
-    read_recent_notes,
-    youtube_search,
-    play_youtube_video,
-    send_email,
-    send_email_to_contact,
-    get_email_setup_instructions,
-    call_contact,
-    make_phone_call,
-    check_facetime_status
-]
+tool_registry = get_tool_registry()
+tools = tool_registry.agent_tools()
 
 # Tool-calling prompt
 prompt = ChatPromptTemplate.from_messages(
@@ -107,6 +80,8 @@ APPLICATION LAUNCHING CAPABILITIES:
 
 IMPORTANT COMMUNICATION INSTRUCTIONS:
 - For emails to contact names: use send_email_to_contact tool
+- For one email to several contacts or a group ("email mom, dad and John"): use send_email_to_contacts once with all the names
+- To attach files ("email mom my last screenshot", "send that note to John"): pass attach="screenshot", "note" or "note about <topic>" to the email tool instead of pasting the note into the message
 - For FaceTime/video calls: use call_contact tool  
 - For phone calls: use make_phone_call tool
 - For opening applications: use open_app tool with any app name or nickname
@@ -146,6 +121,22 @@ def write():
     conversation_mode = False
     last_interaction_time = None
 
+    # Initialize audio output in the background while the mic calibrates
+    warm_up_speech()
+
+    # App launches are confirmed and emails delivered in the background;
+    # speak a correction if one fails
+    def on_background_failure(message):
+        print("Jarvis:", message)
+        speak_text(message)
+
+    tool_registry.when_loaded("tools.open_app",
+                              lambda module: module.set_launch_failure_callback(on_background_failure))
+    # Loading the email tool also resumes delivery of mail queued in an earlier session
+    tool_registry.when_loaded("tools.email_tool",
+                              lambda module: module.set_email_failure_callback(on_background_failure))
+    tool_registry.preload()
+
     try:
         with mic as source:
             recognizer.adjust_for_ambient_noise(source)
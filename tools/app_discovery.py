@@ -2,77 +2,213 @@
 """
 Application Discovery Module for Jarvis
 Automatically discovers and catalogs all available applications on macOS
+(.app bundles) and Linux (XDG .desktop entries)
 """
 
 import os
-import json
+import sys
 import subprocess
 import plistlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
+try:
+    from .app_index import get_app_index, AppIndex
+    from .app_store import AppStore
+    from .desktop_entries import DESKTOP_SUFFIX, xdg_application_dirs, parse_desktop_entry
+except ImportError:  # Running as a script: python tools/app_discovery.py
+    from app_index import get_app_index, AppIndex
+    from app_store import AppStore
+    from desktop_entries import DESKTOP_SUFFIX, xdg_application_dirs, parse_desktop_entry
+
 logger = logging.getLogger(__name__)
 
+# Info.plist reads wait on I/O, so a few more threads than cores pay off on a
+# cold or network disk; with a warm cache parsing dominates and extra threads only add contention
+DEFAULT_DISCOVERY_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
 class ApplicationDiscovery:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, platform: Optional[str] = None):
         self.app_database_path = Path(__file__).parent / "app_database.json"
-        self.search_paths = [
-            "/Applications",
-            "/System/Applications", 
-            "/System/Library/CoreServices",
-            "/Applications/Utilities",
-            "~/Applications",  # User applications
-        ]
         
-    def discover_all_applications(self) -> Dict[str, Dict]:
-        """Discover all applications and return comprehensive database"""
+        # "macos" reads .app bundles, "xdg" reads Linux .desktop entries
+        if platform is None:
+            platform = "xdg" if sys.platform.startswith("linux") else "macos"
+        self.platform = platform
+        if platform == "xdg":
+            self.bundle_suffix = DESKTOP_SUFFIX
+            self.search_paths = xdg_application_dirs()
+        else:
+            self.bundle_suffix = ".app"
+            self.search_paths = [
+                "/Applications",
+                "/System/Applications", 
+                "/System/Library/CoreServices",
+                "/Applications/Utilities",
+                "~/Applications",  # User applications
+            ]
+        self.last_refresh_stats = None
+        if max_workers is None:
+            max_workers = int(os.getenv("JARVIS_DISCOVERY_WORKERS", DEFAULT_DISCOVERY_WORKERS))
+        self.max_workers = max(1, max_workers)
+        self._index = None
+
+    @property
+    def index(self) -> AppIndex:
+        """Process-wide in-memory index over this discovery's database file"""
+        if self._index is None or self._index.discovery.app_database_path != self.app_database_path:
+            self._index = get_app_index(self)
+        return self._index
+        
+    def discover_all_applications(self, incremental: bool = True) -> AppStore:
+        """Discover all applications and return comprehensive database
+
+        With incremental=True only bundles whose (mtime, size) fingerprint
+        changed since the last scan have their Info.plist re-read. Plists
+        are read concurrently and merged in a deterministic order.
+        """
         logger.info("🔍 Starting comprehensive application discovery...")
+        started = time.perf_counter()
         
-        applications = {}
+        previous = self.index.database() if incremental else AppStore()
+        cached_by_path = previous.by_path()
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        seen_dirs = {}
         
+        # Pass 1: list bundles and decide which ones need their plist read
+        scanned = []
         for search_path in self.search_paths:
             expanded_path = os.path.expanduser(search_path)
             if os.path.exists(expanded_path):
                 logger.info(f"📂 Scanning {expanded_path}")
-                apps_in_path = self._scan_directory(expanded_path)
-                applications.update(apps_in_path)
+                scanned.extend(self._scan_directory(expanded_path, previous.dirs, cached_by_path, seen_dirs))
+        
+        # Pass 2: extract metadata for new and changed bundles in parallel
+        pending = [app_path for app_path, _, cached in scanned if cached is None]
+        extracted = dict(zip(pending, self._extract_many(pending)))
+        
+        # Pass 3: merge in search-path order so alias collisions resolve the same way every time
+        store = AppStore(dirs=seen_dirs)
+        seen_paths = set()
+        seen_desktop_ids = set()
+        for app_path, fingerprint, cached in scanned:
+            if app_path in seen_paths:
+                continue
+            app_info = cached if cached is not None else extracted.get(app_path)
+            
+            # XDG: the first entry with a desktop id wins, even a hidden one
+            if self.platform == "xdg" and app_info:
+                if app_info['bundle_id'] in seen_desktop_ids:
+                    continue
+                seen_desktop_ids.add(app_info['bundle_id'])
+                if app_info.get('hidden'):
+                    continue
+            
+            previous_record = cached_by_path.get(app_path)
+            if app_info:
+                # Counted only once the plist was read; a failed extraction is not an app
+                if cached is not None:
+                    stats['unchanged'] += 1
+                else:
+                    stats['changed' if previous_record else 'added'] += 1
+                seen_paths.add(app_path)
+                app_info = dict(app_info, fingerprint=fingerprint)
+                
+                # Keep the id of a known bundle stable across refreshes
+                app_id = previous_record.get('id') if previous_record else None
+                if not app_id or app_id in store.apps:
+                    app_id = store.new_id(app_info)
+                
+                # Create multiple key variations for easier lookup
+                app_name = app_info['name']
+                aliases = [app_name] + self._generate_alternatives(app_name) + app_info['alternatives']
+                store.add(app_id, app_info, aliases)
         
         # Add manually discovered system utilities
-        system_apps = self._get_system_applications()
-        applications.update(system_apps)
+        for app_info in self._get_system_applications():
+            if app_info['path'] not in seen_paths:
+                seen_paths.add(app_info['path'])
+                store.add(store.new_id(app_info), app_info, app_info['alternatives'])
+        
+        # Bundles that were cached but no longer exist have been removed
+        stats['removed'] = len(set(cached_by_path) - seen_paths)
         
-        logger.info(f"✅ Discovered {len(applications)} applications")
-        return applications
+        stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.last_refresh_stats = stats
+        
+        logger.info(f"✅ Discovered {len(store)} applications "
+                    f"(+{stats['added']} ~{stats['changed']} -{stats['removed']}, {stats['elapsed_ms']} ms)")
+        return store
     
-    def _scan_directory(self, directory: str) -> Dict[str, Dict]:
-        """Scan a directory for .app bundles"""
-        applications = {}
+    def _scan_directory(self, directory: str, cached_dirs: Dict, cached_by_path: Dict,
+                        seen_dirs: Dict) -> List[Tuple[str, List[int], Optional[Dict]]]:
+        """Scan a directory for .app bundles (or .desktop entries)
+
+        Returns (path, fingerprint, cached record) per bundle; the cached
+        record is None when the bundle is new or changed and must be re-read.
+        """
+        bundles = []
         
         try:
-            for item in os.listdir(directory):
-                if item.endswith('.app'):
-                    app_path = os.path.join(directory, item)
-                    app_info = self._extract_app_info(app_path)
-                    if app_info:
-                        # Create multiple key variations for easier lookup
-                        app_name = app_info['name']
-                        applications[app_name.lower()] = app_info
+            for app_path in self._list_bundles(directory, cached_dirs, seen_dirs):
+                fingerprint = self._bundle_fingerprint(app_path)
+                if fingerprint is None:
+                    continue
+                
+                cached = cached_by_path.get(app_path)
+                if cached and cached.get('fingerprint') == fingerprint:
+                    bundles.append((app_path, fingerprint, cached))
+                else:
+                    bundles.append((app_path, fingerprint, None))
                         
-                        # Add alternative names and aliases
-                        alternatives = self._generate_alternatives(app_name)
-                        for alt in alternatives:
-                            applications[alt.lower()] = app_info
-                            
         except PermissionError:
             logger.warning(f"⚠️ Permission denied accessing {directory}")
         except Exception as e:
             logger.error(f"❌ Error scanning {directory}: {e}")
             
-        return applications
+        return bundles
+    
+    def _extract_many(self, app_paths: List[str]) -> List[Optional[Dict]]:
+        """Extract app info for many bundles with a bounded thread pool, preserving order"""
+        if len(app_paths) < 2 or self.max_workers <= 1:
+            return [self._extract_app_info(app_path) for app_path in app_paths]
+        
+        workers = min(self.max_workers, len(app_paths))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="app-discovery") as executor:
+            return list(executor.map(self._extract_app_info, app_paths))
+    
+    def _list_bundles(self, directory: str, cached_dirs: Dict, seen_dirs: Dict) -> List[str]:
+        """List bundles in a directory, skipping the walk if its mtime is unchanged"""
+        mtime_ns = os.stat(directory).st_mtime_ns
+        cached = cached_dirs.get(directory)
+        if cached and cached['mtime_ns'] == mtime_ns:
+            bundles = cached['bundles']
+        else:
+            with os.scandir(directory) as entries:
+                bundles = sorted(entry.path for entry in entries if entry.name.endswith(self.bundle_suffix))
+        
+        seen_dirs[directory] = {'mtime_ns': mtime_ns, 'bundles': bundles}
+        return bundles
+    
+    def _bundle_fingerprint(self, app_path: str) -> Optional[List[int]]:
+        """Return [mtime_ns, size] of the bundle's Info.plist (or the bundle itself)"""
+        try:
+            stat = os.stat(os.path.join(app_path, "Contents", "Info.plist"))
+        except OSError:
+            try:
+                stat = os.stat(app_path)
+            except OSError:
+                return None
+        return [stat.st_mtime_ns, stat.st_size]
     
     def _extract_app_info(self, app_path: str) -> Optional[Dict]:
         """Extract detailed information about an application"""
+        if self.platform == "xdg":
+            return self._extract_desktop_entry(app_path)
+        
         try:
             info_plist_path = os.path.join(app_path, "Contents", "Info.plist")
             
@@ -107,6 +243,13 @@ class ApplicationDiscovery:
             logger.debug(f"Error extracting info for {app_path}: {e}")
             return None
     
+    def _extract_desktop_entry(self, desktop_path: str) -> Optional[Dict]:
+        """Extract application information from an XDG .desktop entry"""
+        app_info = parse_desktop_entry(desktop_path)
+        if app_info and not app_info['category']:
+            app_info['category'] = self._categorize_app(app_info['name'])
+        return app_info
+    
     def _generate_alternatives(self, app_name: str) -> List[str]:
         """Generate alternative names and common abbreviations for an app"""
         alternatives = []
@@ -189,9 +332,9 @@ class ApplicationDiscovery:
         
         return 'Other'
     
-    def _get_system_applications(self) -> Dict[str, Dict]:
+    def _get_system_applications(self) -> List[Dict]:
         """Get system applications that might not be in standard locations"""
-        system_apps = {}
+        system_apps = []
         
         # Add some important system utilities
         special_apps = [
@@ -212,73 +355,64 @@ class ApplicationDiscovery:
                     'alternatives': [app['name'].lower()],
                     'category': 'System'
                 }
-                system_apps[app['name'].lower()] = app_info
+                system_apps.append(app_info)
         
         return system_apps
     
-    def save_database(self, applications: Dict[str, Dict]) -> None:
-        """Save the application database to a JSON file"""
+    def save_database(self, store: AppStore) -> None:
+        """Save the application database compactly and atomically"""
         try:
-            with open(self.app_database_path, 'w') as f:
-                json.dump(applications, f, indent=2, sort_keys=True)
+            store.save(self.app_database_path)
             logger.info(f"💾 Saved application database to {self.app_database_path}")
         except Exception as e:
             logger.error(f"❌ Error saving database: {e}")
     
-    def load_database(self) -> Dict[str, Dict]:
-        """Load the application database from JSON file"""
+    def load_database(self) -> AppStore:
+        """Load the application database, migrating the legacy format if needed"""
         try:
             if self.app_database_path.exists():
-                with open(self.app_database_path, 'r') as f:
-                    return json.load(f)
+                return AppStore.load(self.app_database_path)
             else:
                 logger.info("📝 No existing database found, will create new one")
-                return {}
+                return AppStore()
         except Exception as e:
             logger.error(f"❌ Error loading database: {e}")
-            return {}
+            return AppStore()
     
-    def refresh_database(self) -> Dict[str, Dict]:
-        """Refresh the application database"""
+    def refresh_database(self, incremental: bool = True) -> AppStore:
+        """Refresh the application database, re-reading only new or changed bundles"""
         logger.info("🔄 Refreshing application database...")
-        applications = self.discover_all_applications()
-        self.save_database(applications)
-        return applications
-    
-    def get_app_suggestions(self, query: str, max_suggestions: int = 5) -> List[Dict]:
-        """Get application suggestions based on query"""
-        database = self.load_database()
-        suggestions = []
-        
-        query_lower = query.lower().strip()
-        
-        # First, try exact matches
-        if query_lower in database:
-            suggestions.append(database[query_lower])
+        store = self.discover_all_applications(incremental=incremental)
+        stats = self.last_refresh_stats
         
-        # Then, try partial matches
-        for app_key, app_info in database.items():
-            if query_lower in app_key and app_info not in suggestions:
-                suggestions.append(app_info)
-            
-            if len(suggestions) >= max_suggestions:
-                break
-        
-        return suggestions[:max_suggestions]
+        # Nothing was added, changed or removed: keep the existing file as is
+        unchanged = not (stats['added'] or stats['changed'] or stats['removed'])
+        if not (unchanged and incremental and self.app_database_path.exists()):
+            self.save_database(store)
+        self.index.set_database(store)
+        return store
+    
+    def get_app_suggestions(self, query: str, max_suggestions: int = 5,
+                            prior: Optional[Callable[[str], float]] = None) -> List[Dict]:
+        """Get application suggestions based on query, optionally weighted by a usage prior"""
+        return self.index.suggest(query, max_suggestions, prior=prior)
 
 def main():
     """Main function to refresh the application database"""
     logging.basicConfig(level=logging.INFO)
     
     discovery = ApplicationDiscovery()
-    applications = discovery.refresh_database()
+    store = discovery.refresh_database()
     
     print(f"\n✅ Application discovery complete!")
-    print(f"📊 Found {len(applications)} total entries")
+    print(f"📊 Found {len(store)} applications with {len(store.aliases)} aliases")
+    stats = discovery.last_refresh_stats
+    print(f"🔁 {stats['added']} added, {stats['changed']} changed, {stats['removed']} removed "
+          f"in {stats['elapsed_ms']} ms")
     
     # Show some statistics
     categories = {}
-    for app_info in applications.values():
+    for app_info in store.records():
         category = app_info.get('category', 'Other')
         categories[category] = categories.get(category, 0) + 1
     
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Application Index Module for Jarvis
+Keeps the application database in memory and reloads it only when the
+database file changes on disk
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+try:
+    from .app_store import AppStore
+    from .fuzzy_index import TrigramIndex
+    from .phonetic import PhoneticIndex
+    from .app_listing import AppListing
+except ImportError:  # Running as a script from the tools directory
+    from app_store import AppStore
+    from fuzzy_index import TrigramIndex
+    from phonetic import PhoneticIndex
+    from app_listing import AppListing
+
+logger = logging.getLogger(__name__)
+
+class AppIndex:
+    """Thread-safe in-memory view of the application database"""
+
+    # Below this orthographic score, also try the phonetic index
+    PHONETIC_FALLBACK_SCORE = 0.8
+
+    # How much a usage prior of 1.0 adds to a match score
+    USAGE_WEIGHT = 0.5
+
+    # Exact match on a nickname or keyword: strong, but usage can outrank it
+    NICKNAME_SCORE = 0.9
+
+    def __init__(self, discovery):
+        self.discovery = discovery
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._store = AppStore()
+        self._records: List[Dict] = []
+        self._fuzzy = TrigramIndex()
+        self._phonetic = PhoneticIndex()
+        self._listing: Optional[AppListing] = None
+        self.loads = 0
+        # Set by AppWatcher; changes it has seen are applied before any lookup
+        self.watcher = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the database file, or None if it is missing"""
+        try:
+            stat = os.stat(self.discovery.app_database_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def ensure_fresh(self) -> None:
+        """Reload the database if the file changed since it was last loaded"""
+        watcher = self.watcher
+        if watcher is not None and watcher.pending:
+            watcher.flush()
+
+        stamp = self._file_stamp()
+        if stamp is not None and stamp == self._stamp:
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            stamp = self._file_stamp()
+            if stamp is not None and stamp == self._stamp:
+                return
+            self._install(self.discovery.load_database(), stamp)
+            self.loads += 1
+            logger.debug(f"📥 Loaded application index ({len(self._store)} apps)")
+
+    def set_database(self, store: AppStore) -> None:
+        """Replace the index contents after the database was rewritten"""
+        with self._lock:
+            self._install(store, self._file_stamp())
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup"""
+        with self._lock:
+            self._stamp = None
+
+    def _install(self, store: AppStore, stamp) -> None:
+        """Swap in a new store; readers keep using the previous one until then"""
+        changes = self._fuzzy.sync(store.aliases)
+        self._phonetic.sync(store.aliases)
+        self._store = store
+        self._records = store.records()
+        self._listing = None  # Rebuilt on the next listing request
+        self._stamp = stamp
+        logger.debug(f"🔤 Fuzzy index updated: {changes}")
+
+    def database(self) -> AppStore:
+        """Return the current application store (do not mutate)"""
+        self.ensure_fresh()
+        return self._store
+
+    def get(self, alias: str) -> Optional[Dict]:
+        """Look up an application by exact alias"""
+        self.ensure_fresh()
+        return self._store.get(alias.lower().strip())
+
+    def unique_apps(self) -> List[Dict]:
+        """Return one record per application"""
+        self.ensure_fresh()
+        return self._records
+
+    def listing(self) -> AppListing:
+        """Return the categorized listing, derived only when the app set changed"""
+        self.ensure_fresh()
+        listing = self._listing
+        if listing is None:
+            with self._lock:
+                if self._listing is None:
+                    self._listing = AppListing(self._records)
+                listing = self._listing
+        return listing
+
+    def suggest(self, query: str, max_suggestions: int = 5,
+                prior: Optional[Callable[[str], float]] = None) -> List[Dict]:
+        """Return the best-matching apps for a query, ranked by fuzzy score
+
+        prior(app_id) in [0, 1] (e.g. launch frequency) is added to each
+        match score, so a nickname shared by several apps goes to the one the
+        user launches. An exact match on an app's own name always ranks first.
+        """
+        # Apply pending watcher changes first: flush() waits for a refresh that needs this lock
+        self.ensure_fresh()
+        with self._lock:
+            store = self._store
+            query_lower = query.lower().strip()
+            scored = {}
+
+            # Rank fuzzy matches (substrings, typos)
+            for app_id, score, alias in self._fuzzy.search(query_lower, k=max_suggestions + 1):
+                if score > scored.get(app_id, 0.0):
+                    scored[app_id] = score
+
+            # Exact matches: the app's own name wins outright, a nickname only nearly
+            exact = store.get(query_lower)
+            pinned = exact if exact and is_own_name(exact, query_lower) else None
+            if exact and not pinned:
+                scored[exact['id']] = self.NICKNAME_SCORE
+
+            # Second tier: phonetic matches for speech slips ("fire fox", "note ion")
+            if max(scored.values(), default=0.0) < self.PHONETIC_FALLBACK_SCORE:
+                for app_id, score, alias in self._phonetic.search(query_lower, k=max_suggestions + 1):
+                    if score > scored.get(app_id, 0.0):
+                        scored[app_id] = score
+
+            if prior is not None:
+                for app_id in scored:
+                    scored[app_id] += self.USAGE_WEIGHT * prior(app_id)
+
+            suggestions = [pinned] if pinned else []
+            for app_id in sorted(scored, key=lambda app_id: -scored[app_id]):
+                record = store.apps.get(app_id)
+                if record is not None and record is not pinned:
+                    suggestions.append(record)
+
+            return suggestions[:max_suggestions]
+
+
+def is_own_name(app_info: Dict, alias: str) -> bool:
+    """True if an alias is the app's own name rather than a nickname or keyword"""
+    return alias in ((app_info.get('name') or '').lower(), (app_info.get('display_name') or '').lower())
+
+_indexes: Dict[Path, AppIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_app_index(discovery) -> AppIndex:
+    """Return the process-wide index for the discovery's database file"""
+    path = Path(discovery.app_database_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = AppIndex(discovery)
+            _indexes[path] = index
+        return index
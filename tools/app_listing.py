@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+App Listing Module for Jarvis
+Categorized, sorted view of the installed applications, derived once per
+database change, with a compact spoken summary and paginated detail pages
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# Categories in presentation order; unknown categories follow alphabetically
+CATEGORY_ORDER = ['System', 'Browsers', 'Development', 'Communication', 'Media',
+                  'Productivity', 'Gaming', 'Utilities', 'Other']
+
+# Spoken words for categories that are not a prefix of the category name
+CATEGORY_ALIASES = {
+    'games': 'Gaming', 'game': 'Gaming', 'music': 'Media', 'video': 'Media', 'photo': 'Media',
+    'chat': 'Communication', 'messaging': 'Communication', 'office': 'Productivity',
+    'utility': 'Utilities', 'web': 'Browsers', 'coding': 'Development', 'programming': 'Development',
+}
+
+# Names shown per category in the overview, and per page of a single category
+PREVIEW_SIZE = 8
+PAGE_SIZE = 30
+
+class AppListing:
+    """Immutable per-category listing with memoized responses"""
+
+    def __init__(self, records: List[Dict]):
+        categories: Dict[str, List[str]] = {}
+        for app_info in records:
+            category = app_info.get('category') or 'Other'
+            categories.setdefault(category, []).append(app_info.get('display_name') or app_info['name'])
+
+        order = [category for category in CATEGORY_ORDER if category in categories]
+        order += sorted(category for category in categories if category not in CATEGORY_ORDER)
+        self.categories: Dict[str, List[str]] = {
+            category: sorted(categories[category], key=str.lower) for category in order
+        }
+        self.total = len(records)
+        self._responses: Dict[Tuple, str] = {}
+
+    def find_category(self, name: str) -> Optional[str]:
+        """Resolve a spoken category name ("browser", "dev", "games") to a category"""
+        name = name.lower().strip()
+        if not name:
+            return None
+        alias = CATEGORY_ALIASES.get(name)
+        if alias in self.categories:
+            return alias
+        for category in self.categories:
+            lower = category.lower()
+            if name == lower or lower.startswith(name) or name.startswith(lower.rstrip('s')):
+                return category
+        return None
+
+    def spoken_summary(self) -> str:
+        """Short overview meant to be read aloud: counts per category, no app names"""
+        key = ('summary',)
+        if key not in self._responses:
+            counts = ", ".join(f"{len(names)} {category}" for category, names in self.categories.items())
+            self._responses[key] = (f"📱 You have {self.total} applications: {counts}. "
+                                    f"Ask for a category to hear its apps, or say 'open [app name]'.")
+        return self._responses[key]
+
+    def overview(self) -> str:
+        """On-screen overview: every category with its first few apps"""
+        key = ('overview',)
+        if key not in self._responses:
+            result = f"📱 Available Applications ({self.total} total):\n\n"
+            for category, names in self.categories.items():
+                result += f"📂 **{category}** ({len(names)}): {', '.join(names[:PREVIEW_SIZE])}"
+                if len(names) > PREVIEW_SIZE:
+                    result += f" ... and {len(names) - PREVIEW_SIZE} more"
+                result += "\n\n"
+            result += "💡 Just say 'open [app name]' to launch any application!"
+            self._responses[key] = result
+        return self._responses[key]
+
+    def category_page(self, category: str, page: int = 1) -> str:
+        """One page of a single category's apps"""
+        names = self.categories[category]
+        pages = max(1, -(-len(names) // PAGE_SIZE))
+        page = min(max(1, page), pages)
+        key = ('page', category, page)
+        if key not in self._responses:
+            shown = names[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+            result = f"📂 {category} ({len(names)} apps"
+            result += f", page {page} of {pages}): " if pages > 1 else "): "
+            result += ", ".join(shown) + "."
+            if page < pages:
+                result += f" Ask for page {page + 1} to hear more."
+            self._responses[key] = result
+        return self._responses[key]
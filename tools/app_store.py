@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Application Store Module for Jarvis
+Normalized application database: one record per app keyed by a stable id,
+plus a separate alias → id map, saved compactly and atomically
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 2
+
+class AppStore:
+    """One record per application plus an alias → id map"""
+
+    def __init__(self, apps: Optional[Dict[str, Dict]] = None,
+                 aliases: Optional[Dict[str, str]] = None,
+                 dirs: Optional[Dict[str, Dict]] = None):
+        self.apps: Dict[str, Dict] = apps if apps is not None else {}
+        self.aliases: Dict[str, str] = aliases if aliases is not None else {}
+        self.dirs: Dict[str, Dict] = dirs if dirs is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.apps)
+
+    def __contains__(self, alias: str) -> bool:
+        return alias in self.aliases
+
+    def get(self, alias: str) -> Optional[Dict]:
+        """Return the record for an alias, or None"""
+        app_id = self.aliases.get(alias)
+        return self.apps.get(app_id) if app_id is not None else None
+
+    def records(self) -> List[Dict]:
+        """Return all application records"""
+        return list(self.apps.values())
+
+    def alias_items(self) -> Iterator[Tuple[str, Dict]]:
+        """Iterate (alias, record) pairs"""
+        apps = self.apps
+        for alias, app_id in self.aliases.items():
+            record = apps.get(app_id)
+            if record is not None:
+                yield alias, record
+
+    def by_path(self) -> Dict[str, Dict]:
+        """Return a path → record map"""
+        return {record['path']: record for record in self.apps.values()}
+
+    def new_id(self, app_info: Dict) -> str:
+        """Pick a stable id: the bundle id when it is free, otherwise the path"""
+        bundle_id = app_info.get('bundle_id')
+        if bundle_id and bundle_id not in self.apps:
+            return bundle_id
+        return app_info['path']
+
+    def add(self, app_id: str, record: Dict, aliases: List[str]) -> None:
+        """Add a record and point its aliases at it (later aliases win collisions)"""
+        record['id'] = app_id
+        self.apps[app_id] = record
+        for alias in aliases:
+            self.aliases[alias.lower()] = app_id
+
+    def to_dict(self) -> Dict:
+        return {'version': STORE_VERSION, 'apps': self.apps, 'aliases': self.aliases, 'dirs': self.dirs}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AppStore":
+        return cls(data.get('apps') or {}, data.get('aliases') or {}, data.get('dirs') or {})
+
+    @classmethod
+    def from_legacy(cls, database: Dict[str, Dict]) -> "AppStore":
+        """Convert the old alias → full app info format, collapsing aliases by path"""
+        store = cls()
+        ids_by_path = {}
+        for alias, app_info in database.items():
+            path = app_info.get('path')
+            if not path:
+                continue
+            app_id = ids_by_path.get(path)
+            if app_id is None:
+                record = dict(app_info)
+                record.pop('fingerprint', None)  # Force a plist re-read on the next refresh
+                app_id = store.new_id(record)
+                ids_by_path[path] = app_id
+                store.add(app_id, record, [])
+            store.aliases[alias] = app_id
+        return store
+
+    def save(self, path: Path) -> None:
+        """Write the store compactly and atomically (temp file + rename)"""
+        path = Path(path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.to_dict(), f, separators=(',', ':'), sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "AppStore":
+        """Load a store, migrating the legacy format in place on first load"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        if isinstance(data, dict) and data.get('version') == STORE_VERSION:
+            return cls.from_dict(data)
+
+        store = cls.from_legacy(data)
+        logger.info(f"🔁 Migrating application database to normalized format "
+                    f"({len(data)} aliases → {len(store.apps)} apps)")
+        try:
+            store.save(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save migrated database: {e}")
+        return store
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+App Usage Module for Jarvis
+Counts application launches with a time-decayed score, used as a ranking
+prior so ambiguous names resolve to the app the user actually uses
+"""
+
+import os
+import json
+import math
+import time
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A launch counts half as much after this long
+HALF_LIFE_SECONDS = 14 * 24 * 60 * 60
+
+# Decayed score at which the prior reaches 0.5
+PRIOR_SATURATION = 3.0
+
+class AppUsageStore:
+    """Persisted per-app launch count, last launch time and decayed score"""
+
+    def __init__(self, usage_path: Optional[Path] = None):
+        self.usage_path = Path(usage_path or Path(__file__).parent / "app_usage.json")
+        self._lock = threading.Lock()
+        # app id → [decayed score, last launch time, total launches]
+        self._entries: Optional[Dict[str, List[float]]] = None
+
+    def _load(self) -> Dict[str, List[float]]:
+        if self._entries is None:
+            try:
+                with open(self.usage_path, 'r') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable usage store: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the store atomically (temp file + rename)"""
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=f".{self.usage_path.name}.", dir=self.usage_path.parent)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f, separators=(',', ':'))
+            os.replace(temp_path, self.usage_path)
+        except Exception as e:
+            logger.error(f"❌ Error saving app usage: {e}")
+
+    def _decayed(self, entry: List[float], now: float) -> float:
+        score, last_used, _ = entry
+        return score * math.pow(0.5, max(0.0, now - last_used) / HALF_LIFE_SECONDS)
+
+    def record(self, app_id: str, now: Optional[float] = None) -> None:
+        """Record one successful launch"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(app_id)
+            if entry is None:
+                entries[app_id] = [1.0, now, 1]
+            else:
+                entries[app_id] = [round(self._decayed(entry, now) + 1.0, 4), now, entry[2] + 1]
+            self._save()
+
+    def score(self, app_id: str, now: Optional[float] = None) -> float:
+        """Time-decayed launch score (0.0 for apps never launched)"""
+        entry = self._load().get(app_id)
+        if entry is None:
+            return 0.0
+        return self._decayed(entry, time.time() if now is None else now)
+
+    def prior(self, app_id: str) -> float:
+        """Usage prior in [0, 1): rises with frequent, recent launches"""
+        score = self.score(app_id)
+        return score / (score + PRIOR_SATURATION)
+
+    def most_used(self, limit: int = 10) -> List[str]:
+        """App ids ordered by decayed score, best first"""
+        now = time.time()
+        entries = self._load()
+        ranked = sorted(entries, key=lambda app_id: -self._decayed(entries[app_id], now))
+        return ranked[:limit]
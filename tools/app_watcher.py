@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Application Watcher Module for Jarvis
+Watches the application directories in the background and applies
+incremental updates to the app database as apps are installed, updated
+or removed (inotify on Linux, mtime polling elsewhere)
+"""
+
+import os
+import sys
+import time
+import ctypes
+import select
+import threading
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+
+class InotifyBackend:
+    """Blocking change notifications from the Linux kernel via inotify"""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[str, int] = {}
+
+    def watch(self, paths: List[str]) -> None:
+        """Watch exactly the given directories (adding new ones, dropping stale ones)"""
+        wanted = set(paths)
+        for path in list(self._watches):
+            if path not in wanted:
+                self._libc.inotify_rm_watch(self.fd, self._watches.pop(path))
+        for path in wanted - set(self._watches):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd >= 0:
+                self._watches[path] = wd
+            else:
+                logger.debug(f"Could not watch {path}: errno {ctypes.get_errno()}")
+
+    def ready(self) -> bool:
+        """Return True if events are queued, without consuming them"""
+        readable, _, _ = select.select([self.fd], [], [], 0)
+        return bool(readable)
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until events arrive (True) or the timeout expires (False); drains the queue"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Fallback that compares directory mtimes at a fixed interval
+
+    Lookups also re-check (at most once a second), so results are never
+    more than a second stale even though the background poll is slow.
+    """
+
+    # Lookups re-check directory mtimes at most this often
+    READY_CHECK_SECONDS = 1.0
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._paths: List[str] = []
+        self._stamps: Dict[str, Optional[int]] = {}
+        self._checked = 0.0
+
+    def _stamp(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def watch(self, paths: List[str]) -> None:
+        self._paths = list(paths)
+        self._stamps = {path: self._stamp(path) for path in self._paths}
+        self._checked = time.monotonic()
+
+    def changed(self) -> bool:
+        """Return True if any watched directory changed since the last check"""
+        stamps = {path: self._stamp(path) for path in self._paths}
+        changed = stamps != self._stamps
+        self._stamps = stamps
+        self._checked = time.monotonic()
+        return changed
+
+    def ready(self) -> bool:
+        if time.monotonic() - self._checked < self.READY_CHECK_SECONDS:
+            return False
+        return self.changed()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Sleep; directories are only stat'ed once per interval"""
+        remaining = self._checked + self.interval - time.monotonic()
+        if timeout is not None and timeout < remaining:
+            time.sleep(timeout)
+            return False
+        time.sleep(max(0.0, remaining))
+        return self.changed()
+
+    def close(self) -> None:
+        pass
+
+
+class AppWatcher:
+    """Keeps the application database current as apps change on disk"""
+
+    def __init__(self, discovery, debounce_seconds: float = 1.5, max_delay_seconds: float = 10.0,
+                 poll_interval: float = 30.0):
+        self.discovery = discovery
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.poll_interval = poll_interval
+        self.backend = None
+        self.refreshes = 0
+        self._pending = threading.Event()
+        self._refreshing = False
+        self._refresh_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> bool:
+        """True when changes were seen (or are being applied) but not yet in the index"""
+        if self._pending.is_set() or self._refreshing:
+            return True
+        backend = self.backend
+        if backend is not None and backend.ready():
+            self._pending.set()
+            return True
+        return False
+
+    def _create_backend(self):
+        if sys.platform.startswith("linux"):
+            try:
+                return InotifyBackend()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable ({e}), polling for app changes")
+        return PollingBackend(self.poll_interval)
+
+    def _watch_paths(self) -> List[str]:
+        """Search directories plus each known bundle's Contents directory (for Info.plist edits)"""
+        paths = []
+        for search_path in self.discovery.search_paths:
+            expanded_path = os.path.expanduser(search_path)
+            if os.path.isdir(expanded_path):
+                paths.append(expanded_path)
+        for record in self.discovery.index.unique_apps():
+            contents = os.path.join(record['path'], "Contents")
+            if os.path.isdir(contents):
+                paths.append(contents)
+        return paths
+
+    def start(self) -> "AppWatcher":
+        """Start watching in a daemon thread"""
+        if self._thread is not None:
+            return self
+        self.backend = self._create_backend()
+        self.backend.watch(self._watch_paths())
+        self.discovery.index.watcher = self
+        self._thread = threading.Thread(target=self._run, name="app-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"👀 Watching applications with {type(self.backend).__name__}")
+        return self
+
+    def stop(self) -> None:
+        """Stop watching"""
+        self._stop.set()
+        if self.discovery.index.watcher is self:
+            self.discovery.index.watcher = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Idle: block in select()/sleep until something changes
+            if not self.backend.wait(timeout=1.0):
+                continue
+            self._pending.set()
+
+            # Debounce: wait for a quiet period so an install is applied once
+            first_event = time.monotonic()
+            while (not self._stop.is_set()
+                   and time.monotonic() - first_event < self.max_delay_seconds
+                   and self.backend.wait(timeout=self.debounce_seconds)):
+                # A lookup may have flushed in the meantime; these events are newer
+                self._pending.set()
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply pending changes now; lookups call this so they never see stale results"""
+        with self._refresh_lock:
+            if not self._pending.is_set():
+                return
+            self._pending.clear()
+            self._refreshing = True
+            try:
+                self.discovery.refresh_database(incremental=True)
+                self.refreshes += 1
+                if self.backend is not None:
+                    self.backend.watch(self._watch_paths())
+            except Exception as e:
+                logger.error(f"❌ Background app refresh failed: {e}")
+            finally:
+                self._refreshing = False
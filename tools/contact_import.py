@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Contact Import Module for Jarvis
+Stream-parses vCard (.vcf) and CSV address-book exports one card/row at a
+time, de-duplicates people by email or phone, and merges them into
+tools/contacts_imported.json, which the contact directory loads alongside
+the hand-edited contacts.json. Re-importing an unchanged file is a no-op;
+a changed file only replaces that file's own records.
+"""
+
+import os
+import csv
+import json
+import quopri
+import hashlib
+import argparse
+import tempfile
+from typing import Dict, Iterator, List, Optional
+import logging
+
+try:
+    from .contacts import normalize_phone, IMPORTED_CONTACTS_FILE
+except ImportError:  # Running as a script from the tools directory
+    from contacts import normalize_phone, IMPORTED_CONTACTS_FILE
+
+logger = logging.getLogger(__name__)
+
+IMPORT_STATE_FILE = os.path.join(os.path.dirname(__file__), 'contacts_import_state.json')
+
+# CSV headers used by Google, Outlook and Apple exports
+CSV_NAME_COLUMNS = ("name", "full name", "display name", "file as")
+CSV_FIRST_NAME_COLUMNS = ("first name", "given name")
+CSV_LAST_NAME_COLUMNS = ("last name", "family name")
+CSV_NICKNAME_COLUMNS = ("nickname", "nick name")
+CSV_MULTI_VALUE_SEPARATOR = ":::"  # Google puts several values in one cell
+
+VCARD_PROPERTIES = {"END", "FN", "N", "ORG", "NICKNAME", "EMAIL", "TEL"}
+
+FINGERPRINT_CHUNK = 1 << 20
+
+def _unescape(value: str) -> str:
+    return (value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",")
+            .replace("\\;", ";").replace("\\\\", "\\")).strip()
+
+def _unfolded_lines(f) -> Iterator[str]:
+    """Logical vCard lines: folded continuations (leading space/tab) and
+    quoted-printable soft breaks (trailing "=") joined back up"""
+    pending = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if pending is not None and line[:1] in (" ", "\t"):
+            pending += line[1:]
+            continue
+        if pending is not None and pending.endswith("=") and "QUOTED-PRINTABLE" in pending.upper().split(":", 1)[0]:
+            pending = pending[:-1] + line
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+def iter_vcards(path: str) -> Iterator[Dict]:
+    """Yield one record (name, emails, phones, aliases) per vCard, reading the file line by line"""
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        card = None
+        for line in _unfolded_lines(f):
+            head, _, value = line.partition(":")
+            prop, _, params = head.partition(";")
+            prop = prop.rsplit(".", 1)[-1].upper()  # "item1.EMAIL" → "EMAIL"
+
+            if prop == "BEGIN" and value.upper() == "VCARD":
+                card = {'name': "", 'n': "", 'org': "", 'emails': [], 'phones': [], 'aliases': []}
+                continue
+            if card is None or prop not in VCARD_PROPERTIES:
+                continue  # PHOTO, ADR, NOTE ... are skipped without further parsing
+            if prop == "END":
+                record = _finish_vcard(card)
+                card = None
+                if record:
+                    yield record
+                continue
+
+            params = params.upper()
+            if "QUOTED-PRINTABLE" in params:
+                charset = params.partition("CHARSET=")[2].split(";")[0] or "utf-8"
+                value = quopri.decodestring(value.encode('ascii', 'replace')).decode(charset.lower(), 'replace')
+
+            if prop == "FN":
+                card['name'] = _unescape(value)
+            elif prop == "N":
+                fields = [_unescape(field) for field in value.split(";")] + ["", ""]
+                card['n'] = " ".join(part for part in (fields[1], fields[0]) if part)
+            elif prop == "ORG":
+                card['org'] = _unescape(value.split(";")[0])
+            elif prop == "NICKNAME":
+                card['aliases'] += [alias.strip() for alias in _unescape(value).split(",") if alias.strip()]
+            elif prop == "EMAIL":
+                email = value.strip().lower()
+                if "@" in email:
+                    card['emails'].insert(0 if "PREF" in params else len(card['emails']), email)
+            elif prop == "TEL":
+                phone = normalize_phone(value.replace("tel:", ""))
+                if phone:
+                    preferred = "PREF" in params or "CELL" in params
+                    card['phones'].insert(0 if preferred else len(card['phones']), phone)
+
+def _finish_vcard(card: Dict) -> Optional[Dict]:
+    name = card['name'] or card['n'] or card['org']
+    return _record(name, card['emails'], card['phones'], card['aliases'])
+
+def _record(name: str, emails: List[str], phones: List[str], aliases: List[str]) -> Optional[Dict]:
+    """A normalized record, or None if it has no name or nothing to reach the person by"""
+    name = " ".join(name.split())
+    emails = list(dict.fromkeys(emails))
+    phones = list(dict.fromkeys(phones))
+    if not name or not (emails or phones):
+        return None
+    return {'name': name, 'emails': emails, 'phones': phones,
+            'aliases': [alias for alias in dict.fromkeys(aliases) if alias.lower() != name.lower()]}
+
+def iter_csv(path: str) -> Iterator[Dict]:
+    """Yield one record per CSV row, reading the file row by row"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = {column.lower().strip(): column for column in reader.fieldnames or []}
+
+        def pick(candidates):
+            return [columns[candidate] for candidate in candidates if candidate in columns]
+
+        name_columns = pick(CSV_NAME_COLUMNS)
+        first_columns = pick(CSV_FIRST_NAME_COLUMNS)
+        last_columns = pick(CSV_LAST_NAME_COLUMNS)
+        nickname_columns = pick(CSV_NICKNAME_COLUMNS)
+        # "E-mail 1 - Value", "E-mail Address", "Mobile Phone", "Phone 1 - Value" ... but not their type labels
+        email_columns = [column for lower, column in columns.items()
+                         if ("email" in lower or "e-mail" in lower) and "type" not in lower and "label" not in lower]
+        phone_columns = [column for lower, column in columns.items()
+                         if ("phone" in lower or "mobile" in lower) and "type" not in lower and "label" not in lower]
+
+        for row in reader:
+            name = next((row[column] for column in name_columns if row.get(column)), "")
+            if not name:
+                name = " ".join(row[column] for column in first_columns + last_columns if row.get(column))
+            emails, phones = [], []
+            for column in email_columns:
+                for value in (row.get(column) or "").split(CSV_MULTI_VALUE_SEPARATOR):
+                    if "@" in value:
+                        emails.append(value.strip().lower())
+            for column in phone_columns:
+                for value in (row.get(column) or "").split(CSV_MULTI_VALUE_SEPARATOR):
+                    phone = normalize_phone(value)
+                    if phone:
+                        phones.append(phone)
+            aliases = [row[column].strip() for column in nickname_columns if (row.get(column) or "").strip()]
+            record = _record(name, emails, phones, aliases)
+            if record:
+                yield record
+
+def iter_address_book(path: str) -> Iterator[Dict]:
+    """Records from a .vcf/.vcard or .csv export"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in (".vcf", ".vcard"):
+        return iter_vcards(path)
+    if suffix == ".csv":
+        return iter_csv(path)
+    raise ValueError(f"Unsupported address book format: {suffix or path} (use .vcf or .csv)")
+
+def record_fingerprint(record: Dict) -> str:
+    return hashlib.blake2b(json.dumps(record, sort_keys=True).encode(), digest_size=12).hexdigest()
+
+def file_fingerprint(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(FINGERPRINT_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def merge_records(records: Iterator[Dict]) -> Dict[str, Dict]:
+    """De-duplicate records that share an email or phone and give each person a unique name
+
+    Returns the contacts.json-style mapping name → {email, phone, aliases}.
+    """
+    people: List[Optional[Dict]] = []
+    owner: Dict[str, int] = {}  # email or phone → index in people
+    merged = 0
+    for record in records:
+        keys = record['emails'] + record['phones']
+        owners = sorted({owner[key] for key in keys if key in owner})
+        if not owners:
+            index = len(people)
+            people.append({'name': record['name'], 'emails': [], 'phones': [], 'aliases': []})
+        else:
+            index = owners[0]
+            merged += 1
+            for other in owners[1:]:  # This record links two people we thought were different
+                person = people[other]
+                people[other] = None
+                for key in person['emails'] + person['phones']:
+                    owner[key] = index
+                _absorb(people[index], person)
+        _absorb(people[index], record)
+        for key in keys:
+            owner[key] = index
+
+    contacts: Dict[str, Dict] = {}
+    for person in people:
+        if person is None:
+            continue
+        entry = {'email': person['emails'][0] if person['emails'] else None,
+                 'phone': person['phones'][0] if person['phones'] else None,
+                 'aliases': person['aliases']}
+        name = person['name']
+        if name in contacts:
+            # Two different people with the same name: both stay reachable by the plain name
+            entry['aliases'] = [name] + entry['aliases']
+            name = f"{name} ({entry['email'] or entry['phone']})"
+        contacts[name] = entry
+    if merged:
+        logger.info(f"📇 Merged {merged} duplicate contact record(s)")
+    return contacts
+
+def _absorb(person: Dict, record: Dict) -> None:
+    for field in ('emails', 'phones', 'aliases'):
+        for value in record[field]:
+            if value not in person[field]:
+                person[field].append(value)
+    if record['name'] != person['name'] and record['name'] not in person['aliases']:
+        person['aliases'].append(record['name'])
+
+
+class ContactImporter:
+    """Imports address books into contacts_imported.json, incrementally per source file"""
+
+    def __init__(self, imported_path: Optional[str] = None, state_path: Optional[str] = None):
+        self.imported_path = imported_path or IMPORTED_CONTACTS_FILE
+        self.state_path = state_path or IMPORT_STATE_FILE
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'sources': {}}
+
+    def _write_json(self, path: str, data: Dict) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            # dumps rather than dump: dump streams through the pure-Python encoder
+            f.write(json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _merge(state: Dict) -> Dict[str, Dict]:
+        # Sources in a fixed order, so the same files always produce the same names
+        return merge_records(record for source in sorted(state['sources'])
+                             for record in state['sources'][source]['records'].values())
+
+    def import_file(self, path: str) -> Dict:
+        """Import (or re-import) one export file; returns counts of what changed"""
+        source = os.path.abspath(path)
+        state = self._load_state()
+        previous = state['sources'].get(source, {})
+        fingerprint = file_fingerprint(source)
+        if previous.get('fingerprint') == fingerprint:
+            return {'source': source, 'unchanged_file': True, 'records': len(previous.get('records', {})),
+                    'added': 0, 'removed': 0}
+
+        old_records = previous.get('records', {})
+        records: Dict[str, Dict] = {}
+        for record in iter_address_book(source):
+            records.setdefault(record_fingerprint(record), record)
+        added = sum(1 for key in records if key not in old_records)
+        removed = sum(1 for key in old_records if key not in records)
+
+        state['sources'][source] = {'fingerprint': fingerprint, 'records': records}
+        if added or removed or not os.path.exists(self.imported_path):
+            self._write_json(self.imported_path, self._merge(state))
+        self._write_json(self.state_path, state)
+
+        stats = {'source': source, 'unchanged_file': False, 'records': len(records),
+                 'added': added, 'removed': removed}
+        logger.info(f"📇 Imported {os.path.basename(source)}: {len(records)} records "
+                    f"(+{added} -{removed})")
+        return stats
+
+    def remove_source(self, path: str) -> bool:
+        """Forget everything imported from one file"""
+        source = os.path.abspath(path)
+        state = self._load_state()
+        if state['sources'].pop(source, None) is None:
+            return False
+        self._write_json(self.imported_path, self._merge(state))
+        self._write_json(self.state_path, state)
+        return True
+
+
+def main():
+    """Import address book exports from the command line"""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Import vCard/CSV address books into Jarvis contacts")
+    parser.add_argument("files", nargs="+", help=".vcf or .csv exports")
+    parser.add_argument("--remove", action="store_true", help="forget contacts imported from these files")
+    args = parser.parse_args()
+
+    importer = ContactImporter()
+    for path in args.files:
+        if args.remove:
+            print(f"{'🗑️ Removed' if importer.remove_source(path) else '⚠️ Not imported'}: {path}")
+            continue
+        stats = importer.import_file(path)
+        if stats['unchanged_file']:
+            print(f"✅ {path}: unchanged since the last import ({stats['records']} records)")
+        else:
+            print(f"✅ {path}: {stats['records']} records (+{stats['added']} -{stats['removed']})")
+    print(f"\n💾 Contacts saved to: {importer.imported_path}")
+
+if __name__ == "__main__":
+    main()
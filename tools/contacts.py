@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Contact Directory Module for Jarvis
+One in-memory view of tools/contacts.json (plus address books imported into
+tools/contacts_imported.json) shared by the email and calling tools: loaded
+once, reloaded when a file changes, with typed email/phone fields and name,
+alias, word and phonetic indexes for ranked lookups
+
+contacts.json maps a name to one of:
+  "mom": "mom@example.com"                      an email address or phone number
+  "dad": {"email": "...", "phone": "+1 555 0100",
+          "aliases": ["father", "papa"]}        typed fields and extra names
+  "family": ["mom", "dad", "amy@example.com"]   a group of contacts/addresses
+"""
+
+import os
+import re
+import json
+import threading
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+import logging
+
+try:
+    from .fuzzy_index import normalize_name
+    from .phonetic import PhoneticIndex, compact_name
+except ImportError:  # Running as a script from the tools directory
+    from fuzzy_index import normalize_name
+    from phonetic import PhoneticIndex, compact_name
+
+logger = logging.getLogger(__name__)
+
+CONTACTS_FILE = os.path.join(os.path.dirname(__file__), 'contacts.json')
+IMPORTED_CONTACTS_FILE = os.path.join(os.path.dirname(__file__), 'contacts_imported.json')
+
+_PHONE_CHARS_RE = re.compile(r"^\+?[\d\s().-]+$")
+
+# Ranked match tiers: a higher tier always wins, then the shorter name, then alphabetical
+EXACT_SCORE = 1.0       # "mom" is a name or alias
+COMPACT_SCORE = 0.95    # "mam a" / "mama" once spacing and punctuation are ignored
+WORDS_OF_NAME = 0.9     # "john" for "John Smith"
+NAME_IN_QUERY = 0.85    # "my mom" contains the name "mom"
+PHONETIC_WEIGHT = 0.8   # Phonetic similarity (0.6..1) scaled below the spelled tiers
+MIN_PHONETIC_SCORE = 0.6
+MAX_QUERY_WORDS = 8     # Longer queries skip the name-in-query tier (2^n subsets)
+
+def normalize_phone(value: str) -> Optional[str]:
+    """Digits with an optional leading +, or None if value is not a phone number"""
+    value = value.strip()
+    if not _PHONE_CHARS_RE.match(value):
+        return None
+    digits = "".join(char for char in value if char.isdigit())
+    if len(digits) < 3:
+        return None
+    return ("+" if value.startswith("+") else "") + digits
+
+def parse_contact(name: str, value) -> Dict:
+    """Turn one contacts.json entry into a typed contact record"""
+    contact = {'name': name, 'email': None, 'phone': None, 'aliases': [], 'members': None}
+    if isinstance(value, list):
+        contact['members'] = [str(member) for member in value]
+    elif isinstance(value, dict):
+        contact['email'] = (value.get('email') or "").strip() or None
+        phone = value.get('phone')
+        contact['phone'] = normalize_phone(str(phone)) if phone else None
+        contact['aliases'] = [str(alias) for alias in value.get('aliases', [])]
+    elif isinstance(value, str):
+        if "@" in value:
+            contact['email'] = value.strip()
+        else:
+            contact['phone'] = normalize_phone(value)
+    return contact
+
+def contact_handle(contact: Dict) -> Optional[str]:
+    """Address to call on FaceTime: the phone number if known, else the email"""
+    return contact['phone'] or contact['email']
+
+
+class ContactDirectory:
+    """contacts.json with O(1) name/alias lookups, reloaded on change
+
+    Hand-edited contacts come first: they keep their names and aliases when
+    an imported contact claims the same one.
+    """
+
+    def __init__(self, contacts_path: Optional[str] = None, imported_path: Optional[str] = None):
+        self.contacts_path = contacts_path or CONTACTS_FILE
+        self.imported_path = imported_path or (IMPORTED_CONTACTS_FILE if contacts_path is None else None)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple] = None
+        self._contacts: Dict[str, Dict] = {}
+        self._names: Dict[str, str] = {}     # normalized name or alias → contact name
+        self._compact: Dict[str, str] = {}   # name without spaces/punctuation → contact name
+        self._words: Dict[str, set] = {}     # word of a name or alias → contact names
+        self._word_sets: Dict[frozenset, set] = {}  # all words of a name or alias → contact names
+        self._spoken: Dict[str, str] = {}
+        self._phonetic: Optional[PhoneticIndex] = None  # Built on the first misheard name
+
+    # ----- loading -----
+
+    def _paths(self) -> List[str]:
+        return [path for path in (self.contacts_path, self.imported_path) if path]
+
+    def _file_stamp(self) -> Tuple:
+        stamps = []
+        for path in self._paths():
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _read(self, path: str) -> Dict:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Could not load contacts from {path}: {e}")
+            return {}
+
+    def _ensure_fresh(self) -> None:
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            self._build([self._read(path) for path in self._paths()])
+            self._stamp = stamp
+            logger.debug(f"📇 Loaded {len(self._contacts)} contacts")
+
+    def _build(self, sources: List[Dict]) -> None:
+        contacts: Dict[str, Dict] = {}
+        names: Dict[str, str] = {}
+        compact: Dict[str, str] = {}
+        words: Dict[str, set] = {}
+        word_sets: Dict[frozenset, set] = {}
+        spoken: Dict[str, str] = {}
+        for name, value in ((name, value) for raw in sources for name, value in raw.items()):
+            if name in contacts:
+                continue  # contacts.json wins over an imported contact with the same name
+            contact = parse_contact(name, value)
+            contacts[name] = contact
+            for label in [name] + contact['aliases']:
+                key = normalize_name(label)
+                if not key:
+                    continue
+                word_sets.setdefault(frozenset(key.split()), set()).add(name)
+                # The first entry claiming a name keeps it, so lookups stay deterministic
+                names.setdefault(key, name)
+                compact.setdefault(compact_name(label), name)
+                spoken.setdefault(key, name)
+                for word in key.split():
+                    words.setdefault(word, set()).add(name)
+
+        self._contacts, self._names, self._compact, self._words = contacts, names, compact, words
+        self._word_sets, self._spoken = word_sets, spoken
+        self._phonetic = None
+
+    def _phonetic_index(self) -> PhoneticIndex:
+        with self._lock:
+            if self._phonetic is None:
+                phonetic = PhoneticIndex()
+                phonetic.sync(self._spoken)
+                self._phonetic = phonetic
+            return self._phonetic
+
+    # ----- lookups -----
+
+    def names(self) -> List[str]:
+        self._ensure_fresh()
+        return list(self._contacts)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Contact by its exact name or alias"""
+        self._ensure_fresh()
+        key = self._names.get(normalize_name(name))
+        return self._contacts.get(key) if key else None
+
+    def rank(self, query: str, k: int = 5) -> List[Tuple[Dict, float]]:
+        """Contacts matching a spoken name as (contact, score), best first"""
+        self._ensure_fresh()
+        key = normalize_name(query)
+        if not key:
+            return []
+        scores: Dict[str, float] = {}
+
+        def offer(name: str, score: float) -> None:
+            if score > scores.get(name, 0.0):
+                scores[name] = score
+
+        if key in self._names:
+            offer(self._names[key], EXACT_SCORE)
+        if compact_name(query) in self._compact:
+            offer(self._compact[compact_name(query)], COMPACT_SCORE)
+
+        # Names containing every query word: intersect postings, smallest first
+        query_words = set(key.split())
+        postings = sorted((self._words.get(word, set()) for word in query_words), key=len)
+        if postings and postings[0]:
+            for name in set.intersection(*postings):
+                offer(name, WORDS_OF_NAME)
+        # Names whose words all appear in the query ("my mom"): queries are a few words, so try each subset
+        if len(query_words) <= MAX_QUERY_WORDS:
+            ordered = sorted(query_words)
+            for size in range(1, len(ordered)):
+                for subset in combinations(ordered, size):
+                    for name in self._word_sets.get(frozenset(subset), ()):
+                        offer(name, NAME_IN_QUERY)
+
+        if not scores:
+            for name, score, _ in self._phonetic_index().search(query, k=k, min_score=MIN_PHONETIC_SCORE):
+                offer(name, round(PHONETIC_WEIGHT * score, 4))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(item[0]), item[0]))
+        return [(self._contacts[name], score) for name, score in ranked[:k]]
+
+    def resolve(self, query: str, field: Optional[str] = None) -> Optional[Dict]:
+        """Best match for a spoken name, optionally only among contacts that have field ('email'/'phone')"""
+        for contact, _ in self.rank(query):
+            if field is None or contact.get(field):
+                return contact
+        return None
+
+    def expand(self, names: List[str], field: str = 'email') -> Tuple[List[Tuple[str, str]], List[str]]:
+        """Resolve names, groups and literal addresses to unique (name, value) pairs plus the names not found"""
+        self._ensure_fresh()
+        resolved: List[Tuple[str, str]] = []
+        missing: List[str] = []
+        seen_values = set()
+        seen_groups = set()
+
+        def add(label: str, value: str) -> None:
+            if value.lower() not in seen_values:
+                seen_values.add(value.lower())
+                resolved.append((label, value))
+
+        def visit(name: str) -> None:
+            if field == 'email' and "@" in name:
+                add(name, name)
+                return
+            contact = self.resolve(name)
+            if contact is None:
+                missing.append(name)
+            elif contact['members'] is not None:
+                if contact['name'] not in seen_groups:  # Groups may include each other
+                    seen_groups.add(contact['name'])
+                    for member in contact['members']:
+                        visit(member)
+            elif contact.get(field):
+                add(contact['name'], contact[field])
+            else:
+                missing.append(name)
+
+        for name in names:
+            if name.strip():
+                visit(name.strip())
+        return resolved, missing
+
+
+_directory: Optional[ContactDirectory] = None
+
+def get_contact_directory() -> ContactDirectory:
+    """The shared directory over tools/contacts.json"""
+    global _directory
+    if _directory is None:
+        _directory = ContactDirectory()
+    return _directory
@@ -16,13 +16,16 @@ def list_all_tools() -> str:
 - list_available_apps: Show available apps
 
 📧 Communication:
-- send_email_to_contact: Send emails to contacts
+- send_email_to_contact: Send emails to contacts (attach="screenshot"/"note" to attach files)
+- send_email_to_contacts: Email several contacts or a group at once
+- email_queue_status: Check emails waiting to be sent
 - call_contact: Make FaceTime calls
 - make_phone_call: Make phone calls
 
 📝 Productivity:
 - take_note: Save notes
 - read_recent_notes: Read saved notes
+- search_notes: Search saved notes
 - add_calendar_event: Add calendar events
 - check_calendar_events: Check calendar
 
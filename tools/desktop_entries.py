@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Desktop Entry Module for Jarvis
+Reads freedesktop.org (XDG) .desktop files, the Linux counterpart of
+macOS .app bundles and their Info.plist
+"""
+
+import os
+import shlex
+import shutil
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DESKTOP_SUFFIX = ".desktop"
+
+# Exec field codes that are replaced by files/URLs/icons at launch time
+EXEC_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+# freedesktop main categories → Jarvis categories
+XDG_CATEGORIES = {
+    'WebBrowser': 'Browsers',
+    'Development': 'Development',
+    'IDE': 'Development',
+    'TerminalEmulator': 'Development',
+    'InstantMessaging': 'Communication',
+    'Chat': 'Communication',
+    'Email': 'Communication',
+    'VideoConference': 'Communication',
+    'AudioVideo': 'Media',
+    'Audio': 'Media',
+    'Video': 'Media',
+    'Graphics': 'Media',
+    'Office': 'Productivity',
+    'Game': 'Gaming',
+    'Utility': 'Utilities',
+    'Settings': 'System',
+    'System': 'System',
+}
+
+def xdg_application_dirs() -> List[str]:
+    """Return the applications directories in XDG precedence order (user first)"""
+    data_home = os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.getenv("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+
+    directories = []
+    for base in [data_home] + data_dirs.split(":"):
+        if base:
+            directory = os.path.join(base, "applications")
+            if directory not in directories:
+                directories.append(directory)
+    return directories
+
+def desktop_id(path: str) -> str:
+    """Desktop file id without the suffix, e.g. /usr/share/applications/firefox.desktop → firefox"""
+    name = os.path.basename(path)
+    return name[:-len(DESKTOP_SUFFIX)] if name.endswith(DESKTOP_SUFFIX) else name
+
+def read_desktop_entry(path: str) -> Dict[str, str]:
+    """Return the unlocalized keys of the [Desktop Entry] group"""
+    entry = {}
+    in_group = False
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('['):
+                if in_group:
+                    break  # Only the first group matters; actions follow it
+                in_group = line == "[Desktop Entry]"
+                continue
+            if in_group and '=' in line:
+                key, value = line.split('=', 1)
+                key = key.strip()
+                if '[' not in key:  # Skip localized variants such as Name[de]
+                    entry[key] = value.strip()
+    return entry
+
+def split_list(value: str) -> List[str]:
+    """Split a ;-separated desktop entry list"""
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+def exec_command(exec_value: str) -> List[str]:
+    """Turn an Exec value into an argv list, dropping field codes"""
+    try:
+        args = shlex.split(exec_value)
+    except ValueError:
+        args = exec_value.split()
+    return [arg.replace("%%", "%") for arg in args if arg not in EXEC_FIELD_CODES]
+
+def exec_name(exec_value: str) -> Optional[str]:
+    """Program name from an Exec value, skipping `env VAR=value` wrappers"""
+    for arg in exec_command(exec_value):
+        if arg == "env" or '=' in arg:
+            continue
+        return os.path.basename(arg)
+    return None
+
+def categorize(categories: List[str]) -> Optional[str]:
+    """Map freedesktop categories to a Jarvis category (most specific first)"""
+    for category in reversed(categories):
+        if category in XDG_CATEGORIES:
+            return XDG_CATEGORIES[category]
+    return None
+
+def parse_desktop_entry(path: str) -> Optional[Dict]:
+    """Return Jarvis app info for a .desktop file
+
+    Entries that should not be listed (NoDisplay, Hidden, missing TryExec)
+    come back with 'hidden': True so they still shadow same-id entries in
+    lower-precedence directories. Returns None for non-application entries.
+    """
+    try:
+        entry = read_desktop_entry(path)
+    except OSError as e:
+        logger.debug(f"Could not read desktop entry {path}: {e}")
+        return None
+
+    if entry.get('Type', 'Application') != 'Application' or not entry.get('Name'):
+        return None
+
+    app_info = {
+        'name': entry['Name'],
+        'path': path,
+        'bundle_id': desktop_id(path),
+        'display_name': entry['Name'],
+        'version': None,
+        'executable': None,
+        'alternatives': [],
+        'category': categorize(split_list(entry.get('Categories', '')))
+    }
+
+    hidden = entry.get('NoDisplay') == 'true' or entry.get('Hidden') == 'true'
+    try_exec = entry.get('TryExec')
+    if try_exec and not shutil.which(try_exec):
+        hidden = True
+    if hidden or not entry.get('Exec'):
+        app_info['hidden'] = True
+        return app_info
+
+    app_info['exec'] = entry['Exec']
+    app_info['executable'] = exec_name(entry['Exec'])
+
+    alternatives = split_list(entry.get('Keywords', ''))
+    if app_info['executable']:
+        alternatives.append(app_info['executable'])
+    app_info['alternatives'] = [alternative.lower() for alternative in alternatives]
+    return app_info
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Email Attachment References for Jarvis
+Turns what the user says to attach ("my last screenshot", "the note about the
+dentist") into files, through a small registry of sources that other tools
+can extend; raw paths only from directories in JARVIS_ATTACHMENT_DIRS
+"""
+
+import os
+import re
+from typing import Callable, Dict, List
+import logging
+
+from .email_mime import base64_size
+
+logger = logging.getLogger(__name__)
+
+# Directories whose files may also be attached by path (os.pathsep-separated).
+# Empty by default: only the registered sources below attach anything, so a
+# prompt cannot get Jarvis to email arbitrary files such as ~/.ssh keys or .env
+ATTACHMENT_DIRS = [os.path.realpath(os.path.expanduser(directory))
+                   for directory in os.getenv("JARVIS_ATTACHMENT_DIRS", "").split(os.pathsep)
+                   if directory.strip()]
+
+# Most providers (Gmail, Outlook) reject messages over 25 MB once encoded
+MAX_EMAIL_BYTES = 25 * 1024 * 1024
+
+# Several attachments in one request: "screenshot and the note about taxes"
+ATTACHMENT_SEPARATORS = re.compile(r"\s*(?:,|;|\band\b)\s*", re.IGNORECASE)
+
+# Words that only say which one, not what it is about: "my last note" is the latest note
+FILLER_WORDS = {"my", "the", "that", "this", "last", "latest", "recent", "most", "newest",
+                "about", "on", "called", "titled", "named", "for", "a", "an"}
+
+# keyword → resolver(what the user said besides the keyword) → file path, or "" if none
+ATTACHMENT_SOURCES: Dict[str, Callable[[str], str]] = {}
+
+def register_attachment_source(keyword: str, resolver: Callable[[str], str]) -> None:
+    """Let a tool offer its files as attachments, e.g. "screenshot" → the latest screenshot"""
+    ATTACHMENT_SOURCES[keyword.lower()] = resolver
+
+def _latest_screenshot(query: str) -> str:
+    try:
+        from .screenshot import latest_screenshot
+    except ImportError:  # Screen capture dependencies not installed
+        return ""
+    return latest_screenshot()
+
+def _find_note(query: str) -> str:
+    from .notes import find_note_path
+    return find_note_path(query)
+
+register_attachment_source("screenshot", _latest_screenshot)
+register_attachment_source("note", _find_note)
+
+def _in_attachment_dirs(path: str) -> bool:
+    return any(os.path.commonpath([path, directory]) == directory for directory in ATTACHMENT_DIRS)
+
+def resolve_attachment(reference: str) -> str:
+    """File for one spoken reference (or an allowed path); raises ValueError with a message for the user"""
+    raw = reference.strip().strip("'\"")
+    if os.sep in raw or raw.startswith("~"):
+        # Resolved first, so symlinks and ".." cannot lead out of an allowed directory
+        path = os.path.realpath(os.path.expanduser(raw))
+        if not _in_attachment_dirs(path):
+            logger.warning(f"⚠️ Refused to attach {path}: not in JARVIS_ATTACHMENT_DIRS")
+            raise ValueError(f"I can only attach screenshots and notes, not '{raw}'")
+        if not os.path.isfile(path):
+            raise ValueError(f"There is no file at '{raw}'")
+        return path
+
+    words = re.findall(r"[\w'-]+", reference.lower())
+    for keyword, resolver in ATTACHMENT_SOURCES.items():
+        matched = [word for word in words if word in (keyword, keyword + "s")]
+        if not matched:
+            continue
+        query = " ".join(word for word in words if word not in matched and word not in FILLER_WORDS)
+        found = resolver(query)
+        if not found:
+            raise ValueError(f"I couldn't find a {keyword}{f' about {query}' if query else ''} to attach")
+        return found
+    raise ValueError(f"I don't know which file '{reference}' is. "
+                     f"Say {' or '.join(repr(keyword) for keyword in ATTACHMENT_SOURCES)}")
+
+def resolve_attachments(references: str) -> List[str]:
+    """Files for a comma/"and"-separated list of references, checked against the size limit"""
+    if not references.strip():
+        return []
+    if os.path.isfile(os.path.expanduser(references.strip().strip("'\""))):
+        parts = [references]  # A path that happens to contain a comma or "and"
+    else:
+        parts = [part for part in ATTACHMENT_SEPARATORS.split(references) if part.strip()]
+    paths = list(dict.fromkeys(resolve_attachment(part) for part in parts))
+
+    # Checked here so the user hears about it now, not after the server rejects it
+    encoded = sum(base64_size(os.path.getsize(path)) for path in paths)
+    if encoded > MAX_EMAIL_BYTES:
+        raise ValueError(f"The attachments are too large to email ({encoded / 1e6:.0f} MB encoded, "
+                         f"limit {MAX_EMAIL_BYTES / 1e6:.0f} MB)")
+    logger.debug(f"📎 Attachments for '{references}': {paths}")
+    return paths
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Streaming MIME Module for Jarvis
+Builds multipart emails whose attachments stay on disk until the message is
+sent: the headers and text part are generated up front, and each attachment
+is base64-encoded a chunk at a time while it is written to the SMTP DATA
+phase, so memory use does not grow with attachment size
+"""
+
+import io
+import os
+import re
+import uuid
+import base64
+import mimetypes
+from email.message import Message
+from email.mime.base import MIMEBase
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.generator import BytesGenerator
+from typing import Dict, Iterator, List, Optional
+
+# Raw bytes per read: a multiple of 57, so every chunk encodes to whole 76-character lines
+ENCODE_CHUNK = 57 * 1024
+
+_LEADING_DOT_RE = re.compile(rb"^\.", re.MULTILINE)
+
+def _flatten(part: Message) -> bytes:
+    """Serialize a message or part with CRLF line endings, as it goes on the wire"""
+    with io.BytesIO() as out:
+        BytesGenerator(out, policy=part.policy.clone(linesep='\r\n')).flatten(part)
+        return out.getvalue()
+
+def base64_size(size: int) -> int:
+    """Encoded size of size bytes as base64 in 76-character CRLF lines"""
+    encoded = 4 * ((size + 2) // 3)
+    return encoded + 2 * ((encoded + 75) // 76)
+
+
+class StreamingMessage:
+    """A multipart/mixed email with a plain-text body and attachments read from disk while sending
+
+    Offers get()/get_all() on its headers like email.message.Message, so the
+    SMTP pool can take the envelope addresses from it.
+    """
+
+    def __init__(self, from_addr: str, to: List[str], subject: str, body: str,
+                 attachments: Optional[List[Dict]] = None):
+        # Attachments are {'path', 'filename'} dicts; the filename is what the recipient sees
+        self.attachments = [dict(attachment, filename=attachment.get('filename') or
+                                 os.path.basename(attachment['path'])) for attachment in attachments or []]
+        self.boundary = f"=_jarvis_{uuid.uuid4().hex}"  # "=_" never occurs in base64 or 7bit text
+        self._skeleton = MIMEMultipart(boundary=self.boundary)
+        self._skeleton['From'] = from_addr
+        self._skeleton['To'] = ", ".join(to)
+        self._skeleton['Subject'] = subject
+        self._skeleton.attach(MIMEText(body, 'plain'))
+
+    def get(self, name: str, failobj=None):
+        return self._skeleton.get(name, failobj)
+
+    def get_all(self, name: str, failobj=None):
+        return self._skeleton.get_all(name, failobj)
+
+    def _part_header(self, attachment: Dict) -> bytes:
+        content_type = mimetypes.guess_type(attachment['filename'])[0] or 'application/octet-stream'
+        part = MIMEBase(*content_type.split('/', 1))
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header('Content-Disposition', 'attachment', filename=attachment['filename'])
+        return f"--{self.boundary}\r\n".encode() + _flatten(part)
+
+    def _head(self) -> bytes:
+        """Headers and text part, up to (not including) the closing boundary"""
+        head = _flatten(self._skeleton)
+        closing = f"--{self.boundary}--".encode()
+        head = head[:head.rindex(closing)]
+        return _LEADING_DOT_RE.sub(b"..", head)  # SMTP dot-stuffing; base64 lines never start with "."
+
+    def size(self) -> int:
+        """Exact size of the message on the wire, without reading the attachments"""
+        total = len(self._head()) + len(f"--{self.boundary}--\r\n")
+        for attachment in self.attachments:
+            total += len(self._part_header(attachment)) + base64_size(os.path.getsize(attachment['path']))
+        return total
+
+    def iter_data(self) -> Iterator[bytes]:
+        """The message as dot-stuffed CRLF chunks for the DATA phase, encoding attachments as it goes"""
+        yield self._head()
+        for attachment in self.attachments:
+            yield self._part_header(attachment)
+            with open(attachment['path'], 'rb') as f:
+                for chunk in iter(lambda: f.read(ENCODE_CHUNK), b""):
+                    yield base64.encodebytes(chunk).replace(b"\n", b"\r\n")
+        yield f"--{self.boundary}--\r\n".encode()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Email Spool Module for Jarvis
+Durable outbound queue: send_email writes the message to disk atomically and
+returns, and a background sender delivers it with exponential backoff,
+keeping messages to the same recipient in order and moving messages that
+cannot be delivered to a dead-letter directory. Attachments are copied into
+the spool when queued, so the file sent is the one the user meant even if
+it is overwritten (like the latest screenshot) before delivery
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import shutil
+import smtplib
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional
+import logging
+
+try:
+    from .smtp_pool import get_smtp_pool
+    from .email_mime import StreamingMessage
+except ImportError:  # Running as a script from the tools directory
+    from smtp_pool import get_smtp_pool
+    from email_mime import StreamingMessage
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = os.path.join(os.path.dirname(__file__), 'email_spool')
+
+def compose_message(record: Dict) -> StreamingMessage:
+    """Build the MIME message for a spooled record (attachments are read while it is sent)"""
+    return StreamingMessage(record['from'], record['to'], record['subject'], record['body'],
+                            record.get('attachments'))
+
+def deliver_with_pool(record: Dict) -> Dict:
+    """Default delivery: send over the shared SMTP session pool; returns refused recipients"""
+    return get_smtp_pool().send(compose_message(record), record['to'])['refused']
+
+def describe_error(error: Exception) -> str:
+    """Readable one-line reason for a failed delivery"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return "; ".join(f"{address} refused ({code} {reply.decode(errors='replace')})"
+                         for address, (code, reply) in error.recipients.items())
+    if isinstance(error, smtplib.SMTPResponseException):
+        reply = error.smtp_error
+        if isinstance(reply, bytes):
+            reply = reply.decode(errors='replace')
+        return f"{error.smtp_code} {reply}"
+    return str(error) or error.__class__.__name__
+
+def is_permanent(error: Exception) -> bool:
+    """True for 5xx rejections that retrying will not fix (bad login is retried: it can be corrected)"""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailSpool:
+    """On-disk queue of outgoing emails with a background sender"""
+
+    BACKOFF_BASE_SECONDS = 30
+    BACKOFF_MAX_SECONDS = 3600
+    MAX_ATTEMPTS = 8
+
+    def __init__(self, spool_dir: Optional[str] = None,
+                 deliver: Callable[[Dict], Optional[Dict]] = deliver_with_pool):
+        self.spool_dir = spool_dir or SPOOL_DIR
+        self.queue_dir = os.path.join(self.spool_dir, 'queue')
+        self.dead_dir = os.path.join(self.spool_dir, 'dead')
+        self.tmp_dir = os.path.join(self.spool_dir, 'tmp')
+        self.attachments_dir = os.path.join(self.spool_dir, 'attachments')
+        for directory in (self.queue_dir, self.dead_dir, self.tmp_dir, self.attachments_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        self.deliver = deliver
+        self.on_dead_letter: Optional[Callable[[Dict], None]] = None
+        self._last_seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- storage -----
+
+    def _write(self, directory: str, record: Dict) -> None:
+        """Write a record with fsync and an atomic rename, so a crash never leaves half a message"""
+        fd, temp_path = tempfile.mkstemp(prefix=f"{record['id']}.", dir=self.tmp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, os.path.join(directory, f"{record['id']}.json"))
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return  # Directories cannot be opened for fsync on Windows
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _copy_attachments(self, message_id: str, paths: List[str]) -> List[Dict]:
+        """Copy files into the spool (a streamed copy, not read into memory) and fsync them"""
+        target_dir = os.path.join(self.attachments_dir, message_id)
+        os.makedirs(target_dir, exist_ok=True)
+        attachments = []
+        for i, path in enumerate(paths):
+            filename = os.path.basename(path)
+            copy_path = os.path.join(target_dir, f"{i}-{filename}")
+            shutil.copyfile(path, copy_path)
+            with open(copy_path, 'rb') as f:
+                os.fsync(f.fileno())
+            attachments.append({'path': copy_path, 'filename': filename, 'size': os.path.getsize(copy_path)})
+        return attachments
+
+    def _release_attachments(self, record: Dict) -> None:
+        """Delete a delivered message's attachment copies unless a retry or dead letter still uses them"""
+        paths = {attachment['path'] for attachment in record.get('attachments') or []}
+        if not paths:
+            return
+        for other in self.pending() + self.dead_letters():
+            paths -= {attachment['path'] for attachment in other.get('attachments') or []}
+        for path in paths:
+            try:
+                os.remove(path)
+                os.rmdir(os.path.dirname(path))  # Only succeeds once the message's last copy is gone
+            except OSError:
+                pass
+
+    def _read_dir(self, directory: str) -> List[Dict]:
+        records = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Skipping unreadable spooled email {name}: {e}")
+        return sorted(records, key=lambda record: record['seq'])
+
+    def pending(self) -> List[Dict]:
+        """Queued messages, oldest first"""
+        return self._read_dir(self.queue_dir)
+
+    def dead_letters(self) -> List[Dict]:
+        return self._read_dir(self.dead_dir)
+
+    # ----- queueing -----
+
+    def enqueue(self, from_addr: str, to: List[str], subject: str, body: str,
+                attachments: Optional[List[str]] = None, **extra) -> Dict:
+        """Durably queue a message (with copies of any attachment files) and wake the sender;
+        returns the spooled record"""
+        with self._lock:
+            # Nanosecond clock, forced monotonic: orders messages across restarts too
+            self._last_seq = max(time.time_ns(), self._last_seq + 1)
+            seq = self._last_seq
+        message_id = f"{seq}-{uuid.uuid4().hex[:8]}"
+        record = {
+            'id': message_id,
+            'seq': seq,
+            'from': from_addr,
+            'to': list(to),
+            'subject': subject,
+            'body': body,
+            'created': time.time(),
+            'attempts': 0,
+            'next_attempt': 0,
+            'last_error': None,
+            'attachments': self._copy_attachments(message_id, attachments) if attachments else [],
+            **extra,
+        }
+        self._write(self.queue_dir, record)
+        logger.info(f"📮 Queued email {record['id']} to {', '.join(record['to'])}")
+        self.start()
+        self._wake.set()
+        return record
+
+    # ----- delivery -----
+
+    def backoff_seconds(self, attempts: int) -> float:
+        delay = min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _dead_letter(self, record: Dict, queued: bool = True) -> None:
+        self._write(self.dead_dir, record)
+        if queued:
+            os.remove(os.path.join(self.queue_dir, f"{record['id']}.json"))
+        logger.error(f"❌ Email {record['id']} to {', '.join(record['to'])} moved to dead letters: "
+                     f"{record['last_error']}")
+        if self.on_dead_letter:
+            try:
+                self.on_dead_letter(record)
+            except Exception as e:
+                logger.debug(f"Dead-letter callback failed: {e}")
+
+    def run_once(self, now: Optional[float] = None) -> Optional[float]:
+        """Deliver every due message; returns seconds until the next retry (None if the queue is empty)
+
+        A message waits while an earlier message to any of its recipients is
+        still queued, so each recipient gets their emails in the order sent.
+        """
+        now = now if now is not None else time.time()
+        blocked = set()
+        next_due = None
+        for record in self.pending():
+            recipients = {address.lower() for address in record['to']}
+            if record['next_attempt'] > now:
+                blocked |= recipients
+                wait = record['next_attempt'] - now
+                next_due = wait if next_due is None else min(next_due, wait)
+                continue
+            if recipients & blocked:
+                blocked |= recipients  # Sent once the earlier message goes through
+                continue
+
+            try:
+                refused = self.deliver(record)
+            except Exception as e:
+                record['attempts'] += 1
+                record['last_error'] = describe_error(e)
+                if is_permanent(e) or record['attempts'] >= self.MAX_ATTEMPTS:
+                    self._dead_letter(record)
+                    continue
+                record['next_attempt'] = now + self.backoff_seconds(record['attempts'])
+                self._write(self.queue_dir, record)
+                logger.warning(f"⚠️ Email {record['id']} failed (attempt {record['attempts']}), "
+                               f"retrying in {record['next_attempt'] - now:.0f}s: {record['last_error']}")
+                blocked |= recipients
+                wait = record['next_attempt'] - now
+                next_due = wait if next_due is None else min(next_due, wait)
+                continue
+
+            if refused:
+                retry = self._split_refused(record, refused, now)
+                if retry:
+                    blocked |= {address.lower() for address in retry['to']}
+                    wait = retry['next_attempt'] - now
+                    next_due = wait if next_due is None else min(next_due, wait)
+            os.remove(os.path.join(self.queue_dir, f"{record['id']}.json"))
+            self._release_attachments(record)
+            logger.info(f"📧 Delivered email {record['id']} to "
+                        f"{', '.join(address for address in record['to'] if address not in (refused or {}))}")
+        return next_due
+
+    def _split_refused(self, record: Dict, refused: Dict, now: float) -> Optional[Dict]:
+        """The server took the message for some recipients only: dead-letter the
+        permanently refused ones and queue a retry (same place in line) for the rest"""
+        permanent = {address: reply for address, reply in refused.items() if reply[0] >= 500}
+        if permanent:
+            error = smtplib.SMTPRecipientsRefused(permanent)
+            self._dead_letter(dict(record, id=f"{record['id']}-{uuid.uuid4().hex[:4]}", to=list(permanent),
+                                   attempts=record['attempts'] + 1, last_error=describe_error(error)),
+                              queued=False)
+        temporary = [address for address in refused if address not in permanent]
+        if not temporary:
+            return None
+        attempts = record['attempts'] + 1
+        retry = dict(record, id=f"{record['id']}-{uuid.uuid4().hex[:4]}", to=temporary, attempts=attempts,
+                     last_error=describe_error(smtplib.SMTPRecipientsRefused(
+                         {address: refused[address] for address in temporary})),
+                     next_attempt=now + self.backoff_seconds(attempts))
+        if attempts >= self.MAX_ATTEMPTS:
+            self._dead_letter(retry, queued=False)
+            return None
+        self._write(self.queue_dir, retry)
+        return retry
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                delay = self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Email sender error: {e}")
+                delay = self.BACKOFF_BASE_SECONDS
+            self._wake.wait(delay)
+
+    def start(self) -> None:
+        """Start the background sender (idempotent); it resumes anything left queued"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="email-sender", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wait_until_empty(self, timeout: float) -> bool:
+        """Block until every due message is delivered or dead-lettered (for benchmarks and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not os.listdir(self.queue_dir):
+                return True
+            time.sleep(0.01)
+        return False
+
+
+_spool: Optional[EmailSpool] = None
+_spool_lock = threading.Lock()
+
+def get_email_spool() -> EmailSpool:
+    """The shared spool, created and started on first use"""
+    global _spool
+    with _spool_lock:
+        if _spool is None:
+            _spool = EmailSpool()
+            _spool.start()
+        return _spool
@@ -1,74 +1,113 @@
-import smtplib
 import os
-import json
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import re
+import time
+from typing import List, Optional, Tuple
 from langchain.tools import tool
 from dotenv import load_dotenv
+from .contacts import get_contact_directory
+from .email_spool import get_email_spool
+from .email_attachments import resolve_attachments
 
 # Load environment variables
 load_dotenv()
 
+# Separators in spoken recipient lists: "mom, dad and John"
+RECIPIENT_SEPARATORS = re.compile(r"\s*(?:,|;|&|\+|\band\b)\s*", re.IGNORECASE)
+
+def _email_credentials() -> Tuple[Optional[str], Optional[str]]:
+    return os.getenv("EMAIL_ADDRESS"), os.getenv("EMAIL_PASSWORD")
+
+def _queue_email(recipients: List[Tuple[str, str]], subject: str, message: str, attach: str = "") -> str:
+    from_email, password = _email_credentials()
+    if not from_email or not password:
+        return "Email credentials not found. Please set EMAIL_ADDRESS and EMAIL_PASSWORD in your .env file."
+    try:
+        attachments = resolve_attachments(attach)
+    except ValueError as e:
+        return f"Email not sent: {e}"
+    # One message and one SMTP transaction for every recipient
+    get_email_spool().enqueue(from_email, [address for _, address in recipients], subject, message,
+                              attachments=attachments)
+    listed = ", ".join(name if name == address else f"{name} ({address})" for name, address in recipients)
+    attached = f" with {', '.join(os.path.basename(path) for path in attachments)} attached" if attachments else ""
+    return f"Email to {listed}{attached} is on its way (queued for delivery)"
+
 @tool
-def send_email_to_contact(contact_name: str, subject: str, message: str) -> str:
-    """Send an email to a saved contact by name from contacts.json. Use this tool when the user mentions sending email to a person's name like 'mom', 'dad', 'john', etc. This is the preferred method for sending emails to avoid dictating email addresses."""
+def send_email_to_contact(contact_name: str, subject: str, message: str, attach: str = "") -> str:
+    """Send an email to a saved contact by name from contacts.json. Use this tool when the user mentions sending email to a person's name like 'mom', 'dad', 'john', etc. This is the preferred method for sending emails to avoid dictating email addresses. Optional attach: 'screenshot' for the latest screenshot, 'note' for the latest note, 'note about <topic>' for a specific note; separate several with commas."""
     try:
-        contacts_file = os.path.join(os.path.dirname(__file__), 'contacts.json')
-        with open(contacts_file, 'r') as f:
-            contacts = json.load(f)
-        
-        contact_name_lower = contact_name.lower()
-        
-        # First try exact match
-        if contact_name_lower in contacts:
-            return send_email.invoke({'to_email': contacts[contact_name_lower], 'subject': subject, 'message': message})
-        
-        # Then try partial match
-        for name, email in contacts.items():
-            if contact_name_lower in name.lower() or name.lower() in contact_name_lower:
-                return send_email.invoke({'to_email': email, 'subject': subject, 'message': message})
-        
-        # If no match found
-        available_contacts = ", ".join(contacts.keys())
-        return f"Contact '{contact_name}' not found. Available contacts: {available_contacts}"
+        directory = get_contact_directory()
+        recipients, _ = directory.expand([contact_name])
+        if not recipients and directory.resolve(contact_name):
+            return f"Contact '{contact_name}' has no email address in contacts.json."
+        if not recipients:
+            available_contacts = ", ".join(directory.names())
+            return f"Contact '{contact_name}' not found. Available contacts: {available_contacts}"
+        return _queue_email(recipients, subject, message, attach)
     except Exception as e:
         return f"Failed to send email to contact: {str(e)}"
 
 @tool
-def send_email(to_email: str, subject: str, message: str) -> str:
-    """Send an email. Requires EMAIL_ADDRESS and EMAIL_PASSWORD in .env file."""
+def send_email_to_contacts(contact_names: str, subject: str, message: str, attach: str = "") -> str:
+    """Send one email to several saved contacts or contact groups at once, e.g. contact_names="mom, dad and John" or "family". Use this instead of calling send_email_to_contact once per person. Optional attach works as in send_email_to_contact."""
     try:
-        # Get email credentials from environment variables
-        from_email = os.getenv("EMAIL_ADDRESS")
-        password = os.getenv("EMAIL_PASSWORD")
-        
-        if not from_email or not password:
-            return "Email credentials not found. Please set EMAIL_ADDRESS and EMAIL_PASSWORD in your .env file."
-        
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = from_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add body to email
-        msg.attach(MIMEText(message, 'plain'))
-        
-        # Gmail SMTP configuration
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()  # Enable encryption
-        server.login(from_email, password)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(from_email, to_email, text)
-        server.quit()
-        
-        return f"Email sent successfully to {to_email}"
+        directory = get_contact_directory()
+        recipients, missing = directory.expand(RECIPIENT_SEPARATORS.split(contact_names))
+        if not recipients:
+            available_contacts = ", ".join(directory.names())
+            return f"None of '{contact_names}' found in contacts. Available contacts: {available_contacts}"
+        result = _queue_email(recipients, subject, message, attach)
+        if missing:
+            result += f". No email address found for {', '.join(missing)}, so they were left out"
+        return result
+    except Exception as e:
+        return f"Failed to send email to contacts: {str(e)}"
+
+@tool
+def send_email(to_email: str, subject: str, message: str, attach: str = "") -> str:
+    """Send an email. Requires EMAIL_ADDRESS and EMAIL_PASSWORD in .env file. Optional attach works as in send_email_to_contact."""
+    try:
+        # Queued durably and delivered in the background over a pooled SMTP
+        # session (SMTP_SERVER / SMTP_PORT, Gmail by default), with retries
+        return _queue_email([(to_email, to_email)], subject, message, attach)
         
     except Exception as e:
         return f"Failed to send email: {str(e)}. Make sure you have EMAIL_ADDRESS and EMAIL_PASSWORD set in .env file, and use an app password for Gmail."
 
+def set_email_failure_callback(callback) -> None:
+    """Call callback(message) when a queued email cannot be delivered; also resumes any queued mail"""
+    def on_dead_letter(record):
+        callback(f"Sorry, I couldn't deliver your email '{record['subject']}' to "
+                 f"{', '.join(record['to'])}: {record['last_error']}")
+    get_email_spool().on_dead_letter = on_dead_letter
+
+@tool
+def email_queue_status() -> str:
+    """Check on emails that are still waiting to be sent or could not be delivered."""
+    try:
+        spool = get_email_spool()
+        pending = spool.pending()
+        dead = spool.dead_letters()
+        if not pending and not dead:
+            return "All emails have been sent."
+        
+        result = ""
+        if pending:
+            result += f"{len(pending)} email(s) waiting to be sent:\n"
+            for record in pending:
+                line = f"- '{record['subject']}' to {', '.join(record['to'])}"
+                if record['last_error']:
+                    retry_in = max(0, int(record['next_attempt'] - time.time()))
+                    line += f" (attempt {record['attempts']} failed: {record['last_error']}; retrying in {retry_in}s)"
+                result += line + "\n"
+        if dead:
+            result += f"{len(dead)} email(s) could not be delivered:\n"
+            for record in dead[-5:]:
+                result += f"- '{record['subject']}' to {', '.join(record['to'])}: {record['last_error']}\n"
+        return result.strip()
+    except Exception as e:
+        return f"Failed to check the email queue: {str(e)}"
+
 @tool
 def get_email_setup_instructions() -> str:
     """Get instructions for setting up email credentials."""
@@ -78,12 +117,16 @@ To use the email feature, add these to your .env file:
 EMAIL_ADDRESS=your-email@gmail.com
 EMAIL_PASSWORD=your-app-password
 
+Optional, for providers other than Gmail:
+SMTP_SERVER=smtp.example.com   (default smtp.gmail.com)
+SMTP_PORT=587                  (465 uses implicit TLS)
+
 For Gmail:
 1. Go to Google Account settings
 2. Enable 2-factor authentication
 3. Generate an "App Password" 
 4. Use that app password (not your regular password)
 
-For other email providers, you may need to adjust the SMTP settings in the send_email function.
+For other email providers, set SMTP_SERVER and SMTP_PORT to your provider's values.
 """
     return instructions
@@ -1,7 +1,6 @@
 from langchain.tools import tool
 import subprocess
-import json
-import os
+from .contacts import get_contact_directory, contact_handle
 
 @tool("call_contact", return_direct=True)
 def call_contact(contact_name: str) -> str:
@@ -13,18 +12,9 @@ def call_contact(contact_name: str) -> str:
     - "Call mama"
     """
     try:
-        # First check our custom contacts.json
-        contacts_file = os.path.join(os.path.dirname(__file__), 'contacts.json')
-        if os.path.exists(contacts_file):
-            with open(contacts_file, 'r') as f:
-                contacts = json.load(f)
-            
-            contact_name_lower = contact_name.lower()
-            
-            # Look for exact or partial match in our contacts
-            for name, email in contacts.items():
-                if name.lower() == contact_name_lower or contact_name_lower in name.lower():
-                    return facetime_call_simple(email, name)
+        contact = get_contact_directory().resolve(contact_name)
+        if contact and contact_handle(contact):
+            return facetime_call_simple(contact_handle(contact), contact['name'])
         
         # If not found in our contacts, try with the name directly
         return facetime_call_simple(contact_name, contact_name)
@@ -87,21 +77,8 @@ def make_phone_call(contact_name: str) -> str:
     Use when user specifically asks for a phone call or audio call.
     """
     try:
-        # Check our contacts for phone number
-        contacts_file = os.path.join(os.path.dirname(__file__), 'contacts.json')
-        phone_number = None
-        
-        if os.path.exists(contacts_file):
-            with open(contacts_file, 'r') as f:
-                contacts = json.load(f)
-            
-            contact_name_lower = contact_name.lower()
-            for name, info in contacts.items():
-                if name.lower() == contact_name_lower or contact_name_lower in name.lower():
-                    # If it's a phone number (contains digits), use tel://
-                    if any(char.isdigit() for char in str(info)):
-                        phone_number = str(info).replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-                        break
+        contact = get_contact_directory().resolve(contact_name, field='phone')
+        phone_number = contact['phone'] if contact else None
         
         if phone_number:
             tel_url = f"tel://{phone_number}"
@@ -117,18 +94,11 @@ def make_phone_call(contact_name: str) -> str:
 def facetime_audio_call(contact_name: str) -> str:
     """Make a FaceTime audio call"""
     try:
-        # Check contacts for email
-        contacts_file = os.path.join(os.path.dirname(__file__), 'contacts.json')
-        if os.path.exists(contacts_file):
-            with open(contacts_file, 'r') as f:
-                contacts = json.load(f)
-            
-            contact_name_lower = contact_name.lower()
-            for name, email in contacts.items():
-                if name.lower() == contact_name_lower or contact_name_lower in name.lower():
-                    facetime_audio_url = f"facetime-audio://{email}"
-                    subprocess.run(["open", facetime_audio_url], check=True)
-                    return f"Starting FaceTime audio call to {contact_name}..."
+        contact = get_contact_directory().resolve(contact_name)
+        if contact and contact_handle(contact):
+            facetime_audio_url = f"facetime-audio://{contact_handle(contact)}"
+            subprocess.run(["open", facetime_audio_url], check=True)
+            return f"Starting FaceTime audio call to {contact_name}..."
         
         return f"Could not find contact {contact_name} for audio call"
         
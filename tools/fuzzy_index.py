@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Matching Module for Jarvis
+Trigram index over short names (app aliases, contacts) with Jaccard and
+edit-distance scoring, returning a ranked top-k without a full scan
+"""
+
+import re
+import heapq
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+
+def normalize_name(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_NON_ALNUM_RE.sub(" ", text.lower()).split())
+
+def ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    """Return the padded character n-grams of a normalized string"""
+    padded = f"{' ' * (n - 1)}{text} "
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,                      # deletion
+                current[j - 1] + 1,                   # insertion
+                previous[j - 1] + (char_a != char_b)  # substitution
+            ))
+        previous = current
+    return previous[-1]
+
+def edit_similarity(a: str, b: str) -> float:
+    """Edit distance scaled to a 0..1 similarity"""
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 1.0
+
+
+class TrigramIndex:
+    """Inverted n-gram index from names to values (e.g. alias → app id)
+
+    An optional encode function maps each normalized name to the string
+    that is actually n-grammed and compared (e.g. a phonetic code).
+    """
+
+    def __init__(self, n: int = 3, rerank_pool: int = 25,
+                 encode: Optional[Callable[[str], str]] = None):
+        self.n = n
+        self.rerank_pool = rerank_pool
+        self.encode = encode or (lambda key: key)
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._entries: Dict[str, Tuple[FrozenSet[str], Hashable, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, value: Hashable) -> None:
+        """Index a name (replacing any previous value for it)"""
+        key = normalize_name(name)
+        if not key:
+            return
+        if key in self._entries:
+            self.remove(key)
+        encoded = self.encode(key)
+        grams = ngrams(encoded, self.n)
+        self._entries[key] = (grams, value, encoded)
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def remove(self, name: str) -> None:
+        """Drop a name from the index"""
+        key = normalize_name(name)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry[0]:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def sync(self, mapping: Dict[str, Hashable]) -> Dict[str, int]:
+        """Incrementally update the index to match a name → value mapping"""
+        wanted = {}
+        for name, value in mapping.items():
+            key = normalize_name(name)
+            if key:
+                wanted[key] = value
+
+        removed = [key for key in self._entries if key not in wanted]
+        for key in removed:
+            self.remove(key)
+
+        changed = 0
+        for key, value in wanted.items():
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != value:
+                self.add(key, value)
+                changed += 1
+
+        return {'added_or_changed': changed, 'removed': len(removed)}
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.35) -> List[Tuple[Hashable, float, str]]:
+        """Return up to k (value, score, matched name) tuples, best first, one per value"""
+        query_key = normalize_name(query)
+        if not query_key:
+            return []
+        query_encoded = self.encode(query_key)
+        query_grams = ngrams(query_encoded, self.n)
+
+        # Candidate generation: only names sharing at least one n-gram are considered
+        overlaps: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for key in self._postings.get(gram, ()):
+                overlaps[key] += 1
+        if not overlaps:
+            return []
+
+        def jaccard(key):
+            overlap = overlaps[key]
+            return overlap / (len(query_grams) + len(self._entries[key][0]) - overlap)
+
+        # Cheap n-gram scores pick a small pool, which is then re-ranked by edit distance
+        pool = heapq.nlargest(self.rerank_pool, overlaps, key=lambda key: (overlaps[key] / len(query_grams), jaccard(key)))
+
+        best: Dict[Hashable, Tuple[float, str]] = {}
+        for key in pool:
+            _, value, encoded = self._entries[key]
+            containment = overlaps[key] / len(query_grams)
+            similarity = max(jaccard(key), edit_similarity(query_encoded, encoded))
+            score = 0.6 * similarity + 0.4 * containment
+            if encoded == query_encoded:
+                score = 1.0
+            if score >= min_score and (value not in best or score > best[value][0]):
+                best[value] = (score, key)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], len(item[1][1]), item[1][1]))
+        return [(value, round(score, 4), key) for value, (score, key) in ranked[:k]]
@@ -1,29 +1,15 @@
 import os
 import logging
 import tempfile
-import pygame
-import os
-import logging
-import tempfile
-import pygame
+import threading
+import time
 from typing import Optional
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .speech_prep import prepare_for_speech, SpeechRouter
 
-# Try to import ElevenLabs
-try:
-    from elevenlabs.client import ElevenLabs
-    from elevenlabs import VoiceSettings, Voice
-    import elevenlabs
-    ELEVENLABS_AVAILABLE = True
-except ImportError as e:
-    ELEVENLABS_AVAILABLE = False
-    logging.warning(f"ElevenLabs not available: {e}. Using fallback TTS.")
-
-# Fallback TTS
-import pyttsx3
+# Speech backends (pygame, ElevenLabs, pyttsx3) are imported and initialized
+# lazily on first use so that importing this module stays cheap.
+ELEVENLABS_AVAILABLE = None  # Unknown until the first ElevenLabs initialization
 
 # ElevenLabs Configuration
 ELEVENLABS_VOICE_ID = 'JBFqnCBsd6RMkjVDRZzb'  # Your specific voice ID
@@ -40,20 +26,87 @@ class JarvisSpeech:
         self.client = None
         self.fallback_engine = None
         
-        # Initialize pygame mixer for audio playback
-        pygame.mixer.init()
+        # Backends are created on first use (or by warm_up) instead of here
+        self._pygame = None
+        self._voice_settings = None
+        self._elevenlabs_ready = False
+        self._fallback_ready = False
+        self._init_lock = threading.RLock()
         
-        # Try to initialize ElevenLabs
-        self._init_elevenlabs()
+        # Speech preparation: compaction stats and length-aware backend routing
+        self.router = SpeechRouter()
+        self.stats = {
+            'utterances': 0,
+            'original_chars': 0,
+            'spoken_chars': 0,
+            'chars_saved': 0,
+            'routes': {'elevenlabs': 0, 'system': 0},
+        }
         
-        # Initialize fallback TTS
-        self._init_fallback()
+    def _ensure_mixer(self):
+        """Initialize pygame mixer for audio playback on first use"""
+        with self._init_lock:
+            if self._pygame is None:
+                import pygame
+                pygame.mixer.init()
+                self._pygame = pygame
+            return self._pygame
+
+    def _ensure_elevenlabs(self):
+        """Initialize ElevenLabs once, on first use"""
+        with self._init_lock:
+            if not self._elevenlabs_ready:
+                self._init_elevenlabs()
+                self._elevenlabs_ready = True
+
+    def _ensure_fallback(self):
+        """Initialize fallback TTS once, on first use"""
+        with self._init_lock:
+            if not self._fallback_ready:
+                self._init_fallback()
+                self._fallback_ready = True
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Initialize all speech backends ahead of the first utterance"""
+        def _warm():
+            try:
+                self._ensure_elevenlabs()
+                if self.use_elevenlabs:
+                    self._ensure_mixer()
+                self._ensure_fallback()
+                logging.info(f"✅ Speech system warmed up: {self.get_status()}")
+            except Exception as e:
+                logging.error(f"❌ Speech warm-up failed: {e}")
+
+        if not background:
+            _warm()
+            return None
+
+        thread = threading.Thread(target=_warm, name="speech-warmup", daemon=True)
+        thread.start()
+        return thread
         
     def _init_elevenlabs(self):
         """Initialize ElevenLabs TTS"""
-        if not ELEVENLABS_AVAILABLE:
+        global ELEVENLABS_AVAILABLE
+
+        # Try to import ElevenLabs
+        try:
+            from elevenlabs.client import ElevenLabs
+            from elevenlabs import VoiceSettings
+            ELEVENLABS_AVAILABLE = True
+        except ImportError as e:
+            ELEVENLABS_AVAILABLE = False
+            logging.warning(f"ElevenLabs not available: {e}. Using fallback TTS.")
             print("❌ ElevenLabs library not available")
             return
+
+        # Load environment variables
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
             
         # Get API key from environment or use hardcoded fallback
         self.elevenlabs_api_key = os.getenv("ELEVEN_API_KEY")
@@ -71,6 +124,7 @@ class JarvisSpeech:
                 print("🔄 Initializing ElevenLabs client...")
                 # Initialize ElevenLabs client
                 self.client = ElevenLabs(api_key=self.elevenlabs_api_key)
+                self._voice_settings = VoiceSettings
                 
                 # Use your configured voice ID
                 self.voice_id = ELEVENLABS_VOICE_ID
@@ -88,6 +142,7 @@ class JarvisSpeech:
     def _init_fallback(self):
         """Initialize fallback pyttsx3 TTS"""
         try:
+            import pyttsx3
             self.fallback_engine = pyttsx3.init()
             
             # Try to set a good voice
@@ -114,10 +169,20 @@ class JarvisSpeech:
         if not text or not text.strip():
             return False
             
-        print(f"🎤 Speaking: '{text[:50]}...' (ElevenLabs: {self.use_elevenlabs})")
+        # Compact the text for speech: no markdown, emoji or URLs, capped length
+        prepared = prepare_for_speech(text)
+        text = prepared['text']
+        if not text:
+            return False
+        self._record_prepared(prepared)
+
+        self._ensure_elevenlabs()
+        backend = self.router.choose(len(text), elevenlabs_available=self.use_elevenlabs and bool(self.voice_id))
+        self.stats['routes'][backend] += 1
+        print(f"🎤 Speaking: '{text[:50]}...' (backend: {backend}, saved {prepared['chars_saved']} chars)")
             
         try:
-            if self.use_elevenlabs and self.voice_id:
+            if backend == 'elevenlabs':
                 print("🎵 Using ElevenLabs TTS...")
                 return self._speak_elevenlabs(text)
             else:
@@ -127,21 +192,39 @@ class JarvisSpeech:
         except Exception as e:
             print(f"❌ Speech error: {e}")
             # Try fallback if ElevenLabs fails
-            if self.use_elevenlabs:
+            if backend == 'elevenlabs':
                 print("🔄 Falling back to pyttsx3...")
                 return self._speak_fallback(text)
             return False
             
+    def _record_prepared(self, prepared: dict) -> None:
+        """Accumulate characters saved by speech preparation"""
+        self.stats['utterances'] += 1
+        self.stats['original_chars'] += prepared['original_chars']
+        self.stats['spoken_chars'] += prepared['spoken_chars']
+        self.stats['chars_saved'] += prepared['chars_saved']
+        if prepared['chars_saved'] > 0:
+            logging.info(f"✂️ Speech compacted {prepared['original_chars']} → {prepared['spoken_chars']} chars")
+
+    def get_stats(self) -> dict:
+        """Get speech preparation and routing statistics"""
+        stats = dict(self.stats)
+        stats['routes'] = dict(self.stats['routes'])
+        stats['short_text_limit'] = self.router.short_text_limit()
+        return stats
+
     def _speak_elevenlabs(self, text: str) -> bool:
         """Speak using ElevenLabs TTS"""
         try:
+            pygame = self._ensure_mixer()
             print(f"🎵 Generating ElevenLabs audio for: '{text[:30]}...'")
+            started = time.perf_counter()
             # Generate audio using the client
             audio = self.client.text_to_speech.convert(
                 voice_id=self.voice_id,
                 text=text,
                 model_id=self.model,
-                voice_settings=VoiceSettings(
+                voice_settings=self._voice_settings(
                     stability=0.75,      # Higher = more stable/consistent
                     similarity_boost=0.8, # Higher = closer to original voice
                     style=0.2,           # Lower = more neutral
@@ -156,6 +239,9 @@ class JarvisSpeech:
                 for chunk in audio:
                     temp_file.write(chunk)
                 temp_path = temp_file.name
+
+            # Feed the measured synthesis latency back into the router
+            self.router.record('elevenlabs', len(text), (time.perf_counter() - started) * 1000)
                 
             print(f"🎵 Playing audio from: {temp_path}")
             # Play audio using pygame
@@ -182,6 +268,7 @@ class JarvisSpeech:
     def _speak_fallback(self, text: str) -> bool:
         """Speak using fallback pyttsx3 TTS"""
         try:
+            self._ensure_fallback()
             if self.fallback_engine:
                 self.fallback_engine.say(text)
                 self.fallback_engine.runAndWait()
@@ -195,9 +282,9 @@ class JarvisSpeech:
     def stop_speech(self) -> bool:
         """Stop current speech playback"""
         try:
-            # Stop pygame audio playback
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.stop()
+            # Stop pygame audio playback (only if the mixer was ever started)
+            if self._pygame is not None and self._pygame.mixer.music.get_busy():
+                self._pygame.mixer.music.stop()
                 print("🛑 Speech playback stopped")
                 return True
             
@@ -217,15 +304,19 @@ class JarvisSpeech:
             
     def get_status(self) -> str:
         """Get current TTS status"""
+        self._ensure_elevenlabs()
         if self.use_elevenlabs:
             return "🎙️ ElevenLabs (High Quality)"
-        elif self.fallback_engine:
+
+        self._ensure_fallback()
+        if self.fallback_engine:
             return "🔊 System TTS (Fallback)"
         else:
             return "❌ No TTS Available"
             
     def list_available_voices(self) -> list:
         """List available ElevenLabs voices"""
+        self._ensure_elevenlabs()
         if not self.use_elevenlabs or not self.client:
             return []
             
@@ -237,13 +328,14 @@ class JarvisSpeech:
             
     def set_voice(self, voice_id: str) -> bool:
         """Set ElevenLabs voice by ID"""
+        self._ensure_elevenlabs()
         if self.use_elevenlabs:
             self.voice_id = voice_id
             return True
         return False
 
 
-# Global instance
+# Global instance (cheap: backends are created on first use)
 jarvis_speech = JarvisSpeech()
 
 def speak_text(text: str):
@@ -258,6 +350,14 @@ def get_speech_status():
     """Get current speech system status"""
     return jarvis_speech.get_status()
 
+def warm_up_speech(background: bool = True):
+    """Initialize speech backends ahead of time, in a background thread by default"""
+    return jarvis_speech.warm_up(background=background)
+
+def get_speech_stats():
+    """Get characters saved by speech preparation and backend routing counts"""
+    return jarvis_speech.get_stats()
+
 def list_voices():
     """List available voices"""
     return jarvis_speech.list_available_voices()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Launch Strategy Cache for Jarvis
+Remembers which launch method worked for each application (and how fast),
+so the known-good method is tried first and known-bad ones are tried last
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Failed strategies go back among the untried ones after this long
+FAILURE_TTL_SECONDS = 24 * 60 * 60
+
+class LaunchStrategyCache:
+    """Persisted per-app record of launch strategy outcomes and latencies"""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path or Path(__file__).parent / "launch_strategies.json")
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    def _key(self, app_info: Dict) -> str:
+        return app_info.get('id') or app_info['path']
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.cache_path, 'r') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable launch cache: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the cache atomically (temp file + rename)"""
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=f".{self.cache_path.name}.", dir=self.cache_path.parent)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f, separators=(',', ':'))
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"❌ Error saving launch cache: {e}")
+
+    def _entry(self, app_info: Dict) -> Optional[Dict]:
+        """Return the app's entry, dropping it if the bundle changed since it was recorded"""
+        entries = self._load()
+        key = self._key(app_info)
+        entry = entries.get(key)
+        if entry is not None and entry.get('fingerprint') != app_info.get('fingerprint'):
+            logger.debug(f"♻️ Bundle changed, forgetting launch strategies for {key}")
+            del entries[key]
+            entry = None
+        return entry
+
+    def order(self, app_info: Dict, strategies: List[str]) -> List[str]:
+        """Order strategies: known-good by latency, then untried, then recent failures
+
+        Recent failures are kept (oldest first) rather than dropped, so one
+        transient failure of every strategy cannot lock an app out.
+        """
+        with self._lock:
+            entry = self._entry(app_info)
+            if entry is None:
+                return list(strategies)
+
+            now = time.time()
+            good, untried, failed = [], [], []
+            for strategy in strategies:
+                result = entry['strategies'].get(strategy)
+                if result is None:
+                    untried.append(strategy)
+                elif result['ok']:
+                    good.append((result['latency_ms'], strategy))
+                elif now - result['at'] > FAILURE_TTL_SECONDS:
+                    untried.append(strategy)
+                else:
+                    failed.append((result['at'], strategy))
+
+            return ([strategy for _, strategy in sorted(good)] + untried
+                    + [strategy for _, strategy in sorted(failed)])
+
+    def record(self, app_info: Dict, strategy: str, ok: bool, latency_ms: float) -> None:
+        """Record the outcome of one launch attempt"""
+        with self._lock:
+            entry = self._entry(app_info)
+            if entry is None:
+                entry = {'fingerprint': app_info.get('fingerprint'), 'strategies': {}}
+                self._entries[self._key(app_info)] = entry
+
+            previous = entry['strategies'].get(strategy)
+            if ok and previous and previous['ok']:
+                # Smooth the latency so one slow launch does not reorder strategies
+                latency_ms = 0.7 * previous['latency_ms'] + 0.3 * latency_ms
+            entry['strategies'][strategy] = {'ok': ok, 'latency_ms': round(latency_ms, 1), 'at': time.time()}
+            self._save()
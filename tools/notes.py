@@ -1,32 +1,44 @@
 import os
-import datetime
+import logging
 from langchain.tools import tool
+from .notes_store import NotesStore
+from .notes_search import NotesSearchIndex
+from .notes_semantic import SemanticNotesIndex, SEMANTIC_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+notes_store = NotesStore()
+notes_search = NotesSearchIndex(notes_store)
+
+# Similarity search needs NumPy; set JARVIS_SEMANTIC_NOTES=0 to turn it off
+notes_semantic = None
+if SEMANTIC_AVAILABLE and os.getenv("JARVIS_SEMANTIC_NOTES", "1") != "0":
+    notes_semantic = SemanticNotesIndex(notes_store)
+
+def find_note_path(query: str = "") -> str:
+    """Path of the note best matching query, or of the newest note if query is empty ("" if none)"""
+    if query:
+        results = notes_search.search(query, 1)
+        if not results and notes_semantic:
+            results = notes_semantic.search(query, 1)
+    else:
+        results = notes_store.recent(1)
+    return notes_store.path(results[0]['id']) if results else ""
 
 @tool
 def take_note(content: str, title: str = "") -> str:
     """Take a quick note and save it to a file. Provide content and optional title."""
     try:
-        # Create notes directory if it doesn't exist
-        notes_dir = os.path.expanduser("~/Documents/Jarvis_Notes")
-        os.makedirs(notes_dir, exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        if title:
-            filename = f"{timestamp}_{title.replace(' ', '_')}.txt"
-        else:
-            filename = f"{timestamp}_note.txt"
-        
-        filepath = os.path.join(notes_dir, filename)
-        
-        # Write the note
-        with open(filepath, 'w') as f:
-            if title:
-                f.write(f"Title: {title}\\n")
-            f.write(f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n")
-            f.write(f"\\nContent:\\n{content}\\n")
-        
-        return f"Note saved to {filepath}"
+        entry = notes_store.add(content, title)
+        for index in (notes_search, notes_semantic):
+            if index is None:
+                continue
+            try:
+                index.add_note(entry)
+            except Exception as e:
+                # The note is saved; the search index catches up on the next search
+                logger.warning(f"⚠️ Could not index note: {e}")
+        return f"Note saved to {notes_store.path(entry['id'])}"
     except Exception as e:
         return f"Failed to save note: {str(e)}"
 
@@ -34,31 +46,45 @@ def take_note(content: str, title: str = "") -> str:
 def read_recent_notes(count: int = 5) -> str:
     """Read the most recent notes. Specify how many notes to read (default 5)."""
     try:
-        notes_dir = os.path.expanduser("~/Documents/Jarvis_Notes")
-        if not os.path.exists(notes_dir):
+        if not os.path.exists(notes_store.notes_dir):
             return "No notes directory found. Take a note first!"
         
-        # Get all note files sorted by modification time
-        notes = []
-        for file in os.listdir(notes_dir):
-            if file.endswith('.txt'):
-                filepath = os.path.join(notes_dir, file)
-                notes.append((filepath, os.path.getmtime(filepath)))
-        
-        notes.sort(key=lambda x: x[1], reverse=True)
+        # Served from the tail of the notes manifest, not by listing the directory
+        notes = notes_store.recent(count)
         
         if not notes:
             return "No notes found."
         
-        result = f"Recent {min(count, len(notes))} notes:\\n\\n"
-        for i, (filepath, _) in enumerate(notes[:count]):
-            filename = os.path.basename(filepath)
-            with open(filepath, 'r') as f:
-                content = f.read()[:200]  # First 200 chars
-                if len(f.read()) > 200:
-                    content += "..."
-            result += f"{i+1}. {filename}:\\n{content}\\n\\n"
+        result = f"Recent {len(notes)} notes:\n\n"
+        for i, note in enumerate(notes):
+            result += f"{i+1}. {note['id']}:\n{note['preview']}\n\n"
         
         return result
     except Exception as e:
         return f"Failed to read notes: {str(e)}"
+
+@tool
+def search_notes(query: str, count: int = 5, similar: bool = False) -> str:
+    """Search saved notes by keywords and return the best matches with a snippet. Use this when the user asks things like 'what did I note about the dentist' or 'find my note about the flight'. Set similar=True to find notes about related topics worded differently."""
+    try:
+        if not os.path.exists(notes_store.notes_dir):
+            return "No notes directory found. Take a note first!"
+        
+        results = [] if similar and notes_semantic else notes_search.search(query, count)
+        heading = f"Notes about '{query}':"
+        if not results and notes_semantic:
+            # No keyword match (or asked for related notes): fall back to similarity
+            results = notes_semantic.search(query, count)
+            heading = f"Notes related to '{query}':"
+        
+        if not results:
+            return f"No notes found about '{query}'."
+        
+        result = f"{heading}\n\n"
+        for i, note in enumerate(results):
+            label = f"{note['id']} ({note['title']})" if note['title'] else note['id']
+            result += f"{i+1}. {label}:\n{note['snippet']}\n\n"
+        
+        return result
+    except Exception as e:
+        return f"Failed to search notes: {str(e)}"
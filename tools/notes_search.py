@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Notes Search Module for Jarvis
+BM25 full-text search over the notes through an on-disk inverted index:
+a main segment (term dictionary + packed postings) plus an append-only
+delta for new notes, merged when the delta grows
+"""
+
+import os
+import re
+import json
+import math
+import uuid
+import heapq
+import tempfile
+import threading
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+try:
+    from .notes_store import NotesStore, parse_note, note_stamp
+except ImportError:  # Running as a script from the tools directory
+    from notes_store import NotesStore, parse_note, note_stamp
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = set("""
+a an and are as at be but by for from had has have he her his i if in into is it its me my
+no not of on or our she so than that the their them then there these they this to was we
+were what when where which who will with you your about did do does note notes
+""".split())
+
+# Longest suffixes first; the replacement keeps related forms together
+SUFFIXES = [
+    ("ational", "ate"), ("tional", "tion"), ("ization", "ize"), ("iveness", "ive"),
+    ("fulness", "ful"), ("ousness", "ous"), ("ements", ""), ("ement", ""), ("ments", ""),
+    ("ment", ""), ("ingly", ""), ("edly", ""), ("ings", ""), ("ing", ""), ("ies", "y"),
+    ("ied", "y"), ("sses", "ss"), ("ness", ""), ("ly", ""), ("ed", ""), ("es", ""),
+    ("ss", "ss"), ("s", ""),
+]
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer ("appointments" → "appoint", "changing" → "chang")"""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    # "planned" → "plann" → "plan"
+    if len(word) > 4 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split, drop stopwords and stem"""
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class NotesSearchIndex:
+    """Incremental on-disk inverted index with BM25 ranking"""
+
+    K1 = 1.2
+    B = 0.75
+
+    # Merge the delta into the main segment once it holds this many notes (or 10% of them)
+    MERGE_MIN_DOCS = 1000
+    MERGE_FRACTION = 0.1
+
+    SNIPPET_WORDS = 24
+
+    def __init__(self, store: NotesStore):
+        self.store = store
+        self.search_dir = os.path.join(store.index_dir, "search")
+        self.docs_path = os.path.join(self.search_dir, "docs.json")
+        self.terms_path = os.path.join(self.search_dir, "terms.json")
+        self.postings_path = os.path.join(self.search_dir, "postings.bin")
+        self.delta_path = os.path.join(self.search_dir, "delta.jsonl")
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._segment = ""
+        self._generation = -1
+        self._terms: Dict[str, List[int]] = {}  # term → [offset, count] in postings.bin
+        self._ids: List[str] = []  # doc number → note id (main segment first, then delta)
+        self._lengths: List[int] = []
+        self._stamps: List[Optional[List[int]]] = []  # doc number → note file (mtime_ns, size) when indexed
+        self._main_docs = 0
+        self._delta: Dict[str, List[Tuple[int, int]]] = {}
+        self._numbers: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._live_length = 0
+
+    # ----- persistence -----
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=self.search_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _save_docs(self) -> None:
+        docs = {
+            'segment': self._segment,
+            'generation': self._generation,
+            'ids': self._ids[:self._main_docs],
+            'lengths': self._lengths[:self._main_docs],
+            'stamps': self._stamps[:self._main_docs],
+            'deleted': sorted(self._deleted),
+            'postings_bytes': os.path.getsize(self.postings_path),
+        }
+        self._write_atomic(self.docs_path, json.dumps(docs, separators=(',', ':')).encode())
+
+    def _load(self) -> bool:
+        """Load the main segment and replay the delta; False if the index is missing or torn"""
+        self._reset()
+        try:
+            with open(self.docs_path, 'r') as f:
+                docs = json.load(f)
+            with open(self.terms_path, 'r') as f:
+                terms = json.load(f)
+            if terms.get('segment') != docs['segment'] or 'stamps' not in docs or \
+                    os.path.getsize(self.postings_path) != docs['postings_bytes']:
+                return False
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self._segment = docs['segment']
+        self._generation = docs['generation']
+        self._terms = terms['terms']
+        self._ids = docs['ids']
+        self._lengths = docs['lengths']
+        self._stamps = docs['stamps']
+        self._main_docs = len(self._ids)
+        self._numbers = {note_id: number for number, note_id in enumerate(self._ids)}
+
+        try:
+            with open(self.delta_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn append; the note is re-indexed by the next sync
+                    if record.get('segment') == self._segment:
+                        self._apply_delta(record)
+        except FileNotFoundError:
+            pass
+
+        self._deleted.update(number for number in docs['deleted'] if number < len(self._ids))
+        self._live_length = sum(self._lengths) - sum(self._lengths[number] for number in self._deleted)
+        return True
+
+    def _apply_delta(self, record: Dict) -> None:
+        """Add one delta record (a newly indexed note) to the in-memory state"""
+        note_id = record['id']
+        if note_id in self._numbers:
+            self._deleted.add(self._numbers[note_id])  # Re-indexed: the newer copy wins
+        number = len(self._ids)
+        self._ids.append(note_id)
+        self._lengths.append(record['len'])
+        self._stamps.append(record.get('stamp'))
+        self._numbers[note_id] = number
+        for term, tf in record['terms'].items():
+            self._delta.setdefault(term, []).append((number, tf))
+        self._generation = max(self._generation, record.get('generation', -1))
+
+    def _write_segment(self, docs: List[Tuple[str, int, List[int]]],
+                       postings: Dict[str, List[Tuple[int, int]]]) -> None:
+        """Write a new main segment and clear the delta"""
+        os.makedirs(self.search_dir, exist_ok=True)
+        packed = array('I')
+        terms = {}
+        for term in sorted(postings):
+            entries = postings[term]
+            terms[term] = [len(packed) // 2, len(entries)]
+            for number, tf in entries:
+                packed.append(number)
+                packed.append(tf)
+
+        self._segment = uuid.uuid4().hex
+        self._write_atomic(self.postings_path, packed.tobytes())
+        self._write_atomic(self.terms_path, json.dumps({'segment': self._segment, 'terms': terms},
+                                                       separators=(',', ':')).encode())
+        self._terms = terms
+        self._ids = [note_id for note_id, _, _ in docs]
+        self._lengths = [length for _, length, _ in docs]
+        self._stamps = [stamp for _, _, stamp in docs]
+        self._main_docs = len(docs)
+        self._numbers = {note_id: number for number, note_id in enumerate(self._ids)}
+        self._delta = {}
+        self._deleted = set()
+        self._live_length = sum(self._lengths)
+        self._save_docs()  # Written last: it commits the new segment
+        self._write_atomic(self.delta_path, b"")
+
+    # ----- indexing -----
+
+    def _read_note(self, note_id: str) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self.store.path(note_id), 'r', encoding='utf-8', errors='replace') as f:
+                return parse_note(f.read())
+        except OSError:
+            return None
+
+    def _term_counts(self, note_id: str) -> Optional[Tuple[Dict[str, int], int]]:
+        note = self._read_note(note_id)
+        if note is None:
+            return None
+        tokens = tokenize(f"{note[0]} {note[1]}")
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        return counts, len(tokens)
+
+    def rebuild(self) -> None:
+        """Index every note from scratch (first use, or after a torn index)"""
+        with self._lock:
+            generation = self.store.generation()
+            docs = []
+            postings: Dict[str, List[Tuple[int, int]]] = {}
+            for entry in self.store.entries():
+                counted = self._term_counts(entry['id'])
+                if counted is None:
+                    continue
+                counts, length = counted
+                number = len(docs)
+                docs.append((entry['id'], length, list(note_stamp(entry))))
+                for term, tf in counts.items():
+                    postings.setdefault(term, []).append((number, tf))
+            self._generation = generation
+            self._write_segment(docs, postings)
+            self._loaded = True
+            logger.info(f"🔎 Built notes search index ({len(docs)} notes, {len(postings)} terms)")
+
+    def _index_note(self, note_id: str, stamp: List[int], generation: int) -> None:
+        """Append one note to the delta (on disk and in memory)"""
+        counted = self._term_counts(note_id)
+        if counted is None:
+            return
+        counts, length = counted
+        self._remove_notes([note_id])  # An edited note replaces its older copy
+        record = {'segment': self._segment, 'generation': generation, 'id': note_id,
+                  'len': length, 'stamp': stamp, 'terms': counts}
+        with open(self.delta_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self._apply_delta(record)
+        self._live_length += length
+
+    def _remove_notes(self, note_ids: List[str]) -> None:
+        for note_id in note_ids:
+            number = self._numbers.get(note_id)
+            if number is not None and number not in self._deleted:
+                self._deleted.add(number)
+                self._live_length -= self._lengths[number]
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            if self._load():
+                self._loaded = True
+            else:
+                self.rebuild()
+
+    def add_note(self, entry: Dict) -> None:
+        """Index a note that take_note just wrote"""
+        with self._lock:
+            self._ensure_loaded()
+            generation = self.store.current_generation()
+            if generation != self._generation + 1:
+                return  # Out of step (external edits): the next search syncs lazily
+            self._index_note(entry['id'], list(note_stamp(entry)), generation)
+            self._maybe_merge()
+
+    def sync(self) -> None:
+        """Catch up with notes added, removed or edited outside take_note
+
+        Nothing changed (the common case) is answered by the store's
+        generation check, without reconciling or reading the manifest.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self.store.current_generation() == self._generation:
+                return
+            generation = self.store.generation()
+            if generation == self._generation:
+                return
+
+            present = {entry['id']: list(note_stamp(entry)) for entry in self.store.entries()}
+            indexed = {note_id: self._stamps[number] for note_id, number in self._numbers.items()
+                       if number not in self._deleted}
+            # New notes, and notes whose file changed since they were indexed
+            added = sorted(note_id for note_id, stamp in present.items() if indexed.get(note_id) != stamp)
+            removed = sorted(set(indexed) - set(present))
+
+            if len(added) > max(self.MERGE_MIN_DOCS, len(indexed) // 2):
+                self.rebuild()
+                return
+
+            self._remove_notes(removed)
+            for note_id in added:
+                self._index_note(note_id, present[note_id], generation)
+            self._generation = generation
+            self._save_docs()
+            self._maybe_merge()
+            logger.debug(f"🔎 Notes search index synced (+{len(added)} -{len(removed)})")
+
+    def _maybe_merge(self) -> None:
+        """Fold the delta and deletions into a new main segment once they grow"""
+        pending = len(self._ids) - self._main_docs + len(self._deleted)
+        if pending < max(self.MERGE_MIN_DOCS, int(self._main_docs * self.MERGE_FRACTION)):
+            return
+
+        renumber = {}
+        docs = []
+        for number, note_id in enumerate(self._ids):
+            if number not in self._deleted:
+                renumber[number] = len(docs)
+                docs.append((note_id, self._lengths[number], self._stamps[number]))
+
+        packed = array('I')
+        with open(self.postings_path, 'rb') as f:
+            packed.frombytes(f.read())
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for term in set(self._terms) | set(self._delta):
+            merged = []
+            if term in self._terms:
+                offset, count = self._terms[term]
+                start = offset * 2
+                merged = list(zip(packed[start:start + count * 2:2], packed[start + 1:start + count * 2:2]))
+            merged.extend(self._delta.get(term, ()))
+            merged = [(renumber[number], tf) for number, tf in merged if number in renumber]
+            if merged:
+                postings[term] = merged
+        self._write_segment(docs, postings)
+        logger.info(f"🔎 Merged notes search index ({len(docs)} notes)")
+
+    # ----- querying -----
+
+    def _postings(self, term: str) -> List[Tuple[int, int]]:
+        """Postings for a term from the main segment (read from disk) plus the delta"""
+        result = []
+        location = self._terms.get(term)
+        if location is not None:
+            offset, count = location
+            packed = array('I')
+            with open(self.postings_path, 'rb') as f:
+                f.seek(offset * 2 * packed.itemsize)
+                packed.fromfile(f, count * 2)
+            result = list(zip(packed[0::2], packed[1::2]))
+        result.extend(self._delta.get(term, ()))
+        return result
+
+    def search(self, query: str, count: int = 5) -> List[Dict]:
+        """Return up to count notes as dicts with id, title, score and snippet, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            self.sync()
+            live = len(self._ids) - len(self._deleted)
+            if live == 0:
+                return []
+            average_length = max(1.0, self._live_length / live)
+
+            # Rarest terms first; each term adds at most idf * (K1 + 1) to a note's score
+            weighted = []
+            for term in terms:
+                postings = self._postings(term)
+                if postings:
+                    idf = math.log(1 + (live - len(postings) + 0.5) / (len(postings) + 0.5))
+                    weighted.append((idf, postings))
+            weighted.sort(key=lambda item: len(item[1]))
+            remaining_bound = sum(idf * (self.K1 + 1) for idf, _ in weighted)
+
+            scores: Dict[int, float] = {}
+            lengths = self._lengths
+            deleted = self._deleted
+            norm = self.K1 * (1 - self.B)
+            scale = self.K1 * self.B / average_length
+            for idf, postings in weighted:
+                # Once no unseen note can reach the current top results, skip new candidates
+                closed = len(scores) >= count and \
+                    heapq.nlargest(count, scores.values())[-1] > remaining_bound
+                remaining_bound -= idf * (self.K1 + 1)
+                weight = idf * (self.K1 + 1)
+                for number, tf in postings:
+                    score = scores.get(number)
+                    if score is None and (closed or number in deleted):
+                        continue
+                    scores[number] = (score or 0.0) + weight * tf / (tf + norm + scale * lengths[number])
+
+            best = heapq.nlargest(count, scores.items(), key=lambda item: item[1])
+            ids = [(self._ids[number], score) for number, score in best]
+
+        results = []
+        for note_id, score in ids:
+            note = self._read_note(note_id)
+            title, content = note if note else ("", "")
+            results.append({'id': note_id, 'title': title, 'score': round(score, 3),
+                            'snippet': self.snippet(content, terms)})
+        return results
+
+    def snippet(self, content: str, terms: List[str]) -> str:
+        """The window of words with the most query-term hits"""
+        words = content.split()
+        if len(words) <= self.SNIPPET_WORDS:
+            return " ".join(words)
+        wanted = set(terms)
+        hits = [1 if stem(word.lower().strip(".,;:!?()\"'")) in wanted else 0 for word in words]
+
+        best_start, best_hits = 0, -1
+        window = sum(hits[:self.SNIPPET_WORDS])
+        for start in range(len(words) - self.SNIPPET_WORDS + 1):
+            if start:
+                window += hits[start + self.SNIPPET_WORDS - 1] - hits[start - 1]
+            if window > best_hits:
+                best_start, best_hits = start, window
+        text = " ".join(words[best_start:best_start + self.SNIPPET_WORDS])
+        prefix = "..." if best_start else ""
+        suffix = "..." if best_start + self.SNIPPET_WORDS < len(words) else ""
+        return f"{prefix}{text}{suffix}"
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Semantic Notes Search Module for Jarvis
+Optional similarity search over the notes: one embedding per note stored as a
+memory-mapped float32 matrix, appended to as notes are taken, and scanned in
+fixed-size chunks with vectorized NumPy top-k
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # Semantic search is optional; keyword search works without NumPy
+    np = None
+
+try:
+    from .notes_store import NotesStore, parse_note, make_preview, note_stamp
+    from .notes_search import tokenize
+except ImportError:  # Running as a script from the tools directory
+    from notes_store import NotesStore, parse_note, make_preview, note_stamp
+    from notes_search import tokenize
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_AVAILABLE = np is not None
+
+EMBED_DIM = 256
+
+# Rows scored per step, so a query touches at most CHUNK_ROWS * dim * 4 bytes at once
+CHUNK_ROWS = 16384
+
+@lru_cache(maxsize=262144)
+def _feature_slot(feature: str, dim: int) -> int:
+    """Signed bucket for a feature: +(index + 1) or -(index + 1)"""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+    index = digest % dim + 1
+    return index if (digest >> 63) & 1 else -index
+
+
+class HashingEmbedder:
+    """Deterministic offline embedder: signed feature hashing of words, word pairs
+    and character trigrams, L2-normalized
+
+    Shares vocabulary-free features between related word forms and typos; it does
+    not know synonyms, which needs a model-backed embedder such as OllamaEmbedder.
+    """
+
+    # Feature weights: whole words dominate, trigrams catch partial matches
+    WORD_WEIGHT = 1.0
+    PAIR_WEIGHT = 0.5
+    TRIGRAM_WEIGHT = 0.25
+
+    def __init__(self, dim: int = EMBED_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def _features(self, text: str) -> Dict[int, float]:
+        words = tokenize(text)
+        features: Dict[int, float] = {}
+
+        def add(feature: str, weight: float) -> None:
+            slot = _feature_slot(feature, self.dim)
+            index = abs(slot) - 1
+            features[index] = features.get(index, 0.0) + (weight if slot > 0 else -weight)
+
+        for i, word in enumerate(words):
+            add(word, self.WORD_WEIGHT)
+            if i:
+                add(f"{words[i - 1]} {word}", self.PAIR_WEIGHT)
+            padded = f"<{word}>"
+            for j in range(len(padded) - 2):
+                add(padded[j:j + 3], self.TRIGRAM_WEIGHT)
+        return features
+
+    def __call__(self, texts: List[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for index, value in self._features(text).items():
+                vectors[row, index] = value
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+class OllamaEmbedder:
+    """Embeddings from a local Ollama model (e.g. nomic-embed-text), for paraphrase matching"""
+
+    def __init__(self, model: str):
+        import ollama
+        self._client = ollama
+        self.model = model
+        self.name = f"ollama-{model}"
+
+    def __call__(self, texts: List[str]) -> "np.ndarray":
+        response = self._client.embed(model=self.model, input=texts)
+        vectors = np.asarray(response['embeddings'], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+def default_embedder() -> Callable:
+    """The Ollama model named by JARVIS_NOTES_EMBED_MODEL, else the hashing embedder"""
+    model = os.getenv("JARVIS_NOTES_EMBED_MODEL")
+    if model:
+        try:
+            return OllamaEmbedder(model)
+        except ImportError as e:
+            logger.warning(f"⚠️ Ollama embeddings not available ({e}); using hashing embedder")
+    return HashingEmbedder()
+
+
+class SemanticNotesIndex:
+    """Note embeddings in an append-only float32 matrix with chunked top-k search"""
+
+    # Below this cosine similarity a note is not considered related
+    MIN_SCORE = 0.15
+
+    # Compact the matrix once this many rows (or 10% of them) belong to removed notes
+    COMPACT_MIN_ROWS = 1000
+    COMPACT_FRACTION = 0.1
+
+    BUILD_BATCH = 256
+
+    def __init__(self, store: NotesStore, embedder: Optional[Callable] = None):
+        if np is None:
+            raise ImportError("NumPy is required for semantic note search")
+        self.store = store
+        self.embedder = embedder or default_embedder()
+        self.semantic_dir = os.path.join(store.index_dir, "semantic")
+        self.vectors_path = os.path.join(self.semantic_dir, "vectors.f32")
+        self.ids_path = os.path.join(self.semantic_dir, "ids.jsonl")
+        self.meta_path = os.path.join(self.semantic_dir, "meta.json")
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._dim = 0
+        self._generation = -1
+        self._ids: List[str] = []  # row → note id
+        self._stamps: List[List[int]] = []  # row → note file (mtime_ns, size) when embedded
+        self._rows: Dict[str, int] = {}  # note id → live row
+        self._deleted: set = set()
+        self._matrix = None  # memmap over the first len(self._ids) rows
+        self._deleted_rows = None
+
+    @property
+    def embedder_name(self) -> str:
+        return getattr(self.embedder, 'name', getattr(self.embedder, '__name__', 'custom'))
+
+    # ----- persistence -----
+
+    def _save_meta(self) -> None:
+        meta = {
+            'embedder': self.embedder_name,
+            'dim': self._dim,
+            'generation': self._generation,
+            'rows': len(self._ids),
+            'deleted': sorted(self._deleted),
+        }
+        fd, temp_path = tempfile.mkstemp(prefix=".meta.", dir=self.semantic_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f, separators=(',', ':'))
+        os.replace(temp_path, self.meta_path)
+
+    def _load(self) -> bool:
+        """Load ids and metadata; False if the index is missing, torn or from another embedder"""
+        self._reset()
+        try:
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+            rows = meta['rows']
+            if meta['embedder'] != self.embedder_name or \
+                    os.path.getsize(self.vectors_path) < rows * meta['dim'] * 4:
+                return False
+            ids, stamps = [], []
+            with open(self.ids_path, 'r', encoding='utf-8') as f:
+                while len(ids) < rows:
+                    line = f.readline()
+                    if not line:
+                        break
+                    note_id, stamp = json.loads(line)  # Older indexes (bare ids) fail here and are rebuilt
+                    ids.append(note_id)
+                    stamps.append(stamp)
+                leftover = bool(f.readline())
+            if len(ids) < rows:
+                return False
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self._dim = meta['dim']
+        self._generation = meta['generation']
+        self._ids = ids
+        self._stamps = stamps
+        self._deleted = {row for row in meta['deleted'] if row < rows}
+        self._rows = {note_id: row for row, note_id in enumerate(ids) if row not in self._deleted}
+        # Rows past the committed count are leftovers of an interrupted append
+        if os.path.getsize(self.vectors_path) > rows * self._dim * 4:
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(rows * self._dim * 4)
+        if leftover:
+            self._write_ids(ids, stamps)
+        return True
+
+    def _write_ids(self, ids: List[str], stamps: List[List[int]]) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=".ids.", dir=self.semantic_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for note_id, stamp in zip(ids, stamps):
+                f.write(json.dumps([note_id, stamp]) + "\n")
+        os.replace(temp_path, self.ids_path)
+
+    def _append(self, note_ids: List[str], stamps: List[List[int]], vectors: "np.ndarray") -> None:
+        """Append rows to the matrix and ids, then commit them in the metadata"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not self._dim:
+            self._dim = vectors.shape[1]
+        with open(self.vectors_path, 'ab') as f:
+            f.write(vectors.tobytes())
+        with open(self.ids_path, 'a', encoding='utf-8') as f:
+            for note_id, stamp in zip(note_ids, stamps):
+                f.write(json.dumps([note_id, stamp]) + "\n")
+        for note_id, stamp in zip(note_ids, stamps):
+            if note_id in self._rows:
+                self._deleted.add(self._rows[note_id])  # Re-embedded: the newer row wins
+            self._rows[note_id] = len(self._ids)
+            self._ids.append(note_id)
+            self._stamps.append(stamp)
+        self._matrix = None
+        self._deleted_rows = None
+
+    # ----- indexing -----
+
+    def _note_text(self, note_id: str) -> Optional[str]:
+        try:
+            with open(self.store.path(note_id), 'r', encoding='utf-8', errors='replace') as f:
+                title, content = parse_note(f.read())
+        except OSError:
+            return None
+        return f"{title}\n{content}"
+
+    def _embed_notes(self, entries: List[Dict]) -> None:
+        """Embed notes (manifest entries) in batches, so a rebuild never holds more than one batch of text"""
+        for start in range(0, len(entries), self.BUILD_BATCH):
+            batch, stamps, texts = [], [], []
+            for entry in entries[start:start + self.BUILD_BATCH]:
+                text = self._note_text(entry['id'])
+                if text is not None:
+                    batch.append(entry['id'])
+                    stamps.append(list(note_stamp(entry)))
+                    texts.append(text)
+            if batch:
+                self._append(batch, stamps, self.embedder(texts))
+
+    def rebuild(self) -> None:
+        """Embed every note from scratch (first use, new embedder, or a torn index)"""
+        with self._lock:
+            os.makedirs(self.semantic_dir, exist_ok=True)
+            generation = self.store.generation()
+            self._reset()
+            for path in (self.vectors_path, self.ids_path):
+                open(path, 'wb').close()
+            self._embed_notes(self.store.entries())
+            self._generation = generation
+            self._save_meta()
+            self._loaded = True
+            logger.info(f"🧠 Built semantic notes index ({len(self._rows)} notes, {self.embedder_name})")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            if self._load():
+                self._loaded = True
+            else:
+                self.rebuild()
+
+    def add_note(self, entry: Dict) -> None:
+        """Embed a note that take_note just wrote"""
+        with self._lock:
+            self._ensure_loaded()
+            generation = self.store.current_generation()
+            if generation != self._generation + 1:
+                return  # Out of step (external edits): the next search syncs lazily
+            self._embed_notes([entry])
+            self._generation = generation
+            self._save_meta()
+
+    def sync(self) -> None:
+        """Catch up with notes added, removed or edited outside take_note
+
+        Uses the same cheap generation check as the full-text index, so an
+        unchanged notes folder costs two stats per query.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self.store.current_generation() == self._generation:
+                return
+            generation = self.store.generation()
+            if generation == self._generation:
+                return
+
+            present = {entry['id']: entry for entry in self.store.entries()}
+            # New notes, and notes whose file changed since they were embedded
+            added = [present[note_id] for note_id in sorted(present)
+                     if note_id not in self._rows
+                     or self._stamps[self._rows[note_id]] != list(note_stamp(present[note_id]))]
+            removed = [note_id for note_id in self._rows if note_id not in present]
+            for note_id in removed:
+                self._deleted.add(self._rows.pop(note_id))
+            self._deleted_rows = None
+            self._embed_notes(added)
+            self._generation = generation
+            self._maybe_compact()
+            self._save_meta()
+            logger.debug(f"🧠 Semantic notes index synced (+{len(added)} -{len(removed)})")
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the matrix without removed rows once they pile up"""
+        if len(self._deleted) < max(self.COMPACT_MIN_ROWS, int(len(self._ids) * self.COMPACT_FRACTION)):
+            return
+        matrix = self._open_matrix()
+        keep = [row for row in range(len(self._ids)) if row not in self._deleted]
+        fd, temp_path = tempfile.mkstemp(prefix=".vectors.", dir=self.semantic_dir)
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(keep), CHUNK_ROWS):
+                f.write(np.ascontiguousarray(matrix[keep[start:start + CHUNK_ROWS]]).tobytes())
+        self._matrix = None
+        ids = [self._ids[row] for row in keep]
+        stamps = [self._stamps[row] for row in keep]
+        self._write_ids(ids, stamps)
+        os.replace(temp_path, self.vectors_path)
+        self._ids = ids
+        self._stamps = stamps
+        self._rows = {note_id: row for row, note_id in enumerate(ids)}
+        self._deleted = set()
+        self._deleted_rows = None
+        logger.info(f"🧠 Compacted semantic notes index ({len(ids)} notes)")
+
+    # ----- querying -----
+
+    def _open_matrix(self) -> "np.ndarray":
+        if self._matrix is None:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                     shape=(len(self._ids), self._dim))
+        return self._matrix
+
+    def search(self, query: str, count: int = 5) -> List[Dict]:
+        """Return up to count related notes as dicts with id, title, score and snippet, best first"""
+        with self._lock:
+            self.sync()
+            if not self._rows:
+                return []
+            vector = np.asarray(self.embedder([query]), dtype=np.float32)[0]
+            if self._deleted_rows is None:
+                self._deleted_rows = np.fromiter(sorted(self._deleted), dtype=np.int64, count=len(self._deleted))
+            matrix = self._open_matrix()
+            deleted = self._deleted_rows
+
+            best_rows = np.empty(0, dtype=np.int64)
+            best_scores = np.empty(0, dtype=np.float32)
+            for start in range(0, len(self._ids), CHUNK_ROWS):
+                scores = matrix[start:start + CHUNK_ROWS] @ vector
+                lo, hi = np.searchsorted(deleted, [start, start + len(scores)])
+                scores[deleted[lo:hi] - start] = -np.inf
+                if len(scores) > count:
+                    top = np.argpartition(scores, -count)[-count:]
+                else:
+                    top = np.arange(len(scores))
+                best_rows = np.concatenate([best_rows, top + start])
+                best_scores = np.concatenate([best_scores, scores[top]])
+                if len(best_scores) > count:
+                    keep = np.argpartition(best_scores, -count)[-count:]
+                    best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+            order = np.argsort(-best_scores)
+            ids = [(self._ids[best_rows[i]], float(best_scores[i])) for i in order
+                   if best_scores[i] >= self.MIN_SCORE]
+
+        results = []
+        for note_id, score in ids:
+            text = self._note_text(note_id) or "\n"
+            title, content = text.split("\n", 1)
+            results.append({'id': note_id, 'title': title, 'score': round(score, 3),
+                            'snippet': make_preview(content)})
+        return results
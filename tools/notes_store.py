@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Notes Store Module for Jarvis
+Keeps an append-only manifest (id, title, timestamp, size, preview) next to
+the notes, so the most recent notes are read from the manifest's tail
+instead of reading every note file
+"""
+
+import os
+import json
+import time
+import datetime
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+NOTES_DIR = os.path.expanduser("~/Documents/Jarvis_Notes")
+NOTE_SUFFIX = ".txt"
+
+# Index files live in a subdirectory so writing them does not change the
+# notes directory's mtime, which is how added and removed notes are detected
+INDEX_DIRNAME = ".jarvis"
+
+PREVIEW_CHARS = 200
+
+# Notes edited in place do not change the directory's mtime; a background
+# sweep stats every note file at most this often to pick those edits up
+EDIT_SWEEP_SECONDS = 30.0
+
+def parse_note(text: str) -> Tuple[str, str]:
+    """Split a note file into (title, content)
+
+    Understands the take_note layout (Title/Date header, then "Content:"),
+    including older notes written with literal "\\n" sequences.
+    """
+    if "\\n" in text and "\n" not in text.rstrip("\n"):
+        text = text.replace("\\n", "\n")
+    title = ""
+    lines = text.split("\n")
+    for i, line in enumerate(lines[:4]):
+        if line.startswith("Title: "):
+            title = line[len("Title: "):].strip()
+        elif line.strip() == "Content:":
+            return title, "\n".join(lines[i + 1:]).strip()
+    return title, text.strip()
+
+def note_stamp(entry: Dict) -> Tuple[Optional[int], Optional[int]]:
+    """(mtime_ns, size) of a note file when its manifest entry was made"""
+    return entry.get('mtime_ns'), entry.get('size')
+
+def make_preview(content: str) -> str:
+    preview = " ".join(content.split())
+    if len(preview) > PREVIEW_CHARS:
+        preview = preview[:PREVIEW_CHARS] + "..."
+    return preview
+
+
+class NotesStore:
+    """Note files plus a manifest that serves "recent k" in O(k)"""
+
+    def __init__(self, notes_dir: Optional[str] = None):
+        self.notes_dir = notes_dir or NOTES_DIR
+        self.index_dir = os.path.join(self.notes_dir, INDEX_DIRNAME)
+        self.manifest_path = os.path.join(self.index_dir, "manifest.jsonl")
+        self.state_path = os.path.join(self.index_dir, "state.json")
+        self._lock = threading.RLock()
+        self._state: Dict = {}
+        self._state_stamp = None
+        # Note file stamps as of the last full scan in this process
+        self._stamps: Optional[Dict[str, Tuple[int, int]]] = None
+        self._swept_at: Optional[float] = None
+        self._sweeping = False
+
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.notes_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """filename → (mtime_ns, size) for every note file"""
+        stamps = {}
+        with os.scandir(self.notes_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(NOTE_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _file_stamp(self, note_id: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(os.path.join(self.notes_dir, note_id))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_state(self) -> Dict:
+        """The state file, parsed again only when it changed on disk"""
+        try:
+            stat = os.stat(self.state_path)
+        except OSError:
+            return {}
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._state_stamp:
+            try:
+                with open(self.state_path, 'r') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                return {}
+            self._state_stamp = stamp
+        return dict(self._state)
+
+    def _save_state(self, state: Dict) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=".state.", dir=self.index_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(temp_path, self.state_path)
+        stat = os.stat(self.state_path)
+        self._state, self._state_stamp = dict(state), (stat.st_mtime_ns, stat.st_size)
+
+    def _entry_for_file(self, filename: str) -> Optional[Dict]:
+        """Build a manifest entry by reading a note file"""
+        filepath = os.path.join(self.notes_dir, filename)
+        try:
+            stat = os.stat(filepath)
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                title, content = parse_note(f.read())
+        except OSError as e:
+            logger.debug(f"Could not read note {filename}: {e}")
+            return None
+        return {
+            'id': filename,
+            'title': title,
+            'ts': round(stat.st_mtime, 3),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'preview': make_preview(content),
+        }
+
+    def _append(self, entry: Dict) -> None:
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+
+    def _read_all(self) -> List[Dict]:
+        """Every entry, oldest first; a note appended again after an edit keeps its newest entry"""
+        entries: Dict[str, Dict] = {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # Torn write from a crash; reconcile will rebuild it
+                        entries.pop(entry['id'], None)
+                        entries[entry['id']] = entry
+        except FileNotFoundError:
+            pass
+        return list(entries.values())
+
+    def _read_tail(self, count: int) -> List[Dict]:
+        """Read the last count entries by scanning the manifest backwards in blocks"""
+        entries: List[Dict] = []
+        seen = set()
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                remainder = b""
+                while position > 0 and len(entries) < count:
+                    block = min(8192, position)
+                    position -= block
+                    f.seek(position)
+                    lines = (f.read(block) + remainder).split(b"\n")
+                    # The first piece may be a partial line; keep it for the next block
+                    remainder = lines.pop(0) if position > 0 else b""
+                    for line in reversed(lines):
+                        if line.strip() and len(entries) < count:
+                            try:
+                                entry = json.loads(line)
+                            except ValueError:
+                                continue
+                            if entry['id'] not in seen:  # Older copy of an edited note
+                                seen.add(entry['id'])
+                                entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def reconcile(self, force: bool = False) -> Dict[str, List[str]]:
+        """Sync the manifest with the notes directory if it changed since the last sync
+
+        Adding, removing or renaming a note changes the directory's mtime,
+        so an unchanged directory costs one stat. Notes edited in place are
+        caught by recent() for the notes it returns, and by a background
+        sweep at most every EDIT_SWEEP_SECONDS for the rest.
+        Returns the ids that were added, removed and changed.
+        """
+        with self._lock:
+            if not os.path.isdir(self.notes_dir):
+                return {'added': [], 'removed': [], 'changed': []}
+            if not os.path.isdir(self.index_dir):
+                os.makedirs(self.index_dir, exist_ok=True)  # Before reading the mtime it changes
+            dir_mtime = self._dir_mtime()
+            state = self._load_state()
+            if not force and state.get('dir_mtime_ns') == dir_mtime:
+                self._maybe_sweep()
+                return {'added': [], 'removed': [], 'changed': []}
+            return self._sync(self._scan(), state, dir_mtime, force)
+
+    def _sync(self, stamps: Dict[str, Tuple[int, int]], state: Dict, dir_mtime: Optional[int],
+              force: bool = False) -> Dict[str, List[str]]:
+        """Bring the manifest in line with scanned file stamps (lock held)"""
+        changes = {'added': [], 'removed': [], 'changed': []}
+        known = {entry['id']: entry for entry in self._read_all()}
+        entries = []
+        for note_id, entry in known.items():
+            if note_id not in stamps:
+                continue
+            if note_stamp(entry) == stamps[note_id]:
+                entries.append(entry)
+                continue
+            # Edited since it was recorded: re-read it (its new mtime also makes it recent)
+            entry = self._entry_for_file(note_id)
+            if entry:
+                entries.append(entry)
+                changes['changed'].append(note_id)
+        changes['removed'] = sorted(set(known) - set(stamps))
+        for filename in sorted(set(stamps) - set(known)):
+            entry = self._entry_for_file(filename)
+            if entry:
+                entries.append(entry)
+                changes['added'].append(filename)
+
+        changed = changes['added'] or changes['removed'] or changes['changed']
+        if changed or force or not state:
+            # Rewrite the manifest oldest-first so its tail is always the newest notes
+            entries.sort(key=lambda entry: (entry['ts'], entry['id']))
+            fd, temp_path = tempfile.mkstemp(prefix=".manifest.", dir=self.index_dir)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+            os.replace(temp_path, self.manifest_path)
+        generation = state.get('generation', 0) + (1 if changed or not state else 0)
+        self._save_state({'dir_mtime_ns': dir_mtime, 'count': len(entries), 'generation': generation})
+        self._stamps = stamps
+
+        if changed:
+            logger.info(f"📝 Notes manifest reconciled (+{len(changes['added'])} -{len(changes['removed'])} "
+                        f"~{len(changes['changed'])})")
+        return changes
+
+    def _maybe_sweep(self) -> None:
+        """Start a background stat sweep for notes edited in place, if one is due (lock held)"""
+        now = time.monotonic()
+        if self._sweeping or (self._swept_at is not None and now - self._swept_at < EDIT_SWEEP_SECONDS):
+            return
+        self._sweeping = True
+        self._swept_at = now
+        threading.Thread(target=self._sweep, name="notes-sweep", daemon=True).start()
+
+    def _sweep(self) -> None:
+        try:
+            dir_mtime = self._dir_mtime()
+            stamps = self._scan()  # The slow part, done without holding the lock
+            if stamps == self._stamps:
+                return
+            with self._lock:
+                state = self._load_state()
+                # Notes were added or removed meanwhile: the next reconcile rescans anyway
+                if state.get('dir_mtime_ns') == dir_mtime:
+                    self._sync(stamps, state, dir_mtime)
+        except Exception as e:
+            logger.debug(f"Notes sweep failed: {e}")
+        finally:
+            self._swept_at = time.monotonic()
+            self._sweeping = False
+
+    def _refresh_edited(self, entries: List[Dict]) -> bool:
+        """Re-read the given notes if their files changed; True if any did (lock held)"""
+        edited = [entry['id'] for entry in entries if self._file_stamp(entry['id']) != note_stamp(entry)]
+        if not edited:
+            return False
+        for note_id in edited:
+            entry = self._entry_for_file(note_id)
+            if entry is None:
+                self.reconcile(force=True)  # Gone without the directory changing: rescan
+                return True
+            # Appended again: the newer copy wins, and its new mtime makes it the most recent
+            self._append(entry)
+            if self._stamps is not None:
+                self._stamps[note_id] = note_stamp(entry)
+        state = self._load_state()
+        state['generation'] = state.get('generation', 0) + 1
+        self._save_state(state)
+        return True
+
+    def add(self, content: str, title: str = "") -> Dict:
+        """Write a new note file and append it to the manifest"""
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            # Bring the manifest up to date first, so the state below stays truthful
+            self.reconcile()
+
+            now = datetime.datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            stem = f"{timestamp}_{title.replace(' ', '_')}" if title else f"{timestamp}_note"
+            filename = f"{stem}{NOTE_SUFFIX}"
+            suffix = 1
+            while os.path.exists(os.path.join(self.notes_dir, filename)):
+                suffix += 1
+                filename = f"{stem}_{suffix}{NOTE_SUFFIX}"
+
+            filepath = os.path.join(self.notes_dir, filename)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                if title:
+                    f.write(f"Title: {title}\n")
+                f.write(f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"\nContent:\n{content}\n")
+
+            stat = os.stat(filepath)
+            entry = {
+                'id': filename,
+                'title': title,
+                'ts': round(stat.st_mtime, 3),
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'preview': make_preview(content),
+            }
+            self._append(entry)
+            if self._stamps is not None:
+                self._stamps[filename] = note_stamp(entry)
+            state = self._load_state()
+            self._save_state({'dir_mtime_ns': self._dir_mtime(), 'count': state.get('count', 0) + 1,
+                              'generation': state.get('generation', 0) + 1})
+            return entry
+
+    def recent(self, count: int = 5) -> List[Dict]:
+        """Return the newest count manifest entries, newest first
+
+        Only the returned notes are stat'ed, so an edit to one of them shows
+        up right away at a cost that does not grow with the number of notes.
+        """
+        with self._lock:
+            self.reconcile()
+            entries = self._read_tail(max(0, count))
+            if self._refresh_edited(entries):
+                entries = self._read_tail(max(0, count))
+            return entries
+
+    def entries(self) -> List[Dict]:
+        """Return every manifest entry, oldest first"""
+        with self._lock:
+            self.reconcile()
+            return self._read_all()
+
+    def generation(self) -> int:
+        """Counter bumped whenever notes are added, removed or edited (after reconciling)"""
+        with self._lock:
+            self.reconcile()
+            return self._load_state().get('generation', 0)
+
+    def current_generation(self) -> Optional[int]:
+        """The generation, or None if the directory changed since the manifest was last synced
+
+        Costs a stat of the directory and of the state file and never
+        reconciles, so the search indexes can check it on every query.
+        """
+        with self._lock:
+            state = self._load_state()
+            if not state or state.get('dir_mtime_ns') != self._dir_mtime():
+                return None
+            self._maybe_sweep()
+            return state.get('generation', 0)
+
+    def path(self, note_id: str) -> str:
+        return os.path.join(self.notes_dir, note_id)
@@ -1,29 +1,71 @@
 import subprocess
 import os
+import time
 import logging
+import shutil
+import threading
 from pathlib import Path
+from typing import Callable, Optional
 from langchain.tools import tool
 from .app_discovery import ApplicationDiscovery
+from .launch_cache import LaunchStrategyCache
+from .app_usage import AppUsageStore
+from .app_index import is_own_name
+from .app_watcher import AppWatcher
+from .desktop_entries import exec_command
 
 logger = logging.getLogger(__name__)
 
+# A program started directly from a desktop entry's Exec line is the app itself:
+# if it is still running after this long, the launch succeeded
+EXEC_GRACE_SECONDS = 3
+
 class AppLauncher:
     def __init__(self):
         self.discovery = ApplicationDiscovery()
-        self.ensure_database_exists()
+        self.launch_cache = LaunchStrategyCache()
+        self.usage = AppUsageStore()
+        # The database is created on first use, not at import time
+        
+        # Launch without waiting for `open` to exit; failures are reported via callback
+        self.async_launch = os.getenv("JARVIS_ASYNC_LAUNCH", "1") != "0"
+        self.launch_failure_callback: Optional[Callable[[str], None]] = None
+        
+        # Keep the database current in the background once apps are first used
+        self.watch_apps = os.getenv("JARVIS_APP_WATCHER", "1") != "0"
+        self.watcher: Optional[AppWatcher] = None
+        self._database_checked = False
     
     def ensure_database_exists(self):
         """Ensure the application database exists, create if not"""
         if not self.discovery.app_database_path.exists():
             logger.info("📝 Application database not found, creating...")
             self.discovery.refresh_database()
+        elif not self._database_checked:
+            # A database scanned from other directories (e.g. on another OS) is rebuilt once
+            scanned_dirs = self.discovery.index.database().dirs
+            search_dirs = [os.path.expanduser(path) for path in self.discovery.search_paths]
+            if not any(directory in scanned_dirs for directory in search_dirs):
+                logger.info("📝 Application database is from another platform, rescanning...")
+                self.discovery.refresh_database()
+        self._database_checked = True
+        if self.watch_apps and self.watcher is None:
+            self.watcher = AppWatcher(self.discovery).start()
     
-    def open_application(self, app_name: str) -> str:
-        """Open an application with intelligent lookup"""
+    def open_application(self, app_name: str, wait: Optional[bool] = None) -> str:
+        """Open an application with intelligent lookup
+        
+        Unless wait is True (or async launching is disabled) the reply is
+        optimistic: the launch is confirmed in the background and failures
+        are reported through launch_failure_callback.
+        """
+        if wait is None:
+            wait = not self.async_launch
         logger.info(f"🚀 Attempting to open: {app_name}")
+        self.ensure_database_exists()
         
-        # Load the application database
-        database = self.discovery.load_database()
+        # Use the in-memory application index (reloaded only when the file changes)
+        database = self.discovery.index.database()
         
         if not database:
             logger.warning("⚠️ Empty database, refreshing...")
@@ -33,18 +75,28 @@ class AppLauncher:
         normalized_name = app_name.lower().strip()
         
         # Method 1: Direct lookup in database
-        if normalized_name in database:
-            app_info = database[normalized_name]
+        app_info = database.get(normalized_name)
+        if app_info and not is_own_name(app_info, normalized_name):
+            # Nicknames and keywords ("code", "music") can fit several apps: prefer the one in use
+            ranked = self.discovery.get_app_suggestions(normalized_name, max_suggestions=1, prior=self.usage.prior)
+            if ranked:
+                app_info = ranked[0]
+        if app_info and not wait and self._launch_async(app_info, app_name):
+            return f"✅ Opening {app_info['display_name'] or app_info['name']}."
+        if app_info:
             success = self._try_open_app_by_info(app_info)
             if success:
                 return f"✅ Successfully opened {app_info['display_name'] or app_info['name']}."
         
         # Method 2: Fuzzy search in database
-        suggestions = self.discovery.get_app_suggestions(normalized_name, max_suggestions=5)
+        suggestions = self.discovery.get_app_suggestions(normalized_name, max_suggestions=5,
+                                                         prior=self.usage.prior)
         
         if suggestions:
             # Try to open the best match
             best_match = suggestions[0]
+            if not wait and self._launch_async(best_match, app_name):
+                return f"✅ Opening {best_match['display_name'] or best_match['name']} (best match for '{app_name}')."
             success = self._try_open_app_by_info(best_match)
             
             if success:
@@ -62,60 +114,142 @@ class AppLauncher:
         # Method 4: Suggest database refresh and provide common apps
         return self._suggest_alternatives(app_name, database)
     
-    def _try_open_app_by_info(self, app_info: dict) -> bool:
-        """Try to open an app using the information from the database"""
-        app_name = app_info['name']
-        app_path = app_info['path']
-        bundle_id = app_info['bundle_id']
+    def _launch_commands(self, app_info: dict) -> dict:
+        """Build the candidate launch commands for an app, keyed by strategy name"""
+        commands = {}
+        
+        if self.discovery.platform == "xdg":
+            # Linux: launch the desktop entry by id, or run its Exec line directly
+            if app_info.get('bundle_id') and shutil.which("gtk-launch"):
+                commands['bundle_id'] = ["gtk-launch", app_info['bundle_id']]
+            if app_info.get('exec'):
+                commands['exec'] = exec_command(app_info['exec'])
+            return commands
         
         # Method 1: Try by exact path
-        if os.path.exists(app_path):
-            try:
-                result = subprocess.run(
-                    ["open", app_path], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    logger.info(f"✅ Opened {app_name} by path")
-                    return True
-            except Exception as e:
-                logger.debug(f"Failed to open by path: {e}")
+        if os.path.exists(app_info['path']):
+            commands['path'] = ["open", app_info['path']]
         
         # Method 2: Try by bundle ID
-        if bundle_id:
-            try:
-                result = subprocess.run(
-                    ["open", "-b", bundle_id],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    logger.info(f"✅ Opened {app_name} by bundle ID")
-                    return True
-            except Exception as e:
-                logger.debug(f"Failed to open by bundle ID: {e}")
+        if app_info.get('bundle_id'):
+            commands['bundle_id'] = ["open", "-b", app_info['bundle_id']]
         
         # Method 3: Try by name
+        commands['name'] = ["open", "-a", app_info['name']]
+        return commands
+    
+    def _spawn(self, strategy: str, command: list) -> Optional[subprocess.Popen]:
+        """Start a launch command without waiting for it"""
         try:
-            result = subprocess.run(
-                ["open", "-a", app_name], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
+            return subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
             )
-            if result.returncode == 0:
-                logger.info(f"✅ Opened {app_name} by name")
-                return True
         except Exception as e:
-            logger.debug(f"Failed to open by name: {e}")
+            logger.debug(f"Failed to spawn launcher by {strategy}: {e}")
+            return None
+    
+    def _launched(self, strategy: str, process: Optional[subprocess.Popen]) -> bool:
+        """Wait for a spawned launch command and report whether the app started"""
+        if process is None:
+            return False
+        if strategy == 'exec':
+            try:
+                return process.wait(timeout=EXEC_GRACE_SECONDS) == 0
+            except subprocess.TimeoutExpired:
+                return True  # Still running: the app is up
+        try:
+            return process.wait(timeout=10) == 0
+        except subprocess.TimeoutExpired:
+            process.kill()
+            return False
+    
+    def _run_strategy(self, app_info: dict, strategy: str, command: list) -> bool:
+        """Run one launch command to completion and record the outcome"""
+        started = time.perf_counter()
+        ok = self._launched(strategy, self._spawn(strategy, command))
+        self._record_launch(app_info, strategy, ok, started)
+        return ok
+    
+    def _record_launch(self, app_info: dict, strategy: str, ok: bool, started: float) -> None:
+        """Remember how a launch attempt went (strategy latency, and usage on success)"""
+        self.launch_cache.record(app_info, strategy, ok, (time.perf_counter() - started) * 1000)
+        if ok:
+            self.usage.record(app_info.get('id') or app_info['path'])
+            logger.info(f"✅ Opened {app_info['name']} by {strategy}")
+    
+    def _try_open_app_by_info(self, app_info: dict) -> bool:
+        """Try to open an app, starting with the strategy that worked last time"""
+        commands = self._launch_commands(app_info)
+        
+        for strategy in self.launch_cache.order(app_info, list(commands)):
+            if self._run_strategy(app_info, strategy, commands[strategy]):
+                return True
         
         return False
     
+    def _launch_async(self, app_info: dict, query: str) -> bool:
+        """Spawn the preferred launch command and confirm it in the background
+        
+        Returns False if there is no strategy left to try, so the caller can
+        fall back to the blocking path.
+        """
+        commands = self._launch_commands(app_info)
+        order = self.launch_cache.order(app_info, list(commands))
+        if not order:
+            return False
+        
+        strategy = order[0]
+        started = time.perf_counter()
+        process = self._spawn(strategy, commands[strategy])
+        
+        threading.Thread(
+            target=self._confirm_launch,
+            args=(app_info, query, commands, order, process, started),
+            name="app-launch",
+            daemon=True
+        ).start()
+        return True
+    
+    def _confirm_launch(self, app_info: dict, query: str, commands: dict, order: list,
+                        process: Optional[subprocess.Popen], started: float) -> None:
+        """Wait for the spawned launcher; on failure try the remaining strategies, then report"""
+        strategy = order[0]
+        ok = self._launched(strategy, process)
+        self._record_launch(app_info, strategy, ok, started)
+        if ok:
+            return
+        
+        for strategy in order[1:]:
+            if self._run_strategy(app_info, strategy, commands[strategy]):
+                return
+        
+        display_name = app_info['display_name'] or app_info['name']
+        alternatives = [app['display_name'] or app['name']
+                        for app in self.discovery.get_app_suggestions(query, max_suggestions=4,
+                                                                      prior=self.usage.prior)
+                        if app['id'] != app_info.get('id')][:3]
+        message = f"❌ Sorry, {display_name} didn't open."
+        if alternatives:
+            message += f" Try these alternatives: {', '.join(alternatives)}"
+        self._notify_launch_failure(message)
+    
+    def _notify_launch_failure(self, message: str) -> None:
+        """Send a follow-up correction for a launch that failed in the background"""
+        logger.warning(message)
+        if self.launch_failure_callback:
+            try:
+                self.launch_failure_callback(message)
+            except Exception as e:
+                logger.error(f"❌ Launch failure callback error: {e}")
+    
     def _legacy_app_search(self, app_name: str) -> str:
         """Fallback to manual search for apps not in database"""
+        if self.discovery.platform != "macos":
+            return None
+        
         found_apps = self._search_installed_apps(app_name.lower())
         
         if found_apps:
@@ -159,13 +293,19 @@ class AppLauncher:
         except:
             return False
     
-    def _suggest_alternatives(self, app_name: str, database: dict) -> str:
+    def _suggest_alternatives(self, app_name: str, database) -> str:
         """Suggest alternatives when app is not found"""
         common_apps = []
         
-        # Get some popular apps from each category
+        # The apps this user launches most come first
+        for app_id in self.usage.most_used(5):
+            app_info = database.apps.get(app_id)
+            if app_info:
+                common_apps.append(app_info.get('display_name') or app_info['name'])
+        
+        # Then some popular apps from each category
         categories = ['Browsers', 'Development', 'Communication', 'Media', 'Productivity']
-        for app_key, app_info in database.items():
+        for app_info in self.discovery.index.unique_apps():
             if app_info.get('category') in categories:
                 display_name = app_info.get('display_name') or app_info['name']
                 if display_name not in common_apps and len(common_apps) < 10:
@@ -180,49 +320,26 @@ class AppLauncher:
         
         return suggestion_text
 
-    def list_apps_by_category(self) -> str:
-        """List available applications organized by category"""
-        database = self.discovery.load_database()
+    def list_apps_by_category(self, category: str = "", page: int = 1, detailed: bool = False) -> str:
+        """List available applications organized by category
         
-        if not database:
+        By default returns a short spoken summary (counts per category);
+        detailed=True gives the on-screen overview, and a category gives
+        one page of that category's apps.
+        """
+        self.ensure_database_exists()
+        listing = self.discovery.index.listing()
+        
+        if not listing.total:
             return "❌ No application database found. Say 'refresh app database' to create one."
         
-        # Organize apps by category
-        categorized_apps = {}
-        unique_apps = set()  # To avoid duplicates
+        if category:
+            found = listing.find_category(category)
+            if not found:
+                return f"❌ No '{category}' category. Categories: {', '.join(listing.categories)}."
+            return listing.category_page(found, page)
         
-        for app_key, app_info in database.items():
-            app_name = app_info.get('display_name') or app_info['name']
-            category = app_info.get('category', 'Other')
-            
-            # Skip duplicates (same app with different aliases)
-            if app_name not in unique_apps:
-                unique_apps.add(app_name)
-                if category not in categorized_apps:
-                    categorized_apps[category] = []
-                categorized_apps[category].append(app_name)
-        
-        # Sort apps within each category
-        for category in categorized_apps:
-            categorized_apps[category].sort()
-        
-        # Build the response
-        result = f"📱 Available Applications ({len(unique_apps)} total):\n\n"
-        
-        # Define category order for better presentation
-        category_order = ['System', 'Browsers', 'Development', 'Communication', 'Media', 
-                         'Productivity', 'Gaming', 'Utilities', 'Other']
-        
-        for category in category_order:
-            if category in categorized_apps:
-                apps = categorized_apps[category]
-                result += f"📂 **{category}** ({len(apps)}): {', '.join(apps[:8])}"
-                if len(apps) > 8:
-                    result += f" ... and {len(apps) - 8} more"
-                result += "\n\n"
-        
-        result += "💡 Just say 'open [app name]' to launch any application!"
-        return result
+        return listing.overview() if detailed else listing.spoken_summary()
     
     def refresh_app_database(self) -> str:
         """Refresh the application database"""
@@ -230,12 +347,10 @@ class AppLauncher:
             logger.info("🔄 Refreshing application database...")
             applications = self.discovery.refresh_database()
             
-            # Count unique apps
-            unique_apps = set()
-            for app_info in applications.values():
-                unique_apps.add(app_info['name'])
+            stats = self.discovery.last_refresh_stats
             
-            return f"✅ Application database refreshed! Found {len(unique_apps)} applications with {len(applications)} total entries (including aliases)."
+            return (f"✅ Application database refreshed! Found {len(applications)} applications with {len(applications.aliases)} total entries (including aliases). "
+                    f"{stats['added']} added, {stats['changed']} changed, {stats['removed']} removed.")
             
         except Exception as e:
             logger.error(f"❌ Error refreshing database: {e}")
@@ -244,15 +359,19 @@ class AppLauncher:
 # Initialize the app launcher
 app_launcher = AppLauncher()
 
+def set_launch_failure_callback(callback: Optional[Callable[[str], None]]) -> None:
+    """Register a function that receives follow-up messages for launches that failed in the background"""
+    app_launcher.launch_failure_callback = callback
+
 @tool
 def open_app(app_name: str) -> str:
     """Open a macOS application by name. I know about all apps installed on this Mac and can open them by name, nickname, or partial name. Examples: Safari, Chrome, Calculator, VS Code, Discord, Spotify, etc."""
     return app_launcher.open_application(app_name)
 
 @tool
-def list_available_apps() -> str:
-    """List all applications available on this Mac, organized by category. Shows browsers, development tools, communication apps, media players, productivity apps, etc."""
-    return app_launcher.list_apps_by_category()
+def list_available_apps(category: str = "", page: int = 1, detailed: bool = False) -> str:
+    """List applications available on this computer, organized by category. With no arguments returns a short summary of how many apps are in each category (browsers, development tools, communication apps, media players, productivity apps, etc.). Pass a category such as 'browsers' to list that category's apps (use page for long categories), or detailed=True for an on-screen overview of every category."""
+    return app_launcher.list_apps_by_category(category, page, detailed)
 
 @tool
 def refresh_app_database() -> str:
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Phonetic Matching Module for Jarvis
+Metaphone-style codes for recovering speech-misrecognized names such as
+"fire fox" (Firefox), "note ion" (Notion) or "what's app" (WhatsApp)
+"""
+
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+try:
+    from .fuzzy_index import TrigramIndex, normalize_name, edit_similarity
+except ImportError:  # Running as a script from the tools directory
+    from fuzzy_index import TrigramIndex, normalize_name, edit_similarity
+
+VOWELS = set("aeiou")
+FRONT_VOWELS = set("eiy")
+
+def compact_name(text: str) -> str:
+    """Normalize word boundaries: "What's App" and "whatsapp" both become "whatsapp\""""
+    return normalize_name(text.replace("'", "").replace("’", "")).replace(" ", "")
+
+def metaphone(word: str) -> str:
+    """Simplified Metaphone code of a single lowercase word (letters only)"""
+    word = "".join(char for char in word.lower() if char.isalpha())
+    if not word:
+        return ""
+
+    # Initial letter exceptions
+    if word[:2] in ("kn", "gn", "pn", "ae", "wr"):
+        word = word[1:]
+    elif word[0] == "x":
+        word = "s" + word[1:]
+    elif word[:2] == "wh":
+        word = "w" + word[2:]
+
+    code = []
+    length = len(word)
+    for i, char in enumerate(word):
+        prev = word[i - 1] if i > 0 else ""
+        nxt = word[i + 1] if i + 1 < length else ""
+        nxt2 = word[i + 2] if i + 2 < length else ""
+
+        # Skip doubled letters except C
+        if char == prev and char != "c":
+            continue
+
+        if char in VOWELS:
+            if i == 0:
+                code.append(char.upper())
+        elif char == "b":
+            if not (prev == "m" and i == length - 1):
+                code.append("B")
+        elif char == "c":
+            if nxt == "i" and nxt2 == "a":
+                code.append("X")
+            elif nxt == "h":
+                code.append("K" if prev == "s" else "X")
+            elif nxt in FRONT_VOWELS:
+                if prev != "s":
+                    code.append("S")
+            else:
+                code.append("K")
+        elif char == "d":
+            code.append("J" if nxt == "g" and nxt2 in FRONT_VOWELS else "T")
+        elif char == "g":
+            if nxt == "h" and nxt2 and nxt2 not in VOWELS:
+                continue
+            if nxt == "n" and (i + 2 == length or word[i + 2:] == "ed"):
+                continue
+            if prev == "d" and nxt in FRONT_VOWELS:
+                continue
+            code.append("J" if nxt in FRONT_VOWELS else "K")
+        elif char == "h":
+            if prev in "csptg":
+                continue
+            if prev in VOWELS and nxt not in VOWELS:
+                continue
+            code.append("H")
+        elif char == "k":
+            if prev != "c":
+                code.append("K")
+        elif char == "p":
+            code.append("F" if nxt == "h" else "P")
+        elif char == "q":
+            code.append("K")
+        elif char == "s":
+            if nxt == "h" or (nxt == "i" and nxt2 in ("o", "a")):
+                code.append("X")
+            else:
+                code.append("S")
+        elif char == "t":
+            if nxt == "i" and nxt2 in ("o", "a"):
+                code.append("X")
+            elif nxt == "h":
+                code.append("0")
+            elif not (nxt == "c" and nxt2 == "h"):
+                code.append("T")
+        elif char == "v":
+            code.append("F")
+        elif char == "w":
+            if nxt in VOWELS:
+                code.append("W")
+        elif char == "x":
+            code.append("KS")
+        elif char == "y":
+            if nxt in VOWELS:
+                code.append("Y")
+        elif char == "z":
+            code.append("S")
+        else:
+            code.append(char.upper())
+
+    # Collapse codes repeated across the letters we kept (e.g. "ck", "dt")
+    collapsed = []
+    for symbol in "".join(code):
+        if not collapsed or collapsed[-1] != symbol:
+            collapsed.append(symbol)
+    return "".join(collapsed)
+
+def phonetic_key(text: str) -> str:
+    """Phonetic code of a whole name, with word boundaries removed first"""
+    return metaphone(compact_name(text))
+
+
+class PhoneticIndex:
+    """Second-tier name lookup combining phonetic and orthographic similarity"""
+
+    def __init__(self, phonetic_weight: float = 0.6):
+        self.phonetic_weight = phonetic_weight
+        # Phonetic codes are short, so bigrams give better recall than trigrams
+        self._index = TrigramIndex(n=2, rerank_pool=40, encode=phonetic_key)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, name: str, value: Hashable) -> None:
+        self._index.add(name, value)
+
+    def remove(self, name: str) -> None:
+        self._index.remove(name)
+
+    def sync(self, mapping: Dict[str, Hashable]) -> Dict[str, int]:
+        """Incrementally update the index to match a name → value mapping"""
+        return self._index.sync(mapping)
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.6) -> List[Tuple[Hashable, float, str]]:
+        """Return up to k (value, score, matched name) tuples, best first, one per value"""
+        query_compact = compact_name(query)
+        if not query_compact:
+            return []
+
+        best: Dict[Hashable, Tuple[float, str]] = {}
+        for value, phonetic_score, name in self._index.search(query, k=k * 4, min_score=0.0):
+            orthographic_score = edit_similarity(query_compact, compact_name(name))
+            score = self.phonetic_weight * phonetic_score + (1 - self.phonetic_weight) * orthographic_score
+            if score >= min_score and (value not in best or score > best[value][0]):
+                best[value] = (score, name)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], len(item[1][1]), item[1][1]))
+        return [(value, round(score, 4), name) for value, (score, name) in ranked[:k]]
+
+
+def match_name(query: str, names: Iterable[str], min_score: float = 0.6) -> str:
+    """Best phonetic match for a query among a few names, or "" if none is close enough"""
+    index = PhoneticIndex()
+    for name in names:
+        index.add(name, name)
+    results = index.search(query, k=1, min_score=min_score)
+    return results[0][0] if results else ""
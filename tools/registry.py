@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tool Registry for Jarvis
+Gives the agent every tool's name, description and arguments without
+importing the module behind it: the schemas are read from the tool modules'
+source, and a module (with its OCR, screen capture, SMTP or app-scanning
+dependencies) is imported the first time one of its tools is called, or
+earlier by an optional background preload
+"""
+
+import os
+import ast
+import time
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from langchain_core.tools import StructuredTool
+from pydantic import create_model
+
+logger = logging.getLogger(__name__)
+
+# (module, function) for each agent tool, in the order the agent sees them
+AGENT_TOOLS: List[Tuple[str, str]] = [
+    ("tools.arp_scan", "arp_scan_terminal"),
+    ("tools.web_search", "web_search"),
+    ("tools.matrix", "matrix_mode"),
+    ("tools.screenshot", "take_screenshot"),
+    ("tools.OCR", "read_text_from_latest_image"),
+    ("tools.open_app", "open_app"),
+    ("tools.open_app", "list_available_apps"),
+    ("tools.open_app", "refresh_app_database"),
+    ("tools.notes", "take_note"),
+    ("tools.notes", "read_recent_notes"),
+    ("tools.notes", "search_notes"),
+    ("tools.youtube", "youtube_search"),
+    ("tools.youtube", "play_youtube_video"),
+    ("tools.email_tool", "send_email"),
+    ("tools.email_tool", "send_email_to_contact"),
+    ("tools.email_tool", "send_email_to_contacts"),
+    ("tools.email_tool", "email_queue_status"),
+    ("tools.email_tool", "get_email_setup_instructions"),
+    ("tools.facetime_tool", "call_contact"),
+    ("tools.facetime_tool", "make_phone_call"),
+    ("tools.facetime_tool", "check_facetime_status"),
+]
+
+# Preloaded first: modules whose first use should not wait (the email hooks in main.py and
+# jarvis_gui.py also resume mail queued in an earlier session)
+PRELOAD_FIRST = ["tools.email_tool", "tools.open_app", "tools.notes", "tools.facetime_tool"]
+
+_ANNOTATION_TYPES = {'str': str, 'int': int, 'float': float, 'bool': bool}
+
+def _literal(node: ast.AST) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+def read_tool_specs(module: str) -> Dict[str, Dict]:
+    """Schemas of a module's @tool functions, parsed from its source (the module is not imported)
+
+    Returns function name → {name, description, return_direct, args}, where
+    args is a list of (argument, type, default) with ... for required ones.
+    """
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        *module.split('.')) + '.py'
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    specs = {}
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        for decorator in node.decorator_list:
+            call = decorator if isinstance(decorator, ast.Call) else None
+            target = call.func if call else decorator
+            if not (isinstance(target, ast.Name) and target.id == 'tool'):
+                continue
+            name = _literal(call.args[0]) if call and call.args else node.name
+            keywords = {keyword.arg: _literal(keyword.value) for keyword in (call.keywords if call else [])}
+
+            positional = node.args.args
+            defaults = [...] * (len(positional) - len(node.args.defaults)) + [
+                _literal(default) for default in node.args.defaults]
+            args = []
+            for argument, default in zip(positional, defaults):
+                annotation = argument.annotation.id if isinstance(argument.annotation, ast.Name) else ''
+                args.append((argument.arg, _ANNOTATION_TYPES.get(annotation, Any), default))
+
+            specs[node.name] = {
+                'name': name,
+                'description': ast.get_docstring(node) or "",
+                'return_direct': bool(keywords.get('return_direct', False)),
+                'args': args,
+            }
+    return specs
+
+
+class ToolRegistry:
+    """Lazily imported tool modules behind lightweight tool proxies"""
+
+    def __init__(self, tools: Optional[List[Tuple[str, str]]] = None):
+        self.tools = tools or AGENT_TOOLS
+        self._lock = threading.RLock()
+        self._modules: Dict[str, Any] = {}
+        self._hooks: Dict[str, List[Callable]] = {}
+        self._preload_thread: Optional[threading.Thread] = None
+        self.load_ms: Dict[str, float] = {}
+
+    # ----- modules -----
+
+    def loaded(self, module: str) -> bool:
+        return module in self._modules
+
+    def load(self, module: str) -> Any:
+        """Import a tool module (once) and run its when_loaded hooks"""
+        if module in self._modules:
+            return self._modules[module]
+        with self._lock:
+            if module in self._modules:
+                return self._modules[module]
+            started = time.perf_counter()
+            loaded = importlib.import_module(module)
+            self.load_ms[module] = round((time.perf_counter() - started) * 1000, 1)
+            self._modules[module] = loaded
+            hooks = self._hooks.pop(module, [])
+        logger.debug(f"🧰 Loaded {module} in {self.load_ms[module]} ms")
+        for hook in hooks:
+            self._run_hook(hook, loaded)
+        return loaded
+
+    def when_loaded(self, module: str, hook: Callable[[Any], None]) -> None:
+        """Call hook(module) once the module is imported: now if it already is, else on first use"""
+        with self._lock:
+            loaded = self._modules.get(module)
+            if loaded is None:
+                self._hooks.setdefault(module, []).append(hook)
+                return
+        self._run_hook(hook, loaded)
+
+    @staticmethod
+    def _run_hook(hook: Callable, module: Any) -> None:
+        try:
+            hook(module)
+        except Exception as e:
+            logger.warning(f"⚠️ Tool load hook for {module.__name__} failed: {e}")
+
+    def preload(self, modules: Optional[List[str]] = None) -> Optional[threading.Thread]:
+        """Import tool modules on a background thread so first calls are fast (idempotent)"""
+        if os.getenv("JARVIS_PRELOAD_TOOLS", "1") == "0":
+            return None
+        if modules is None:
+            modules = list(dict.fromkeys(PRELOAD_FIRST + [module for module, _ in self.tools]))
+
+        def run():
+            for module in modules:
+                try:
+                    self.load(module)
+                except Exception as e:
+                    # Reported again (to the agent) if the tool is actually called
+                    logger.warning(f"⚠️ Could not preload {module}: {e}")
+
+        with self._lock:
+            if self._preload_thread is None:
+                self._preload_thread = threading.Thread(target=run, name="tool-preload", daemon=True)
+                self._preload_thread.start()
+        return self._preload_thread
+
+    # ----- tools -----
+
+    def _proxy(self, module: str, function: str, spec: Dict) -> StructuredTool:
+        def run(**kwargs) -> str:
+            try:
+                implementation = getattr(self.load(module), function)
+            except Exception as e:
+                logger.error(f"❌ Could not load {module}: {e}")
+                return f"The {spec['name']} tool is unavailable: {e}"
+            return implementation.invoke(kwargs)
+
+        fields = {argument: (annotation, default) for argument, annotation, default in spec['args']}
+        return StructuredTool(
+            name=spec['name'],
+            description=spec['description'],
+            args_schema=create_model(spec['name'], **fields),
+            func=run,
+            return_direct=spec['return_direct'],
+        )
+
+    def agent_tools(self) -> List[StructuredTool]:
+        """Tool objects for the agent, in order; no tool module is imported"""
+        specs: Dict[str, Dict[str, Dict]] = {}
+        tools = []
+        for module, function in self.tools:
+            if module not in specs:
+                specs[module] = read_tool_specs(module)
+            tools.append(self._proxy(module, function, specs[module][function]))
+        return tools
+
+
+_registry: Optional[ToolRegistry] = None
+
+def get_tool_registry() -> ToolRegistry:
+    """The shared registry of the agent's tools"""
+    global _registry
+    if _registry is None:
+        _registry = ToolRegistry()
+    return _registry
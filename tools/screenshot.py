@@ -3,6 +3,12 @@ import os
 import mss
 import mss.tools
 
+SCREENSHOT_PATH = os.path.expanduser("~/path/to/example.png")
+
+def latest_screenshot() -> str:
+    """Path of the most recent screenshot, or "" if none has been taken"""
+    return SCREENSHOT_PATH if os.path.isfile(SCREENSHOT_PATH) else ""
+
 @tool("capture_screenshot", return_direct=True)
 def take_screenshot() -> str:
     """
@@ -14,7 +20,7 @@ def take_screenshot() -> str:
     - "Save a screenshot"
     """
     try:
-        image_path = os.path.expanduser("~/path/to/example.png")
+        image_path = SCREENSHOT_PATH
         os.makedirs(os.path.dirname(image_path), exist_ok=True)
 
         with mss.mss() as sct:
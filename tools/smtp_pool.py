@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+SMTP Session Pool for Jarvis
+Keeps authenticated SMTP sessions open between sends, health-checks them
+with NOOP after a pause, closes them after an idle timeout, and reconnects
+(and logs in again) when the server has dropped a session; attachments are
+streamed into the DATA phase rather than flattened into one string
+"""
+
+import io
+import os
+import ssl
+import time
+import smtplib
+import threading
+from email.message import Message
+from email.generator import BytesGenerator
+from email.utils import getaddresses
+from typing import Dict, List, Optional
+import logging
+
+try:
+    from .email_mime import StreamingMessage
+except ImportError:  # Running as a script from the tools directory
+    from email_mime import StreamingMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SMTP_SERVER = "smtp.gmail.com"
+DEFAULT_SMTP_PORT = 587
+
+# Sessions unused for longer than this are closed (servers drop them anyway)
+IDLE_TIMEOUT_SECONDS = float(os.getenv("SMTP_IDLE_TIMEOUT", "120"))
+
+# A session idle for longer than this gets a NOOP before it is reused
+HEALTH_CHECK_AFTER_SECONDS = 10.0
+
+# Reply code a server sends when it is closing the connection
+SERVICE_CLOSING = 421
+
+# Streamed message data is written in blocks of about this size
+DATA_WRITE_BYTES = 64 * 1024
+
+
+class SMTPSession:
+    """One connected, authenticated SMTP connection"""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+    def healthy(self) -> bool:
+        """NOOP round trip; False if the server no longer answers"""
+        try:
+            return self.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+class SMTPPool:
+    """Reusable SMTP sessions for one server and account"""
+
+    def __init__(self, host: str, port: int, username: str, password: str,
+                 starttls: bool = True, max_idle: int = 2, timeout: float = 30,
+                 idle_timeout: float = IDLE_TIMEOUT_SECONDS,
+                 health_check_after: float = HEALTH_CHECK_AFTER_SECONDS):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = port == 465  # Implicit TLS; everything else upgrades with STARTTLS
+        self.starttls = starttls and not self.use_ssl
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+
+        self._idle: List[SMTPSession] = []
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Timer] = None
+
+        self.stats = {'connects': 0, 'reuses': 0, 'reconnects': 0, 'health_checks': 0}
+        self.last_timing: Dict = {}
+
+    @classmethod
+    def from_env(cls) -> "SMTPPool":
+        """Pool configured from SMTP_SERVER, SMTP_PORT, SMTP_STARTTLS, EMAIL_ADDRESS and EMAIL_PASSWORD"""
+        return cls(
+            host=os.getenv("SMTP_SERVER", DEFAULT_SMTP_SERVER),
+            port=int(os.getenv("SMTP_PORT", DEFAULT_SMTP_PORT)),
+            username=os.getenv("EMAIL_ADDRESS", ""),
+            password=os.getenv("EMAIL_PASSWORD", ""),
+            starttls=os.getenv("SMTP_STARTTLS", "1") != "0",
+        )
+
+    def config_key(self) -> tuple:
+        return (self.host, self.port, self.username, self.password, self.starttls)
+
+    # ----- sessions -----
+
+    def _connect(self) -> SMTPSession:
+        """Open, secure and authenticate a new session"""
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        self.stats['connects'] += 1
+        return SMTPSession(smtp)
+
+    def acquire(self) -> tuple:
+        """Return (session, handshake_ms, reused), preferring a live idle session"""
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                break
+            idle = session.idle_seconds()
+            if idle > self.idle_timeout:
+                session.close()
+                continue
+            if idle > self.health_check_after:
+                self.stats['health_checks'] += 1
+                if not session.healthy():
+                    logger.debug("📧 Dropping SMTP session that failed NOOP")
+                    session.smtp.close()
+                    continue
+            self.stats['reuses'] += 1
+            return session, 0.0, True
+
+        started = time.perf_counter()
+        session = self._connect()
+        return session, (time.perf_counter() - started) * 1000, False
+
+    def release(self, session: SMTPSession) -> None:
+        """Return a healthy session to the pool"""
+        session.last_used = time.monotonic()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(session)
+                session = None
+            self._schedule_reaper()
+        if session is not None:
+            session.close()
+
+    def discard(self, session: SMTPSession) -> None:
+        """Close a session that is broken or mid-way through a failed transaction"""
+        try:
+            session.smtp.close()
+        except OSError:
+            pass
+
+    def _schedule_reaper(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+        self._reaper = threading.Timer(self.idle_timeout + 1, self._reap)
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        """Close sessions that went idle past the timeout"""
+        with self._lock:
+            stale = [session for session in self._idle if session.idle_seconds() > self.idle_timeout]
+            self._idle = [session for session in self._idle if session not in stale]
+        for session in stale:
+            session.close()
+        if stale:
+            logger.debug(f"📧 Closed {len(stale)} idle SMTP session(s)")
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._idle = self._idle, []
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        for session in sessions:
+            session.close()
+
+    # ----- sending -----
+
+    @staticmethod
+    def _transaction(smtp: smtplib.SMTP, msg: Message, from_addr: str, to_addrs: List[str]) -> Dict:
+        """One mail transaction; returns the recipients the server refused
+
+        With PIPELINING, MAIL FROM and every RCPT TO go out in a single write
+        and their replies are read together: one round trip for any number of
+        recipients instead of one each.
+        """
+        refused = {}
+        if smtp.has_extn('pipelining'):
+            commands = [f"MAIL FROM:{smtplib.quoteaddr(from_addr)}\r\n"]
+            commands += [f"RCPT TO:{smtplib.quoteaddr(address)}\r\n" for address in to_addrs]
+            smtp.send("".join(commands))
+            code, reply = smtp.getreply()
+            for address in to_addrs:
+                rcpt_code, rcpt_reply = smtp.getreply()
+                if rcpt_code not in (250, 251):
+                    refused[address] = (rcpt_code, rcpt_reply)
+        else:
+            code, reply = smtp.mail(from_addr)
+            if code == 250:
+                for address in to_addrs:
+                    rcpt_code, rcpt_reply = smtp.rcpt(address)
+                    if rcpt_code not in (250, 251):
+                        refused[address] = (rcpt_code, rcpt_reply)
+        if code != 250:
+            smtp.rset()
+            raise smtplib.SMTPSenderRefused(code, reply, from_addr)
+        if len(refused) == len(to_addrs):
+            smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        try:
+            if isinstance(msg, StreamingMessage):
+                code, reply = SMTPPool._stream_data(smtp, msg)
+            else:
+                # Same flattening as SMTP.send_message: CRLF line endings, no Bcc header
+                del msg['Bcc']
+                with io.BytesIO() as flattened:
+                    BytesGenerator(flattened, policy=msg.policy.clone(linesep='\r\n')).flatten(msg)
+                    code, reply = smtp.data(flattened.getvalue())
+        except smtplib.SMTPDataError:
+            # DATA itself was refused (no 354): end the open MAIL/RCPT transaction
+            # before the session goes back to the pool
+            smtp.rset()
+            raise
+        if code != 250:
+            smtp.rset()
+            raise smtplib.SMTPDataError(code, reply)
+        return refused
+
+    @staticmethod
+    def _stream_data(smtp: smtplib.SMTP, msg: StreamingMessage) -> tuple:
+        """DATA phase written chunk by chunk as the message is encoded, instead of as one string"""
+        code, reply = smtp.docmd("data")
+        if code != 354:
+            raise smtplib.SMTPDataError(code, reply)
+        # Coalesced into large writes: small ones (headers, the final ".") would stall on Nagle/delayed ACK
+        pending = bytearray()
+        for chunk in msg.iter_data():
+            pending += chunk
+            if len(pending) >= DATA_WRITE_BYTES:
+                smtp.send(pending)
+                pending.clear()
+        pending += b".\r\n"
+        smtp.send(pending)
+        return smtp.getreply()
+
+    def _retry(self, session: SMTPSession, reused: bool, error: Exception) -> bool:
+        """Drop a dead session; True if the send should be retried on a new one"""
+        self.discard(session)
+        if not reused:
+            return False  # A fresh session failing is a real error, not a stale connection
+        self.stats['reconnects'] += 1
+        logger.info(f"📧 SMTP session dropped ({error}); reconnecting")
+        return True
+
+    def send(self, msg: Message, to_addrs: Optional[List[str]] = None) -> Dict:
+        """Send msg over a pooled session; returns handshake/send timings in ms
+        and the recipients the server refused (when it accepted at least one)
+
+        A reused session the server has silently dropped is replaced (with a
+        fresh login) and the send retried.
+        """
+        from_addr = msg.get('From') or self.username
+        if to_addrs is None:
+            to_addrs = [address for _, address in getaddresses(msg.get_all('To', []) + msg.get_all('Cc', []) +
+                                                               msg.get_all('Bcc', []))]
+        while True:
+            session, handshake_ms, reused = self.acquire()
+            started = time.perf_counter()
+            try:
+                refused = self._transaction(session.smtp, msg, from_addr, to_addrs)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                if getattr(e, 'smtp_code', None) != SERVICE_CLOSING:
+                    self.release(session)  # Message refused; the session itself is fine
+                    raise
+                if not self._retry(session, reused, e):
+                    raise
+                continue
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError) as e:
+                if not self._retry(session, reused, e):
+                    raise
+                continue
+            except BaseException:
+                self.discard(session)
+                raise
+            self.release(session)
+            self.last_timing = {
+                'handshake_ms': round(handshake_ms, 2),
+                'send_ms': round((time.perf_counter() - started) * 1000, 2),
+                'reused': reused,
+                'refused': refused,
+            }
+            logger.info(f"📧 Sent via {self.host}:{self.port} (handshake {self.last_timing['handshake_ms']} ms, "
+                        f"send {self.last_timing['send_ms']} ms, {'reused' if reused else 'new'} session)")
+            return self.last_timing
+
+
+_pool: Optional[SMTPPool] = None
+_pool_lock = threading.Lock()
+
+def get_smtp_pool() -> SMTPPool:
+    """The shared pool, recreated if the SMTP settings in the environment changed"""
+    global _pool
+    with _pool_lock:
+        configured = SMTPPool.from_env()
+        if _pool is None or _pool.config_key() != configured.config_key():
+            if _pool is not None:
+                _pool.close()
+            _pool = configured
+        return _pool
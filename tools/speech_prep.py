@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Speech Preparation Module for Jarvis
+Compacts agent output for text-to-speech and routes it to a TTS backend
+based on its length and the latency budget
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+# Maximum number of characters spoken for a single reply
+MAX_SPOKEN_CHARS = int(os.getenv("JARVIS_SPEECH_MAX_CHARS", "400"))
+
+# Time we are willing to wait for synthesis before audio starts playing
+LATENCY_BUDGET_MS = float(os.getenv("JARVIS_SPEECH_LATENCY_BUDGET_MS", "2500"))
+
+DETAILS_ON_SCREEN = "The full details are on screen."
+
+# Spoken in place of a URL, so the sentence around it still reads naturally
+LINK_PLACEHOLDER = "a link"
+LINKS_PLACEHOLDER = "several links"
+
+_CODE_BLOCK_RE = re.compile(r"```.*?```", re.DOTALL)
+_MARKDOWN_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+# Stops before a closing bracket and before trailing punctuation, which belong to the sentence
+_URL = r"(?:https?://|www\.)[^\s)\]]*[^\s)\].,;:!?'\"]"
+_URL_RE = re.compile(_URL, re.IGNORECASE)
+# Consecutive URLs ("https://a.com, https://b.com and www.c.org") are spoken once
+_URL_RUN_RE = re.compile(rf"{_URL}(?:(?:\s*[,;]\s*|\s+)(?:and\s+)?{_URL})*", re.IGNORECASE)
+_EMPTY_PARENS_RE = re.compile(r"\(\s*\)|\[\s*\]")
+_INLINE_CODE_RE = re.compile(r"`([^`]*)`")
+_EMPHASIS_RE = re.compile(r"(?<!\w)(\*\*|__|\*|_)(?=\S)(.+?)(?<=\S)\1(?!\w)")
+_HEADER_RE = re.compile(r"^\s{0,3}#{1,6}\s*", re.MULTILINE)
+_BULLET_RE = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+", re.MULTILINE)
+_TABLE_RULE_RE = re.compile(r"^\s*\|?\s*:?-{3,}.*$", re.MULTILINE)
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"  # pictographs, emoticons, transport, flags, symbols
+    "\U00002600-\U000027BF"  # misc symbols and dingbats (✅ ❌ ⚠ ...)
+    "\U00002B00-\U00002BFF"  # arrows and stars
+    "\U00002190-\U000021FF"  # arrows (→)
+    "\U0000FE00-\U0000FE0F"  # variation selectors
+    "\U0000200D"             # zero-width joiner
+    "]+"
+)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([)\].,;:!?])")
+_SPACE_AFTER_BRACKET_RE = re.compile(r"([(\[])\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s|$)")
+
+
+def _spoken_links(match: re.Match) -> str:
+    return LINK_PLACEHOLDER if len(_URL_RE.findall(match.group(0))) == 1 else LINKS_PLACEHOLDER
+
+
+def normalize_for_speech(text: str) -> str:
+    """Strip markdown and emoji, say URLs as "a link" and collapse whitespace so only speakable text remains"""
+    if not text:
+        return ""
+
+    text = _CODE_BLOCK_RE.sub(" ", text)
+    text = _MARKDOWN_LINK_RE.sub(r"\1", text)
+    text = _URL_RUN_RE.sub(_spoken_links, text)
+    text = _EMPTY_PARENS_RE.sub("", text)
+    text = _INLINE_CODE_RE.sub(r"\1", text)
+    text = _TABLE_RULE_RE.sub("", text)
+    text = _HEADER_RE.sub("", text)
+    text = _BULLET_RE.sub("", text)
+    text = _EMPHASIS_RE.sub(r"\2", text)
+    text = _EMOJI_RE.sub("", text)
+    text = text.replace("|", " ")
+
+    # Turn line breaks into sentence breaks so list items are not run together
+    sentences = []
+    for line in text.splitlines():
+        line = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", " ".join(line.split()))
+        line = _SPACE_AFTER_BRACKET_RE.sub(r"\1", line)
+        if not line:
+            continue
+        if line[-1] not in ".!?:;,":
+            line += "."
+        sentences.append(line)
+
+    return " ".join(sentences)
+
+
+def cap_spoken_length(text: str, max_chars: int = MAX_SPOKEN_CHARS) -> str:
+    """Cut text at a sentence boundary so it fits max_chars, pointing to the screen for the rest"""
+    if len(text) <= max_chars:
+        return text
+
+    budget = max(0, max_chars - len(DETAILS_ON_SCREEN) - 1)
+    head = text[:budget]
+
+    # Prefer the last complete sentence, then the last word boundary
+    cut = None
+    for match in _SENTENCE_END_RE.finditer(head):
+        cut = match.end()
+    if cut is None:
+        cut = head.rfind(" ")
+        if cut <= 0:
+            cut = budget
+        head = head[:cut].rstrip(",;: ") + "."
+    else:
+        head = head[:cut]
+
+    return f"{head.strip()} {DETAILS_ON_SCREEN}".strip()
+
+
+def prepare_for_speech(text: str, max_chars: int = MAX_SPOKEN_CHARS) -> Dict:
+    """Normalize and cap text for speech, reporting how many characters were saved"""
+    original = text or ""
+    spoken = cap_spoken_length(normalize_for_speech(original), max_chars)
+
+    return {
+        'text': spoken,
+        'original_chars': len(original),
+        'spoken_chars': len(spoken),
+        # Normalizing can add a sentence-ending period, so a short reply may grow by a character
+        'chars_saved': max(0, len(original) - len(spoken)),
+        'truncated': spoken.endswith(DETAILS_ON_SCREEN) and not original.strip().endswith(DETAILS_ON_SCREEN),
+    }
+
+
+class SpeechRouter:
+    """Route texts to a TTS backend by estimated time-to-first-audio"""
+
+    # Initial latency model per backend: fixed overhead plus cost per character.
+    # ElevenLabs synthesizes the whole clip before playback starts, so its
+    # latency grows with length; the local engine starts speaking right away.
+    DEFAULT_MODELS = {
+        'elevenlabs': {'overhead_ms': 600.0, 'per_char_ms': 8.0},
+        'system': {'overhead_ms': 150.0, 'per_char_ms': 0.0},
+    }
+
+    def __init__(self, latency_budget_ms: float = LATENCY_BUDGET_MS, smoothing: float = 0.3):
+        self.latency_budget_ms = latency_budget_ms
+        self.smoothing = smoothing
+        self.models = {name: dict(model) for name, model in self.DEFAULT_MODELS.items()}
+        self._lock = threading.Lock()
+
+    def estimate_ms(self, backend: str, chars: int) -> float:
+        """Estimate the time to first audio for a text of the given length"""
+        model = self.models[backend]
+        return model['overhead_ms'] + model['per_char_ms'] * chars
+
+    def choose(self, chars: int, elevenlabs_available: bool = True) -> str:
+        """Pick the preferred backend whose estimate fits the latency budget"""
+        if elevenlabs_available and self.estimate_ms('elevenlabs', chars) <= self.latency_budget_ms:
+            return 'elevenlabs'
+        return 'system'
+
+    def record(self, backend: str, chars: int, elapsed_ms: float) -> None:
+        """Fold a measured synthesis latency into the backend's per-character cost"""
+        if backend not in self.models or chars <= 0:
+            return
+        with self._lock:
+            model = self.models[backend]
+            observed = max(0.0, (elapsed_ms - model['overhead_ms']) / chars)
+            model['per_char_ms'] += self.smoothing * (observed - model['per_char_ms'])
+
+    def short_text_limit(self) -> Optional[int]:
+        """Longest text that currently routes to ElevenLabs"""
+        model = self.models['elevenlabs']
+        if model['per_char_ms'] <= 0:
+            return None
+        return max(0, int((self.latency_budget_ms - model['overhead_ms']) / model['per_char_ms']))
@@ -1,8 +1,7 @@
 
-# Simple, reliable web search tool using DuckDuckGo (ddgs)
+# Simple, reliable web search tool: opens the search in Safari
 
 from langchain.tools import tool
-from ddgs import DDGS
 
 import subprocess
 from urllib.parse import quote_plus